@@ -0,0 +1,82 @@
+"""
+백엔드 예측 결과 전송 처리량 측정 (로컬 stub HTTP 서버 사용)
+
+    python -m benchmarks.bench_backend_client --rows 1500 --latency-ms 5
+
+기존 방식(row마다 requests.post, 매번 새 연결, 순차 전송)과
+BackendClient.post_many(connection pool + 동시 전송)를 비교한다.
+stub 서버는 일정 비율의 row에 500을 돌려주어 건별 실패 보고도 함께 확인한다.
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+from routers.backend_client import BackendClient
+
+
+def make_handler(latency: float, fail_every: int):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            time.sleep(latency)
+            rows = body if isinstance(body, list) else [body]
+            if fail_every and any(row["store_id"] % fail_every == 0 for row in rows):
+                payload = b"stub failure"
+                self.send_response(500)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                return
+            self.send_response(204)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1500)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--fail-every", type=int, default=97, help="store_id가 이 값의 배수인 row는 500 응답 (0이면 실패 없음)")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.latency_ms / 1000, args.fail_every))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    payloads = [
+        {"store_id": i // 15, "prophet_forecast": 1000.0, "xgboost_forecast": None, "date_time": "2025-06-01T00:00:00"}
+        for i in range(args.rows)
+    ]
+
+    start = time.perf_counter()
+    sequential_failed = 0
+    for payload in payloads:
+        response = requests.post(f"{base_url}/forecast", json=payload)
+        sequential_failed += response.status_code != 204
+    sequential = time.perf_counter() - start
+    print(f"sequential requests.post: {sequential:.2f}s ({args.rows / sequential:.0f} rows/s), failed={sequential_failed}")
+
+    client = BackendClient(base_url=base_url, concurrency=args.concurrency)
+    start = time.perf_counter()
+    summary = client.post_many("/forecast", payloads)
+    pooled = time.perf_counter() - start
+    print(f"pooled post_many (concurrency={args.concurrency}): {pooled:.2f}s ({args.rows / pooled:.0f} rows/s), "
+          f"failed={len(summary['failed'])}")
+    print(f"speedup: {sequential / pooled:.1f}x")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+클러스터 배정 백엔드 동기화 round trip / 시간 측정 (로컬 stub HTTP 서버 사용)
+
+    python -m benchmarks.bench_cluster_sync --stores 3000 --changed 30 --latency-ms 5
+
+기존 방식(매장마다 requests.patch, 매번 새 연결, 순차 전송)과
+update_store_clusters(이전 배정표와 비교해 바뀐 매장만 patch_many로 동시 전송)를 비교한다.
+stub 서버는 일부 매장의 첫 요청에 503을 돌려주어 재시도도 함께 확인한다.
+"""
+import os
+import argparse
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+from routers.backend_client import BackendClient
+from routers.train import update_store_clusters
+
+
+def make_handler(latency: float, flaky_every: int, counter: dict):
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_PATCH(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            time.sleep(latency)
+            store_id = int(self.path.rsplit("/", 1)[-1])
+            with lock:
+                counter["requests"] += 1
+                first = store_id not in counter["seen"]
+                counter["seen"].add(store_id)
+            status = 503 if flaky_every and store_id % flaky_every == 0 and first else 200
+            self.send_response(status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stores", type=int, default=3000)
+    parser.add_argument("--changed", type=int, default=30, help="재학습 후 cluster가 바뀐 매장 수")
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--flaky-every", type=int, default=7, help="store_id가 이 값의 배수면 첫 요청에 503 응답 (0이면 없음)")
+    args = parser.parse_args()
+
+    counter = {"requests": 0, "seen": set()}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.latency_ms / 1000, args.flaky_every, counter))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    previous = {store_id: store_id % 5 for store_id in range(1, args.stores + 1)}
+    current = {store_id: (cluster + (store_id <= args.changed)) % 5 for store_id, cluster in previous.items()}
+
+    start = time.perf_counter()
+    for store_id in current:
+        requests.patch(f"{base_url}/store/{store_id}", json={"cluster": int(current[store_id])})
+    sequential = time.perf_counter() - start
+    print(f"sequential requests.patch: {sequential:.2f}s, {len(current)} requests")
+
+    client = BackendClient(base_url=base_url, concurrency=args.concurrency)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cluster_assignments.json")
+
+        # 배정표가 없으면 전체 동기화 (첫 요청 503인 매장은 재시도)
+        counter.update(requests=0, seen=set())
+        start = time.perf_counter()
+        summary = update_store_clusters(previous, backend=client, assignments_path=path)
+        seconds = time.perf_counter() - start
+        print(f"initial full sync: {seconds:.2f}s, {counter['requests']} requests, "
+              f"synced={summary['synced']}, failed={len(summary['failed'])}")
+
+        counter.update(requests=0, seen=set())
+        start = time.perf_counter()
+        summary = update_store_clusters(current, backend=client, assignments_path=path)
+        seconds = time.perf_counter() - start
+        print(f"delta sync: {seconds:.3f}s, {counter['requests']} requests, changed={summary['changed']}, "
+              f"unchanged={summary['unchanged']}, failed={len(summary['failed'])}")
+        print(f"speedup vs sequential: {sequential / seconds:.0f}x")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
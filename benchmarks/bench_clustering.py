@@ -0,0 +1,162 @@
+"""
+매장 클러스터링 지표 / label 일치와 처리 시간 확인
+
+    python -m benchmarks.bench_clustering --stores 2000 --scale-stores 100000
+
+1. 기존 방식(wide pivot + 매장별 loop)과 run_kmeans_clustering(KMeans)의
+   지표 값과 label이 같은지 확인 (주거 / 오피스 / 대학가 / 번화가 / 역세권 패턴의 합성 매출)
+2. 저장한 클러스터링 모델로 학습 매장을 다시 배정했을 때 label이 같은지, 신규 매장 1개 배정 시간
+3. --scale-stores 개 매장의 지표 계산 + MiniBatchKMeans 시간과 최대 RSS 증가량 측정
+"""
+import os
+import argparse
+import resource
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans
+from sklearn.preprocessing import StandardScaler
+from train.holiday_service import kr_holiday_dates, holiday_years
+from train.cluster_model import load_cluster_model
+from train.run_kmeans_clustering import run_kmeans_clustering, store_cluster_features, assign_clusters
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def legacy_features(df_long: pd.DataFrame) -> tuple:
+    df_long = df_long[df_long["revenue"] > 0]
+    holiday_dates = kr_holiday_dates(holiday_years(df_long["date"]))
+    holiday_days = pd.DatetimeIndex(sorted(holiday_dates))
+    df_wide = df_long.pivot(index="date", columns="store_id", values="revenue")
+
+    features = {}
+    fallback_ids = []
+    for store in df_wide.columns:
+        s = df_wide[store].dropna()
+        date_series = s.index.to_series()
+        weekday = date_series.dt.weekday
+        is_weekend = weekday >= 5
+        month = date_series.dt.month
+        is_holiday = date_series.isin(holiday_days) & (weekday < 5)
+
+        holiday_sales = s[is_holiday]
+        week_sales = s[~is_weekend]
+        weekend_sales = s[is_weekend]
+        semester_sales = s[month.isin([3, 4, 5, 6, 9, 10, 11, 12])]
+        vacation_sales = s[month.isin([1, 2, 7, 8])]
+        if (
+            holiday_sales.empty or week_sales.empty or weekend_sales.empty
+            or semester_sales.empty or vacation_sales.empty or s.groupby(month).mean().std() == 0
+        ):
+            fallback_ids.append(store)
+            continue
+        features[store] = {
+            "holiday_mean": holiday_sales.mean(),
+            "week_diff": week_sales.mean() - weekend_sales.mean(),
+            "semester_diff": semester_sales.mean() - vacation_sales.mean(),
+            "yearly_seasonality_strength": s.groupby(month).mean().std(),
+        }
+    return pd.DataFrame.from_dict(features, orient="index"), fallback_ids
+
+
+def legacy_labels(feature_df: pd.DataFrame, fallback_ids: list, k: int) -> dict:
+    row_features = ["holiday_mean", "week_diff", "semester_diff"]
+    row_scaled = feature_df[row_features].sub(feature_df[row_features].mean(axis=1), axis=0).div(
+        feature_df[row_features].std(axis=1).replace(0, 1), axis=0
+    )
+    col_scaled = pd.DataFrame(
+        StandardScaler().fit_transform(feature_df[["yearly_seasonality_strength"]]),
+        columns=["yearly_seasonality_strength"], index=feature_df.index,
+    )
+    final_scaled_df = pd.concat([row_scaled, col_scaled], axis=1)
+    result = dict(zip(final_scaled_df.index, KMeans(n_clusters=k, random_state=42).fit_predict(final_scaled_df)))
+    for store in fallback_ids:
+        result[store] = 0
+    return result
+
+
+def make_sales(n_stores: int, n_days: int = 730, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2023-05-01", periods=n_days, freq="D")
+    weekday = dates.weekday.to_numpy()
+    month = dates.month.to_numpy()
+    holiday = np.isin(dates.to_numpy().astype("datetime64[D]"),
+                      np.array(sorted(kr_holiday_dates(holiday_years(dates))), dtype="datetime64[D]"))
+    semester = np.isin(month, [3, 4, 5, 6, 9, 10, 11, 12])
+
+    kind = rng.integers(0, 5, n_stores)
+    base = rng.uniform(1e5, 5e5, n_stores)[:, None]
+    weekend_effect = np.array([-0.6, 0.3, -0.3, 0.4, -0.1])[kind][:, None] * (weekday >= 5)
+    holiday_effect = np.array([-0.7, 0.2, -0.4, 0.5, 0.0])[kind][:, None] * holiday
+    semester_effect = np.array([0.0, 0.0, 0.6, 0.0, 0.1])[kind][:, None] * semester
+    yearly = rng.uniform(0, 0.3, n_stores)[:, None] * np.sin(2 * np.pi * np.arange(n_days) / 365.25)
+    revenue = base * (1 + weekend_effect + holiday_effect + semester_effect + yearly)
+    revenue *= rng.normal(1, 0.1, revenue.shape)
+    # 휴무일 (오피스형은 주말 일부 휴무)
+    revenue[(kind[:, None] == 0) & (weekday >= 5) & (rng.random(revenue.shape) < 0.3)] = 0
+
+    return pd.DataFrame({
+        "store_id": np.repeat(np.arange(1, n_stores + 1), n_days),
+        "date": np.tile(dates, n_stores),
+        "revenue": revenue.round().ravel(),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stores", type=int, default=2000)
+    parser.add_argument("--scale-stores", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    df = make_sales(args.stores, args.days)
+    start = time.perf_counter()
+    legacy_df, legacy_fallback = legacy_features(df)
+    legacy_result = legacy_labels(legacy_df, legacy_fallback, args.k)
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    feature_df, fallback_ids = store_cluster_features(df)
+    result = run_kmeans_clustering(df, k=args.k, algorithm="kmeans", model_path=None)
+    seconds = time.perf_counter() - start
+
+    max_diff = np.abs(feature_df.to_numpy() - legacy_df.loc[feature_df.index].to_numpy()).max()
+    same_labels = legacy_result == result and list(legacy_result) == list(result)
+    print(f"{args.stores} stores: legacy {legacy_seconds:.2f} s, vectorized {seconds:.2f} s, "
+          f"max feature diff {max_diff:.2e}, fallback {len(fallback_ids)}, labels {'identical' if same_labels else 'DIFFER'}")
+    if not same_labels:
+        raise SystemExit("label 불일치")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = os.path.join(tmp, "cluster_model.json")
+        result = run_kmeans_clustering(df, k=args.k, algorithm="kmeans", model_path=model_path)
+        assigned, drift = assign_clusters(df, load_cluster_model(model_path))
+        if assigned != result:
+            raise SystemExit("저장된 모델로 다시 배정한 label 불일치")
+
+        new_store = make_sales(1, args.days, seed=2)
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            assign_clusters(new_store, load_cluster_model(model_path))
+            timings.append(time.perf_counter() - start)
+    print(f"assign: training stores relabelled identically, drift {drift}; "
+          f"1 new store p50 {np.median(timings) * 1000:.1f} ms (including model load)")
+
+    df = make_sales(args.scale_stores, args.days, seed=1)
+    base_mb = peak_rss_mb()
+    start = time.perf_counter()
+    result = run_kmeans_clustering(df, k=args.k, algorithm="minibatch", model_path=None)
+    seconds = time.perf_counter() - start
+    print(f"{args.scale_stores} stores ({len(df):,} rows) minibatch: {seconds:.1f} s, "
+          f"input {df.memory_usage().sum() / 2**20:.0f} MB, peak RSS +{peak_rss_mb() - base_mb:.0f} MB, "
+          f"cluster sizes {np.bincount(list(result.values())).tolist()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+학습 중 예측 응답 지연 측정 (load test)
+
+    python -m benchmarks.bench_event_loop --forecast-csv forecast.csv --train-csv sales.csv
+
+로컬 uvicorn으로 앱을 띄우고 (백엔드는 stub HTTP 서버),
+1) 평소 /forecast/ 지연, 2) /train/prophet 학습 job이 도는 동안의 /forecast/, /docs 지연을 비교한다.
+./models 아래의 학습된 모델을 사용하며 /train/prophet은 ./models/prophet을 덮어쓴다.
+"""
+import argparse
+import json
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+import requests
+import uvicorn
+from config import config
+
+
+class StubBackend(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self, status, payload=b""):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path == "/admin/login":
+            return self._reply(200, json.dumps({"token": "stub"}).encode())
+        self._reply(204)
+
+    def do_PATCH(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._reply(200, b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    # 예측 요청 여러 개가 동시에 BACKEND_CONCURRENCY개씩 연결하므로 listen backlog(기본 5)를 늘림
+    request_queue_size = 256
+    daemon_threads = True
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def timed_get(url: str) -> float:
+    start = time.perf_counter()
+    requests.get(url).raise_for_status()
+    return time.perf_counter() - start
+
+
+def timed_forecast(url: str, forecast_bytes: bytes) -> float:
+    start = time.perf_counter()
+    response = requests.post(url, files={"forecast_file": ("forecast.csv", forecast_bytes, "text/csv")})
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+def measure(app_url: str, forecast_bytes: bytes, n_requests: int, concurrency: int) -> dict:
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        forecast = list(executor.map(lambda _: timed_forecast(f"{app_url}/forecast/", forecast_bytes), range(n_requests)))
+        docs = list(executor.map(lambda _: timed_get(f"{app_url}/docs"), range(n_requests)))
+    return {"forecast": np.array(forecast) * 1000, "docs": np.array(docs) * 1000}
+
+
+def report(label: str, latencies: dict):
+    for name, values in latencies.items():
+        print(f"{label:>16} {name:>8}: p50={np.percentile(values, 50):8.1f}ms "
+              f"p99={np.percentile(values, 99):8.1f}ms max={values.max():8.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--forecast-csv", required=True)
+    parser.add_argument("--train-csv", required=True)
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    backend = StubServer(("127.0.0.1", free_port()), StubBackend)
+    threading.Thread(target=backend.serve_forever, daemon=True).start()
+    config.BACKEND_URL = f"http://127.0.0.1:{backend.server_port}"
+
+    from main import app
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    app_url = f"http://127.0.0.1:{port}"
+
+    with open(args.forecast_csv, "rb") as f:
+        forecast_bytes = f.read()
+    with open(args.train_csv, "rb") as f:
+        train_bytes = f.read()
+
+    timed_forecast(f"{app_url}/forecast/", forecast_bytes)  # 모델 cache warm-up
+    report("idle", measure(app_url, forecast_bytes, args.requests, args.concurrency))
+
+    training = {}
+
+    def train():
+        start = time.perf_counter()
+        response = requests.post(f"{app_url}/train/prophet", files={"train_file": ("train.csv", train_bytes, "text/csv")})
+        job_url = f"{app_url}{response.json()['status_url']}"
+        while (job := requests.get(job_url).json())["status"] in ("queued", "running"):
+            time.sleep(0.5)
+        training.update(status=job["status"], seconds=time.perf_counter() - start)
+
+    trainer = threading.Thread(target=train)
+    trainer.start()
+    time.sleep(1.0)
+    during = measure(app_url, forecast_bytes, args.requests, args.concurrency)
+    still_training = trainer.is_alive()
+    trainer.join()
+    report("during training", during)
+    print(f"training: status={training['status']} {training['seconds']:.1f}s "
+          f"(measurement finished {'before' if still_training else 'after'} training ended)")
+
+    server.should_exit = True
+    backend.shutdown()
+
+
+if __name__ == "__main__":
+    main()
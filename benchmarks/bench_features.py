@@ -0,0 +1,82 @@
+"""
+XGBoost 피처 생성 결과 일치 / 처리 시간 확인
+
+    python -m benchmarks.bench_features --stores 2000 --days 730
+
+1. 기존 방식(매장별 loop + shift(freq=...))과 forecast.features.generate_features의 출력이
+   컬럼 / dtype / 값까지 같은지 확인 (날짜 누락, 0 매출이 섞인 합성 데이터)
+2. 매장 수를 늘려가며 처리 시간을 측정해 행 수에 선형으로 늘어나는지 확인
+"""
+import argparse
+import time
+import warnings
+import numpy as np
+import pandas as pd
+from forecast.features import generate_features
+
+
+def legacy_generate_features(df: pd.DataFrame) -> pd.DataFrame:
+    # replace(..., pd.NA).fillna(0)의 object downcast FutureWarning 숨김
+    warnings.filterwarnings("ignore", category=FutureWarning)
+    df = df.sort_values(["store_id", "date"]).reset_index(drop=True)
+    feature_dfs = []
+    for _, store_df in df.groupby("store_id", observed=True):
+        store_df = store_df.copy().set_index("date")
+        store_df["rev_t-1"] = store_df["revenue"].shift(freq="1D")
+        store_df["rev_t-2"] = store_df["revenue"].shift(freq="2D")
+        store_df["rev_t-7"] = store_df["revenue"].shift(freq="7D")
+        store_df["rev_t-14"] = store_df["revenue"].shift(freq="14D")
+        store_df["lag"] = ((store_df["rev_t-1"] - store_df["rev_t-2"]) / store_df["rev_t-2"]).replace([float("inf"), -float("inf")], pd.NA).fillna(0)
+        store_df["weekly_lag"] = ((store_df["rev_t-7"] - store_df["rev_t-14"]) / store_df["rev_t-14"]).replace([float("inf"), -float("inf")], pd.NA).fillna(0)
+        store_df["dayofweek"] = store_df.index.dayofweek
+        store_df["is_weekend"] = store_df["dayofweek"].isin([5, 6]).astype(int)
+        store_df = store_df.reset_index()
+        store_df.drop(columns=["rev_t-1", "rev_t-2", "rev_t-7", "rev_t-14"], inplace=True)
+        feature_dfs.append(store_df)
+    return pd.concat(feature_dfs, ignore_index=True)
+
+
+def make_sales(n_stores: int, n_days: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2023-05-01", periods=n_days, freq="D")
+    df = pd.DataFrame({
+        "store_id": np.repeat(np.arange(1, n_stores + 1), n_days),
+        "date": np.tile(dates, n_stores),
+        "revenue": rng.normal(200000, 30000, n_stores * n_days).round(),
+        "cluster_id": np.repeat(rng.integers(0, 5, n_stores), n_days),
+    })
+    # 휴무일(0 매출)과 누락된 날짜를 섞고, 업로드와 같이 store_id는 category
+    df.loc[rng.random(len(df)) < 0.05, "revenue"] = 0
+    df = df[rng.random(len(df)) > 0.03]
+    df["store_id"] = df["store_id"].astype("category")
+    return df.sample(frac=1, random_state=seed)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stores", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--parity-stores", type=int, default=300)
+    args = parser.parse_args()
+
+    df = make_sales(args.parity_stores, args.days)
+    start = time.perf_counter()
+    expected = legacy_generate_features(df)
+    legacy_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    actual = generate_features(df)
+    seconds = time.perf_counter() - start
+    pd.testing.assert_frame_equal(actual, expected)
+    print(f"parity OK ({len(df):,} rows): legacy {legacy_seconds:.2f} s, vectorized {seconds:.3f} s")
+
+    print(f"{'rows':>12} {'seconds':>8} {'us/row':>7}")
+    for fraction in (0.25, 0.5, 1.0):
+        df = make_sales(max(int(args.stores * fraction), 1), args.days)
+        start = time.perf_counter()
+        generate_features(df)
+        seconds = time.perf_counter() - start
+        print(f"{len(df):>12,} {seconds:8.2f} {seconds / len(df) * 1e6:7.3f}")
+
+
+if __name__ == "__main__":
+    main()
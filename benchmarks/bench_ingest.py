@@ -0,0 +1,104 @@
+"""
+업로드 형식별 파싱 시간 / 최대 메모리 비교
+
+    python -m benchmarks.bench_ingest --stores 2000 --days 730
+
+합성 매출 데이터(매장 수 x 일수)를 CSV, gzip/zstd CSV, Parquet, Arrow IPC로 저장한 뒤
+각 형식을 별도 프로세스에서 읽어 소요 시간과 최대 RSS 증가량을 측정한다.
+"plain read_csv"는 스키마 없이 pd.read_csv로 한 번에 읽는 기존 방식이다.
+"""
+import argparse
+import gzip
+import multiprocessing as mp
+import os
+import resource
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from routers.ingest import SALES_SCHEMA, read_table
+
+
+def make_sales(n_stores: int, n_days: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2023-05-01", periods=n_days, freq="D")
+    return pd.DataFrame({
+        "store_id": np.repeat(np.arange(1, n_stores + 1), n_days),
+        "date": np.tile(dates.strftime("%Y-%m-%d"), n_stores),
+        "revenue": rng.normal(200000, 30000, n_stores * n_days).round(),
+        "cluster_id": np.repeat(rng.integers(0, 5, n_stores), n_days),
+    })
+
+
+def write_formats(df: pd.DataFrame, directory: str) -> dict:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    paths = {fmt: os.path.join(directory, f"sales.{fmt}") for fmt in ("csv", "csv.gz", "csv.zst", "parquet", "arrow")}
+    df.to_csv(paths["csv"], index=False)
+    with open(paths["csv"], "rb") as src, gzip.open(paths["csv.gz"], "wb", compresslevel=6) as dst:
+        dst.write(src.read())
+    with open(paths["csv"], "rb") as src, pa.CompressedOutputStream(paths["csv.zst"], "zstd") as dst:
+        dst.write(src.read())
+    typed = df.assign(date=pd.to_datetime(df["date"]))
+    typed.to_parquet(paths["parquet"], index=False)
+    feather.write_feather(typed, paths["arrow"], compression="zstd")
+    return paths
+
+
+def peak_rss_kb() -> int:
+    # ru_maxrss는 fork 시점 부모 프로세스의 값을 이어받으므로, Linux에서는 exec 후 초기화되는 VmHWM을 사용
+    try:
+        with open("/proc/self/status") as f:
+            return int(next(line for line in f if line.startswith("VmHWM:")).split()[1])
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _measure(method: str, fmt: str, path: str, engine: str, queue):
+    base_rss = peak_rss_kb()
+    start = time.perf_counter()
+    if method == "plain":
+        df = pd.read_csv(path)
+        df["date"] = pd.to_datetime(df["date"])
+    else:
+        with open(path, "rb") as f:
+            df = read_table(f, fmt, SALES_SCHEMA, engine=engine)
+    seconds = time.perf_counter() - start
+    peak_rss = peak_rss_kb()
+    queue.put((seconds, (peak_rss - base_rss) / 1024, df.memory_usage(deep=True).sum() / 2**20, len(df)))
+
+
+def measure(method: str, fmt: str, path: str, engine: str = "c"):
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_measure, args=(method, fmt, path, engine, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stores", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=730)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_formats(make_sales(args.stores, args.days), directory)
+        print(f"rows={args.stores * args.days:,}")
+        print(f"{'format':>24} {'file MB':>8} {'parse s':>8} {'peak RSS +MB':>13} {'frame MB':>9}")
+
+        cases = [("plain", "csv", "c", "plain read_csv")]
+        cases += [("schema", fmt, "c", f"{fmt} (c)") for fmt in ("csv", "csv.gz", "csv.zst")]
+        cases += [("schema", fmt, "pyarrow", f"{fmt} (pyarrow)") for fmt in ("csv", "csv.gz", "csv.zst")]
+        cases += [("schema", fmt, "c", fmt) for fmt in ("parquet", "arrow")]
+        for method, fmt, engine, label in cases:
+            seconds, peak_mb, frame_mb, rows = measure(method, fmt, paths[fmt], engine)
+            size_mb = os.path.getsize(paths[fmt]) / 2**20
+            print(f"{label:>24} {size_mb:8.1f} {seconds:8.2f} {peak_mb:13.1f} {frame_mb:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
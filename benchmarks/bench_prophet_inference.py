@@ -0,0 +1,78 @@
+"""
+Prophet 추론 모드별 매장당 지연 시간 비교
+
+    python -m benchmarks.bench_prophet_inference --stores 5 --horizon 15
+
+- point: yhat만 계산 (불확실성 샘플링 생략)
+- sampling(N): Prophet 시뮬레이션 N회로 yhat_lower / yhat_upper 계산
+- analytic: sigma_obs 기반 정규 근사 구간
+"""
+import argparse
+import logging
+import time
+import numpy as np
+import pandas as pd
+from prophet import Prophet
+from forecast.prophet_inference import predict_point, predict_with_intervals
+
+logging.getLogger("cmdstanpy").disabled = True
+
+
+def make_store_df(seed: int, days: int = 730) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    ds = pd.date_range("2023-05-01", periods=days, freq="D")
+    t = np.arange(days)
+    y = 200000 + 30000 * np.sin(2 * np.pi * t / 365.25) + 20000 * (ds.dayofweek >= 5) + rng.normal(0, 8000, days)
+    df = pd.DataFrame({"ds": ds, "y": y})
+    df["cap"] = df["y"].max() * 1.1
+    df["floor"] = 0
+    return df
+
+
+def time_call(fn, repeat: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stores", type=int, default=5)
+    parser.add_argument("--horizon", type=int, default=15)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--samples", type=int, nargs="+", default=[1000, 200, 50])
+    args = parser.parse_args()
+
+    results = {}
+    for seed in range(args.stores):
+        df = make_store_df(seed)
+        model = Prophet(growth="logistic", yearly_seasonality=True, weekly_seasonality=True, daily_seasonality=False)
+        model.fit(df)
+
+        future = pd.DataFrame({"ds": pd.date_range(df["ds"].max() + pd.Timedelta(days=1), periods=args.horizon)})
+        future["cap"] = df["cap"].iloc[0]
+        future["floor"] = 0
+
+        # point 결과가 predict()의 yhat과 동일한지 확인
+        diff = np.abs(predict_point(model, future)["yhat"].to_numpy() - model.predict(future)["yhat"].to_numpy()).max()
+        assert diff < 1e-6, diff
+
+        results.setdefault("point", []).append(time_call(lambda: predict_point(model, future), args.repeat))
+        for samples in args.samples:
+            model.uncertainty_samples = samples
+            results.setdefault(f"sampling({samples})", []).append(
+                time_call(lambda: predict_with_intervals(model, future, method="sampling"), args.repeat)
+            )
+        results.setdefault("analytic", []).append(
+            time_call(lambda: predict_with_intervals(model, future, method="analytic"), args.repeat)
+        )
+
+    print(f"stores={args.stores} horizon={args.horizon} (ms per store, mean / max)")
+    for name, values in results.items():
+        print(f"{name:>16}: {np.mean(values):8.2f} / {np.max(values):8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+NumPy Prophet kernel 정확도 / 속도 확인
+
+    python -m benchmarks.bench_prophet_kernel --fleet 5000 --horizon 15
+
+1. 합성 매장 몇 개로 Prophet을 학습해 (일반 / 조건부 semester seasonality + holiday)
+   predict_fleet 결과가 model.predict(...)["yhat"]과 tolerance 이내인지 확인
+2. 학습된 파라미터를 --fleet 개 매장으로 복제해 전체 매장 x horizon 계산 시간 측정
+"""
+import argparse
+import logging
+import time
+import numpy as np
+import pandas as pd
+from prophet import Prophet
+from prophet.make_holidays import make_holidays_df
+from forecast.academic_calendar import semester_mask
+from forecast.prophet_inference import predict_point
+from forecast.prophet_kernel import extract_prophet_params, stack_prophet_params, predict_fleet
+
+logging.getLogger("cmdstanpy").disabled = True
+
+
+def fit_store(seed: int, univ: bool) -> Prophet:
+    rng = np.random.default_rng(seed)
+    ds = pd.date_range("2023-05-01", periods=730, freq="D")
+    t = np.arange(len(ds))
+    y = 200000 + 30000 * np.sin(2 * np.pi * t / 365.25) + 20000 * (ds.dayofweek >= 5) + rng.normal(0, 8000, len(ds))
+    df = pd.DataFrame({"ds": ds, "y": y})
+    df["cap"] = df["y"].max() * 1.1
+    df["floor"] = 0
+
+    holidays = make_holidays_df(year_list=[2023, 2024, 2025], country="KR")
+    holidays["holiday"] = "all_holidays"
+    model = Prophet(
+        growth="logistic",
+        yearly_seasonality=True,
+        weekly_seasonality=not univ,
+        daily_seasonality=False,
+        holidays=holidays,
+    )
+    if univ:
+        in_semester = semester_mask(df["ds"].to_numpy())
+        df["is_semester"] = in_semester
+        df["is_vacation"] = ~in_semester
+        model.add_seasonality("semester_weekly", period=7, fourier_order=3, condition_name="is_semester")
+        model.add_seasonality("vacation_weekly", period=7, fourier_order=3, condition_name="is_vacation")
+    return model.fit(df)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stores", type=int, default=4)
+    parser.add_argument("--fleet", type=int, default=5000)
+    parser.add_argument("--horizon", type=int, default=15)
+    parser.add_argument("--tolerance", type=float, default=1e-6)
+    args = parser.parse_args()
+
+    models = [fit_store(seed, univ=seed % 2 == 1) for seed in range(args.stores)]
+    dates = pd.date_range("2025-04-20", periods=args.horizon, freq="D")
+    in_semester = semester_mask(dates.to_numpy())
+    conditions = {"is_semester": in_semester, "is_vacation": ~in_semester}
+
+    params = [extract_prophet_params(model) for model in models]
+    fleet = stack_prophet_params(params)
+    kernel_yhat = predict_fleet(fleet, dates.to_numpy(), floor=0, conditions=conditions)
+
+    # 1. 정확도
+    prophet_ms = []
+    for i, model in enumerate(models):
+        future = pd.DataFrame({"ds": dates, "cap": model.history["cap"].max(), "floor": 0})
+        if "semester_weekly" in model.seasonalities:
+            future["is_semester"] = in_semester
+            future["is_vacation"] = ~in_semester
+        start = time.perf_counter()
+        expected = predict_point(model, future)["yhat"].to_numpy()
+        prophet_ms.append((time.perf_counter() - start) * 1000)
+        rel_err = np.abs(kernel_yhat[i] - expected).max() / np.abs(expected).max()
+        print(f"store {i}: max relative error = {rel_err:.2e}")
+        assert rel_err < args.tolerance, rel_err
+
+    # 2. 전체 매장 계산 시간
+    fleet_params = [params[i % len(params)] for i in range(args.fleet)]
+    start = time.perf_counter()
+    big_fleet = stack_prophet_params(fleet_params)
+    stack_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    predict_fleet(big_fleet, dates.to_numpy(), floor=0, conditions=conditions)
+    kernel_ms = (time.perf_counter() - start) * 1000
+
+    print(f"Prophet point predict: {np.mean(prophet_ms):.2f} ms / store "
+          f"(~{np.mean(prophet_ms) * args.fleet / 1000:.1f} s for {args.fleet} stores)")
+    print(f"NumPy kernel: stack {stack_ms:.1f} ms + predict {kernel_ms:.1f} ms for {args.fleet} stores x {args.horizon} days")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+월 단위 rolling refit에서 warm-start 효과 측정
+
+    python -m benchmarks.bench_prophet_warm_start --stores 3 --months 12
+
+compute_yhat_and_target과 같은 expanding window (1년 학습 + 이후 1개월씩 확장)로
+cold fit / warm-start fit의 L-BFGS 반복 횟수, 소요 시간, fold MAE를 비교한다.
+"""
+import argparse
+import logging
+import time
+import numpy as np
+import pandas as pd
+from prophet import Prophet
+from sklearn.metrics import mean_absolute_error
+from forecast.prophet_inference import predict_point
+from train.prophet_utils.warm_start import fit_prophet, optimizer_iterations
+
+logging.getLogger("cmdstanpy").disabled = True
+
+
+def make_store_df(seed: int, days: int = 730) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    ds = pd.date_range("2023-05-01", periods=days, freq="D")
+    t = np.arange(days)
+    y = 200000 + 40 * t + 30000 * np.sin(2 * np.pi * t / 365.25) + 20000 * (ds.dayofweek >= 5) + rng.normal(0, 8000, days)
+    return pd.DataFrame({"ds": ds, "y": y})
+
+
+def rolling_backtest(df: pd.DataFrame, n_months: int, warm_start: bool) -> dict:
+    months = sorted(df["ds"].dt.to_period("M").unique())
+    iterations, seconds, maes = [], [], []
+    prev_model = None
+    for i in range(n_months):
+        if i + 12 >= len(months):
+            break
+        train = df[df["ds"] <= months[i + 11].to_timestamp(how="end")].copy()
+        test = df[df["ds"].dt.to_period("M") == months[i + 12]].copy()
+        train["cap"] = train["y"].max() * 1.1
+        train["floor"] = 0
+        test["cap"] = train["cap"].iloc[0]
+        test["floor"] = 0
+
+        model = Prophet(growth="logistic", yearly_seasonality=True, weekly_seasonality=True, daily_seasonality=False)
+        start = time.perf_counter()
+        fit_prophet(model, train, init_model=prev_model if warm_start else None)
+        seconds.append(time.perf_counter() - start)
+        iterations.append(optimizer_iterations(model))
+        prev_model = model
+
+        forecast = predict_point(model, test[["ds", "cap", "floor"]])
+        maes.append(mean_absolute_error(test["y"].values, forecast["yhat"].values))
+    return {"iterations": iterations, "seconds": seconds, "maes": maes}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stores", type=int, default=3)
+    parser.add_argument("--months", type=int, default=12)
+    args = parser.parse_args()
+
+    totals = {False: {"iterations": [], "seconds": [], "maes": []}, True: {"iterations": [], "seconds": [], "maes": []}}
+    for seed in range(args.stores):
+        df = make_store_df(seed)
+        for warm_start in (False, True):
+            result = rolling_backtest(df, args.months, warm_start)
+            for key, values in result.items():
+                totals[warm_start][key].extend(values)
+
+    for warm_start, label in ((False, "cold"), (True, "warm")):
+        t = totals[warm_start]
+        iterations = [i for i in t["iterations"] if i is not None]
+        print(f"{label}: fits={len(t['seconds'])} "
+              f"mean iterations={np.mean(iterations) if iterations else float('nan'):.1f} "
+              f"wall={np.sum(t['seconds']):.2f}s mean MAE={np.mean(t['maes']):.2f}")
+
+    cold, warm = totals[False], totals[True]
+    print(f"wall time reduction: {(1 - np.sum(warm['seconds']) / np.sum(cold['seconds'])) * 100:.1f}%, "
+          f"MAE change: {(np.mean(warm['maes']) / np.mean(cold['maes']) - 1) * 100:+.3f}%")
+
+
+if __name__ == "__main__":
+    main()
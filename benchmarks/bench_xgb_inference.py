@@ -0,0 +1,109 @@
+"""
+XGBoost 서빙 경로별 호출 지연 비교
+
+    python -m benchmarks.bench_xgb_inference --batch 10000 --repeat 200
+
+합성 데이터로 XGBRegressor를 학습한 뒤
+1. 기존 방식: pickle된 XGBRegressor / LabelEncoder + dict로 만든 pandas DataFrame -> predict
+2. native 방식: .ubj에서 load한 Booster + weather mapping table + float32 배열 -> inplace_predict
+두 경로의 1행 / --batch 행 예측 지연(중앙값, p99)을 비교하고 결과가 같은지 확인한다.
+"""
+import argparse
+import os
+import pickle
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+from xgboost import XGBRegressor
+from forecast.batch_forecast import FEATURE_ORDER
+from forecast.xgb_artifact import save_xgb_artifact, load_booster, load_weather_codes, predict_booster
+
+WEATHERS = np.array(["Clear", "Clouds", "Fog", "Rain", "Snow"])
+
+
+def make_rows(n: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    dayofweek = rng.integers(0, 7, n)
+    return {
+        "temp": rng.normal(15, 10, n),
+        "rain": rng.exponential(1, n),
+        "weather": WEATHERS[rng.integers(0, len(WEATHERS), n)],
+        "lag": rng.normal(0, 0.2, n),
+        "weekly_lag": rng.normal(0, 0.2, n),
+        "dayofweek": dayofweek,
+        "cluster_id": rng.integers(0, 5, n),
+        "is_weekend": (dayofweek >= 5).astype(int),
+    }
+
+
+def timings(func, repeat: int) -> tuple:
+    func()  # warm-up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return np.median(samples) * 1e3, np.percentile(samples, 99) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--train-rows", type=int, default=50000)
+    parser.add_argument("--batch", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    train = make_rows(args.train_rows)
+    le = LabelEncoder().fit(train["weather"])
+    X_train = pd.DataFrame({**train, "weather_encoded": le.transform(train["weather"])})[FEATURE_ORDER]
+    y_train = 200000 * (1 + X_train["lag"]) + 5000 * X_train["is_weekend"] - 300 * X_train["rain"]
+    model = XGBRegressor(n_estimators=400, max_depth=8, learning_rate=0.05, n_jobs=-1).fit(X_train, y_train)
+
+    with tempfile.TemporaryDirectory() as directory:
+        pkl_path = os.path.join(directory, "xgb_model.pkl")
+        with open(pkl_path, "wb") as f:
+            pickle.dump(model, f)
+        with open(os.path.join(directory, "label_encoder.pkl"), "wb") as f:
+            pickle.dump(le, f)
+        ubj_path = os.path.join(directory, "xgb_model.ubj")
+        codes_path = os.path.join(directory, "weather_codes.json")
+        save_xgb_artifact(model.get_booster(), le.classes_, ubj_path, codes_path)
+
+        start = time.perf_counter()
+        with open(pkl_path, "rb") as f:
+            legacy_model = pickle.load(f)
+        pkl_load = time.perf_counter() - start
+        start = time.perf_counter()
+        booster = load_booster(ubj_path)
+        codes = load_weather_codes(codes_path)
+        ubj_load = time.perf_counter() - start
+        print(f"model file: pkl {os.path.getsize(pkl_path) / 2**10:.0f} KB ({pkl_load * 1e3:.1f} ms load), "
+              f"ubj {os.path.getsize(ubj_path) / 2**10:.0f} KB ({ubj_load * 1e3:.1f} ms load)")
+
+        def legacy_predict(rows: dict) -> np.ndarray:
+            frame = pd.DataFrame({**rows, "weather_encoded": le.transform(rows["weather"])})[FEATURE_ORDER]
+            return legacy_model.predict(frame)
+
+        def native_predict(rows: dict) -> np.ndarray:
+            features = np.empty((len(rows["temp"]), len(FEATURE_ORDER)), dtype=np.float32)
+            for j, name in enumerate(FEATURE_ORDER):
+                if name == "weather_encoded":
+                    features[:, j] = [codes[w] for w in rows["weather"]]
+                else:
+                    features[:, j] = rows[name]
+            return predict_booster(booster, features)
+
+        print(f"{'rows':>7} {'path':>8} {'p50 ms':>9} {'p99 ms':>9}")
+        for n in (1, args.batch):
+            rows = make_rows(n, seed=1)
+            if not np.array_equal(legacy_predict(rows), native_predict(rows)):
+                raise SystemExit(f"{n}행 예측 결과가 다름")
+            for label, func in (("pickle", legacy_predict), ("native", native_predict)):
+                p50, p99 = timings(lambda: func(rows), args.repeat if n == 1 else max(args.repeat // 10, 5))
+                print(f"{n:>7} {label:>8} {p50:9.3f} {p99:9.3f}")
+
+
+if __name__ == "__main__":
+    main()
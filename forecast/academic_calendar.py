@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+# 기본 학기 기간 (config.SEMESTER_RANGES가 있으면 그것을 사용)
+DEFAULT_SEMESTER_RANGES = [
+    ("2023-03-01", "2023-06-23"), ("2023-09-01", "2023-12-22"),
+    ("2024-03-04", "2024-06-20"), ("2024-09-02", "2024-12-20"),
+    ("2025-03-04", "2025-06-20"), ("2025-09-01", "2025-12-20")
+]
+
+
+def load_semester_ranges() -> list:
+    """
+    config.SEMESTER_RANGES [(시작일, 종료일), ...] (없으면 기본값)
+    """
+    try:
+        from config import config
+    except ImportError:
+        return DEFAULT_SEMESTER_RANGES
+    return getattr(config, "SEMESTER_RANGES", DEFAULT_SEMESTER_RANGES)
+
+
+class AcademicCalendar:
+    """
+    학기 기간을 시작일 기준으로 정렬한 interval index (겹치는 기간은 병합).
+    날짜 배열 전체를 searchsorted 한 번으로 조회하므로 O(날짜 수 x log 기간 수).
+    시작일 / 종료일 모두 학기에 포함하며, 날짜 단위로 비교한다.
+    """
+
+    def __init__(self, ranges):
+        bounds = sorted(
+            (np.datetime64(start, "D").astype(np.int64), np.datetime64(end, "D").astype(np.int64))
+            for start, end in ranges
+        )
+        merged = []
+        for start, end in bounds:
+            if start > end:
+                raise ValueError(f"학기 시작일이 종료일보다 늦습니다: {start} > {end}")
+            if merged and start <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        self.starts = np.array([start for start, _ in merged], dtype=np.int64)
+        self.ends = np.array([end for _, end in merged], dtype=np.int64)
+        # 마지막 학기가 속한 해의 말일까지는 학기 정보가 있는 것으로 간주 (이후 날짜 조회 시 1회 경고)
+        self.covered_until = (
+            (np.datetime64(int(self.ends[-1]), "D").astype("datetime64[Y]") + 1).astype("datetime64[D]").astype(np.int64) - 1
+            if len(self.ends) else None
+        )
+        self._warned = False
+
+    def is_semester(self, dates) -> np.ndarray:
+        """
+        날짜 배열(임의 shape)과 같은 shape의 bool 배열
+        """
+        days = np.asarray(dates, dtype="datetime64[ns]").astype("datetime64[D]").astype(np.int64)
+        idx = np.searchsorted(self.starts, days, side="right") - 1
+        in_semester = (idx >= 0) & (days <= self.ends[np.clip(idx, 0, None)]) if len(self.starts) else np.zeros(days.shape, dtype=bool)
+
+        if not self._warned and len(self.ends) and days.size and days.max() > self.covered_until:
+            self._warned = True
+            print(f"[academic_calendar] 학기 정보가 없는 날짜({np.datetime64(int(days.max()), 'D')})는 방학으로 처리합니다. "
+                  f"config.SEMESTER_RANGES에 {np.datetime64(int(self.covered_until), 'D')} 이후 학기를 추가하세요.")
+        return in_semester
+
+    def add_flags(self, df: pd.DataFrame, column: str = "ds") -> pd.DataFrame:
+        """
+        df[column] 날짜로 is_semester / is_vacation (0/1 int) 컬럼 추가
+        """
+        in_semester = self.is_semester(df[column])
+        df["is_semester"] = in_semester.astype(np.int64)
+        df["is_vacation"] = (~in_semester).astype(np.int64)
+        return df
+
+
+calendar = AcademicCalendar(load_semester_ranges())
+
+
+def semester_mask(dates) -> np.ndarray:
+    return calendar.is_semester(dates)
+
+
+def add_semester_flags(df: pd.DataFrame, column: str = "ds") -> pd.DataFrame:
+    return calendar.add_flags(df, column)
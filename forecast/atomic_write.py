@@ -0,0 +1,31 @@
+import os
+from contextlib import contextmanager
+
+
+@contextmanager
+def atomic_path(path: str, suffix: str = ""):
+    """
+    path 대신 쓸 임시 경로를 넘겨주고, 블록이 정상 종료되면 path로 교체 (os.replace).
+    서빙 중인 프로세스는 이전 파일이나 완성된 새 파일만 읽게 되며, 예외가 나면 임시 파일을 지우고 다시 던진다.
+    suffix: 확장자로 형식을 정하는 writer(xgboost save_model 등)를 위한 임시 파일 확장자
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp{suffix}"
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+@contextmanager
+def atomic_open(path: str, mode: str = "w", **kwargs):
+    """
+    open()과 같이 쓰되, 파일을 닫은 뒤 path로 교체 (atomic_path)
+    """
+    with atomic_path(path) as tmp_path, open(tmp_path, mode, **kwargs) as f:
+        yield f
@@ -0,0 +1,197 @@
+import numpy as np
+import pandas as pd
+from prophet import Prophet
+from xgboost import Booster
+from forecast.model_registry import load_prophet_model, load_prophet_params, load_xgb_booster, load_weather_codes
+from forecast.prophet_inference import INFERENCE_MODE, predict_yhat
+from forecast.prophet_kernel import stack_prophet_params, predict_fleet
+from forecast.xgb_artifact import MISSING_WEATHER, predict_booster
+from forecast.features import dayofweek, is_weekend, lag_features
+from forecast.academic_calendar import add_semester_flags, semester_mask
+
+LAG_COLUMNS = [f"rev_t-{i}" for i in range(1, 15)]
+FEATURE_ORDER = [
+    "temp", "rain", "weather_encoded",
+    "lag", "weekly_lag", "dayofweek",
+    "cluster_id", "is_weekend"
+]
+
+def predict_prophet_dates(store_id: int, cluster_id: int, dates: pd.DatetimeIndex) -> np.ndarray:
+    """
+    매장 하나에 대해 여러 날짜의 Prophet yhat을 한 번의 predict로 계산
+    """
+    model: Prophet = load_prophet_model(store_id)
+
+    future = pd.DataFrame({"ds": dates})
+    if cluster_id == 2:
+        add_semester_flags(future)
+
+    future["cap"] = model.history["cap"].max() if "cap" in model.history else 1_000_0000
+    future["floor"] = 0
+    return predict_yhat(model, future)
+
+
+def predict_prophet_rows(store_ids: np.ndarray, cluster_ids: np.ndarray, row_dates: np.ndarray) -> np.ndarray:
+    """
+    행별 예측 날짜 (R, D)에 대한 Prophet yhat.
+    - point 모드: 전체 매장을 NumPy kernel로 한 번에 계산
+    - 그 외: 매장별로 필요한 날짜 합집합에 대해 Prophet predict 1회
+    """
+    if INFERENCE_MODE == "point":
+        unique_stores, store_index = np.unique(store_ids, return_inverse=True)
+        fleet = stack_prophet_params([load_prophet_params(int(store_id)) for store_id in unique_stores])
+        in_semester = semester_mask(row_dates)
+        return predict_fleet(
+            fleet, row_dates, store_index=store_index, floor=0,
+            conditions={"is_semester": in_semester, "is_vacation": ~in_semester},
+        )
+
+    prophet_yhat = np.empty(row_dates.shape)
+    for (store_id, cluster_id), idx in pd.DataFrame({"store_id": store_ids, "cluster_id": cluster_ids}).groupby(
+        ["store_id", "cluster_id"], sort=False
+    ).indices.items():
+        unique_dates, inverse = np.unique(row_dates[idx].ravel(), return_inverse=True)
+        yhat = predict_prophet_dates(int(store_id), int(cluster_id), pd.DatetimeIndex(unique_dates))
+        prophet_yhat[idx] = yhat[inverse].reshape(len(idx), row_dates.shape[1])
+    return prophet_yhat
+
+
+def encode_weather(weather) -> np.ndarray:
+    """
+    weather 문자열 -> 학습 때의 코드 (Haze/Mist/Smoke는 Fog로 통합, 학습 때 없던 값이면 ValueError).
+    결측(None / NaN)은 학습 때와 같은 결측 코드 (학습 데이터에 결측이 없었으면 ValueError)
+    """
+    codes = load_weather_codes()
+    try:
+        return np.array([codes[MISSING_WEATHER if pd.isna(w) else w] for w in weather], dtype=np.float32)
+    except KeyError as e:
+        if e.args[0] == MISSING_WEATHER:
+            raise ValueError("weather 결측값이 있습니다 (학습 데이터에 결측이 없어 대응하는 코드가 없음)")
+        raise ValueError(f"알 수 없는 weather: {e.args[0]}")
+
+
+def xgb_feature_matrix(
+    temp: np.ndarray,
+    rain: np.ndarray,
+    weather: np.ndarray,
+    lags: np.ndarray,
+    cluster_ids: np.ndarray,
+    dayofweek: np.ndarray,
+) -> np.ndarray:
+    """
+    XGBoost 입력 피처 행렬 (R, FEATURE_ORDER) 생성 (학습과 같은 forecast.features 규칙).
+    lags: (R, 14) rev_t-1 ~ rev_t-14
+    반환은 inplace_predict에 바로 넘길 수 있는 C 연속 float32 배열
+    """
+    lag, weekly_lag = lag_features(lags[:, 0], lags[:, 1], lags[:, 6], lags[:, 13])
+
+    features = np.empty((len(lags), len(FEATURE_ORDER)), dtype=np.float32)
+    for j, column in enumerate([
+        temp, rain, encode_weather(weather),
+        lag, weekly_lag, dayofweek,
+        cluster_ids, is_weekend(dayofweek),
+    ]):
+        features[:, j] = column
+    return features
+
+
+def holiday_weekday_masks(lags: np.ndarray, dayofweek: np.ndarray) -> np.ndarray:
+    """
+    check_if_holiday의 벡터화 버전.
+    최근 14일 중 같은 요일 2번의 매출이 모두 0이면 휴일로 판단하여, 행별 요일 bitmask(bit 0 = 월)를 반환
+    """
+    offsets = np.arange(1, 15)
+    weekdays = (dayofweek[:, None] - offsets[None, :]) % 7
+    zero = lags == 0
+
+    masks = np.zeros(len(lags), dtype=np.int64)
+    for weekday in range(7):
+        in_weekday = weekdays == weekday
+        is_holiday = (in_weekday.sum(axis=1) >= 2) & np.all(zero | ~in_weekday, axis=1)
+        masks |= is_holiday.astype(np.int64) << weekday
+    return masks
+
+
+def forecast_arrays(
+    store_ids: np.ndarray,
+    cluster_ids: np.ndarray,
+    dates: np.ndarray,
+    temp: np.ndarray,
+    rain: np.ndarray,
+    weather: np.ndarray,
+    lags: np.ndarray,
+    periods: int = 14,
+):
+    """
+    행 배열 입력에 대한 예측 (DataFrame 없이 registry의 모델로 바로 계산).
+    dates: datetime64[ns] 기준일, lags: (R, 14)
+    반환: (Prophet yhat (R, periods + 1), XGBoost yhat (R,), 행별 휴일 요일 bitmask (R,))
+    """
+    # 행별 예측 대상 날짜: 기준일(1일차) + 다음날부터 periods일
+    row_dates = dates[:, None] + np.arange(periods + 1).astype("timedelta64[D]")[None, :]
+    prophet_yhat = predict_prophet_rows(store_ids, cluster_ids, row_dates)
+
+    # XGBoost 예측 (전체 1회)
+    dow = dayofweek(dates)
+    booster: Booster = load_xgb_booster()
+    xgb_yhat = predict_booster(booster, xgb_feature_matrix(temp, rain, weather, lags, cluster_ids, dow))
+
+    # 예측 후 휴일 요일 판단: 같은 매장의 이후 입력에서 판단된 휴일도 이전 레코드에 반영
+    holiday_masks = holiday_weekday_masks(lags, dow)
+    effective_masks = holiday_masks.copy()
+    for idx in pd.Series(store_ids).groupby(store_ids, sort=False).indices.values():
+        effective_masks[idx] = np.bitwise_or.accumulate(holiday_masks[idx][::-1])[::-1]
+
+    return prophet_yhat, xgb_yhat, effective_masks
+
+
+def forecast_batch(df: pd.DataFrame, periods: int = 14) -> list[dict]:
+    """
+    업로드된 예측 입력 전체를 한 번에 처리.
+    - Prophet: point 모드는 전체 매장 NumPy kernel 1회, 그 외에는 매장별 predict 1회
+    - XGBoost는 전체 행에 대해 predict 1회
+    - 반환 레코드는 행 순서대로 [1일차(Prophet + XGBoost), 2일차 ~ (Prophet only)]
+    """
+    if len(df) == 0:
+        return []
+
+    df = df.reset_index(drop=True)
+    dates = pd.to_datetime(df["date"])
+    store_ids = df["store_id"].astype(int).to_numpy()
+    prophet_yhat, xgb_yhat, effective_masks = forecast_arrays(
+        store_ids,
+        df["cluster_id"].astype(int).to_numpy(),
+        dates.to_numpy(dtype="datetime64[ns]"),
+        df["temp"].to_numpy(dtype=float),
+        df["rain"].to_numpy(dtype=float),
+        df["weather"].to_numpy(),
+        df[LAG_COLUMNS].to_numpy(dtype=float),
+        periods,
+    )
+
+    forecast_result = []
+    for i in range(len(df)):
+        store_id = int(store_ids[i])
+        date = dates.iloc[i]
+        mask = int(effective_masks[i])
+
+        # 1일차 예측 (Prophet + XGBoost)
+        y_prophet = float(prophet_yhat[i, 0])
+        forecast_result.append({
+            "store_id": store_id,
+            "date": date,
+            "prophet_forecast": 0.0 if mask >> date.weekday() & 1 else y_prophet,
+            "xgboost_forecast": float(xgb_yhat[i])
+        })
+
+        # 2일차 ~ (Prophet only)
+        for day in range(1, periods + 1):
+            future_date = date + pd.Timedelta(days=day)
+            forecast_result.append({
+                "store_id": store_id,
+                "date": future_date.strftime("%Y-%m-%d %H:%M:%S"),
+                "prophet_forecast": 0.0 if mask >> future_date.weekday() & 1 else float(prophet_yhat[i, day]),
+                "xgboost_forecast": None
+            })
+
+    return forecast_result
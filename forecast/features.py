@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+# XGBoost 피처 계산에 쓰는 이전 매출 (일 단위 lag)
+FEATURE_LAGS = (1, 2, 7, 14)
+
+
+def lag_ratio(current, previous) -> np.ndarray:
+    """
+    (current - previous) / previous. 이전 값이 0 / 결측이라 유한하지 않으면 0
+    """
+    current = np.asarray(current, dtype=np.float64)
+    previous = np.asarray(previous, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = (current - previous) / previous
+    return np.where(np.isfinite(ratio), ratio, 0.0)
+
+
+def dayofweek(dates) -> np.ndarray:
+    """
+    datetime64 배열의 요일 (월 = 0)
+    """
+    days = np.asarray(dates).astype("datetime64[D]").astype(np.int64)
+    return ((days + 3) % 7).astype(np.int32)  # 1970-01-01은 목요일
+
+
+def is_weekend(dow: np.ndarray) -> np.ndarray:
+    return (np.asarray(dow) >= 5).astype(np.int64)
+
+
+def lag_features(rev_t_1, rev_t_2, rev_t_7, rev_t_14) -> tuple:
+    """
+    학습 / 서빙 공통 매출 변화율 피처: (lag, weekly_lag)
+    """
+    return lag_ratio(rev_t_1, rev_t_2), lag_ratio(rev_t_7, rev_t_14)
+
+
+def daily_lags(df: pd.DataFrame, lags=FEATURE_LAGS, key: str = "store_id", date: str = "date", value: str = "revenue") -> dict:
+    """
+    key별 일 단위 grid에서 value를 lag일 전 값으로 shift (해당 날짜 행이 없으면 NaN).
+
+    매장마다 [첫 날짜, 마지막 날짜] 구간을 이어 붙인 1차원 daily grid에 value를 채운 뒤
+    grid 위치 - lag를 조회하므로, 매장 수와 관계없이 O(행 수 + grid 크기)로 한 번에 계산한다.
+    반환: {lag: (len(df),) float64 배열}
+    """
+    codes = pd.factorize(df[key])[0]
+    days = df[date].to_numpy(dtype="datetime64[ns]").astype("datetime64[D]").astype(np.int64)
+    values = df[value].to_numpy(dtype=np.float64)
+
+    n_keys = codes.max() + 1 if len(codes) else 0
+    first_day = np.full(n_keys, np.iinfo(np.int64).max)
+    last_day = np.full(n_keys, np.iinfo(np.int64).min)
+    np.minimum.at(first_day, codes, days)
+    np.maximum.at(last_day, codes, days)
+
+    # key별 grid 시작 위치
+    span = last_day - first_day + 1
+    offsets = np.concatenate([[0], np.cumsum(span)[:-1]])
+    day_index = days - first_day[codes]
+    grid = np.full(int(span.sum()), np.nan)
+    grid[offsets[codes] + day_index] = values
+
+    shifted = {}
+    for lag in lags:
+        in_range = day_index >= lag
+        result = np.full(len(df), np.nan)
+        result[in_range] = grid[(offsets[codes] + day_index - lag)[in_range]]
+        shifted[lag] = result
+    return shifted
+
+
+def generate_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    날짜 기준으로 store_id별 lag, weekly_lag, dayofweek, is_weekend 피처 생성
+    (이전 날짜가 없으면 0으로 처리). 전체 long-format 데이터를 매장 loop 없이 한 번에 계산한다.
+    """
+    df = df.sort_values(["store_id", "date"]).reset_index(drop=True)
+    # 기존 출력과 같이 date를 첫 컬럼으로
+    df = df[["date"] + [column for column in df.columns if column != "date"]]
+
+    shifted = daily_lags(df)
+    df["lag"], df["weekly_lag"] = lag_features(shifted[1], shifted[2], shifted[7], shifted[14])
+    df["dayofweek"] = dayofweek(df["date"].to_numpy())
+    df["is_weekend"] = is_weekend(df["dayofweek"].to_numpy())
+    return df
@@ -0,0 +1,179 @@
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from forecast.prophet_kernel import extract_prophet_params, params_nbytes
+from forecast.prophet_artifact import artifact_paths, load_prophet_artifact
+from forecast.xgb_artifact import load_booster, load_weather_codes as _load_weather_codes, weather_code_table
+from settings import setting
+
+PROPHET_MODEL_DIR = "./models/prophet"
+XGB_MODEL_PATH = "./models/xgb/xgb_model.ubj"
+WEATHER_CODES_PATH = "./models/xgb/weather_codes.json"
+# native 형식 이전에 학습된 모델 (pickle)
+LEGACY_XGB_MODEL_PATH = "./models/xgb/xgb_model.pkl"
+LEGACY_LABEL_ENCODER_PATH = "./models/xgb/label_encoder.pkl"
+
+# 캐시 한도 (config 또는 환경 변수로 조정 가능)
+MAX_ITEMS = int(setting("MODEL_CACHE_MAX_ITEMS", 4096))
+MAX_BYTES = int(setting("MODEL_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+
+
+def _load_pickle(path: str):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+class ModelRegistry:
+    """
+    프로세스 전역에서 공유하는 모델 캐시 (LRU).
+
+    - key는 파일 경로, version은 (mtime, size) 또는 호출자가 넘긴 값
+    - 파일이 다시 저장되어 version이 바뀌면 자동으로 다시 load
+    - 항목 수 / 메모리(파일 크기 기준 추정) 한도를 넘으면 가장 오래 쓰지 않은 모델부터 제거
+    """
+
+    def __init__(self, max_items: int = MAX_ITEMS, max_bytes: int = MAX_BYTES):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._cache = OrderedDict()  # key -> (version, size, obj)
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, path: str, name: str = "Model", loader=_load_pickle, version=None, key: str = None, sizeof=None):
+        """
+        path의 artifact를 캐시에서 반환 (없거나 version이 바뀌었으면 loader로 load).
+        같은 파일에서 파생된 객체를 따로 캐시하려면 key를 지정하고, 메모리 추정이 파일 크기와 다르면 sizeof(obj)를 넘긴다.
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{name} not found at {path}")
+        stat = os.stat(path)
+        if version is None:
+            version = (stat.st_mtime_ns, stat.st_size)
+        if key is None:
+            key = path
+
+        cached = self._lookup(key, version)
+        if cached is not None:
+            return cached
+
+        # 같은 파일을 여러 스레드가 동시에 load 하지 않도록 key 단위 lock
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            cached = self._lookup(key, version, count=False)
+            if cached is not None:
+                return cached
+            obj = loader(path)
+            self._store(key, version, sizeof(obj) if sizeof else stat.st_size, obj)
+            return obj
+
+    def _lookup(self, key, version, count: bool = True):
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] == version:
+                self._cache.move_to_end(key)
+                if count:
+                    self.hits += 1
+                return entry[2]
+            if count:
+                self.misses += 1
+            return None
+
+    def _store(self, key, version, size, obj):
+        with self._lock:
+            old = self._cache.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            self._cache[key] = (version, size, obj)
+            self.total_bytes += size
+
+            # 한도 초과 시 LRU 제거 (방금 넣은 항목은 유지)
+            while len(self._cache) > 1 and (
+                len(self._cache) > self.max_items or self.total_bytes > self.max_bytes
+            ):
+                evicted_key, (_, evicted_size, _) = self._cache.popitem(last=False)
+                self._key_locks.pop(evicted_key, None)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+
+    def invalidate(self, key: str = None):
+        with self._lock:
+            if key is None:
+                self._cache.clear()
+                self.total_bytes = 0
+                return
+            entry = self._cache.pop(key, None)
+            if entry is not None:
+                self.total_bytes -= entry[1]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "items": len(self._cache),
+                "bytes": self.total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+registry = ModelRegistry()
+
+
+def prophet_model_path(store_id) -> str:
+    return f"{PROPHET_MODEL_DIR}/{store_id}.pkl"
+
+
+def load_prophet_model(store_id):
+    return registry.get(prophet_model_path(store_id), "Prophet model")
+
+
+def load_prophet_params(store_id):
+    """
+    NumPy 추론 파라미터 (forecast.prophet_kernel 용).
+    학습 시 저장된 서빙 artifact가 pkl보다 오래되지 않았으면 그것을 (pickle 없이) 사용하고,
+    없으면 pkl에서 추출한다.
+    """
+    path = prophet_model_path(store_id)
+    artifact_path, _ = artifact_paths(PROPHET_MODEL_DIR, store_id)
+    if os.path.exists(artifact_path) and (
+        not os.path.exists(path) or os.stat(artifact_path).st_mtime_ns >= os.stat(path).st_mtime_ns
+    ):
+        return registry.get(artifact_path, "Prophet serving artifact", loader=load_prophet_artifact, sizeof=params_nbytes)
+    return registry.get(
+        path, "Prophet model",
+        loader=lambda p: extract_prophet_params(_load_pickle(p)),
+        key=f"{path}#params",
+        sizeof=params_nbytes,
+    )
+
+
+def load_xgb_booster():
+    """
+    XGBoost Booster (native 형식, 없으면 기존 pkl의 XGBRegressor에서 꺼냄)
+    """
+    if os.path.exists(XGB_MODEL_PATH) or not os.path.exists(LEGACY_XGB_MODEL_PATH):
+        return registry.get(XGB_MODEL_PATH, "XGBoost model", loader=load_booster)
+    return registry.get(
+        LEGACY_XGB_MODEL_PATH, "XGBoost model",
+        loader=lambda p: _load_pickle(p).get_booster(),
+        key=f"{LEGACY_XGB_MODEL_PATH}#booster",
+    )
+
+
+def load_weather_codes():
+    """
+    weather 문자열 -> 코드 mapping table (없으면 기존 LabelEncoder pkl에서 생성)
+    """
+    if os.path.exists(WEATHER_CODES_PATH) or not os.path.exists(LEGACY_LABEL_ENCODER_PATH):
+        return registry.get(WEATHER_CODES_PATH, "Weather codes", loader=_load_weather_codes)
+    return registry.get(
+        LEGACY_LABEL_ENCODER_PATH, "LabelEncoder",
+        loader=lambda p: weather_code_table(_load_pickle(p).classes_),
+        key=f"{LEGACY_LABEL_ENCODER_PATH}#codes",
+    )
@@ -1,8 +1,9 @@
 import pandas as pd
-import pickle
-import os
 from prophet import Prophet
 from datetime import datetime, timedelta
+from forecast.model_registry import load_prophet_model
+from forecast.prophet_inference import predict_yhat
+from forecast.academic_calendar import add_semester_flags
 
 def predict_period(data: dict, periods: int) -> dict:
     store_id = data["store_id"]
@@ -10,12 +11,8 @@ def predict_period(data: dict, periods: int) -> dict:
     date = pd.to_datetime(date_str)
     cluster_id = data["cluster_id"]
 
-    # Prophet 모델 Load
-    prophet_model_path = f"./models/prophet/{store_id}.pkl"
-    if not os.path.exists(prophet_model_path):
-        raise FileNotFoundError(f"Prophet model not found at {prophet_model_path}")
-    with open(prophet_model_path, "rb") as f:
-        model: Prophet = pickle.load(f)
+    # Prophet 모델 Load (registry 캐시 사용)
+    model: Prophet = load_prophet_model(store_id)
 
     # date+1 - n일간 예측할 날짜 생성
     start_date = pd.to_datetime(date) + pd.Timedelta(days=1)
@@ -24,21 +21,12 @@ def predict_period(data: dict, periods: int) -> dict:
 
     # cluster_id가 2인 경우, 학기 여부 반영
     if cluster_id == 2:
-        semester_ranges = [
-            ("2023-03-01", "2023-06-23"), ("2023-09-01", "2023-12-22"),
-            ("2024-03-04", "2024-06-20"), ("2024-09-02", "2024-12-20"),
-            ("2025-03-04", "2025-06-20"), ("2025-09-01", "2025-12-20")
-        ]
-        future["is_semester"] = future["ds"].apply(
-            lambda d: int(any(pd.to_datetime(start) <= d <= pd.to_datetime(end) for start, end in semester_ranges))
-        )
-        future["is_vacation"] = 1 - future["is_semester"]
+        add_semester_flags(future)
 
     # cap, floor 설정
     future["cap"] = model.history["cap"].max() if "cap" in model.history else 1_000_0000
     future["floor"] = 0
 
-    forecast = model.predict(future)
-    yhat_list = forecast["yhat"].tolist()
+    yhat_list = predict_yhat(model, future).tolist()
     
     return {store_id: yhat_list}
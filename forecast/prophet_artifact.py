@@ -0,0 +1,102 @@
+import os
+import json
+import numpy as np
+from prophet import Prophet
+from forecast.prophet_kernel import extract_prophet_params
+from forecast.atomic_write import atomic_open
+
+# 서빙 artifact 형식 버전 (구조가 바뀌면 올리고, 다른 버전은 pkl로 fallback)
+ARTIFACT_VERSION = 1
+ARTIFACT_SUFFIX = ".serving.json"
+ARRAYS_SUFFIX = ".serving.npy"
+
+SCALAR_KEYS = ("growth", "k", "m", "y_scale", "start", "t_scale", "floor", "cap")
+
+
+def artifact_paths(model_dir: str, store_id) -> tuple:
+    base = os.path.join(model_dir, str(store_id))
+    return base + ARTIFACT_SUFFIX, base + ARRAYS_SUFFIX
+
+
+def save_prophet_artifact(model: Prophet, store_id, model_dir: str):
+    """
+    yhat 계산에 필요한 파라미터만 서빙용 artifact로 저장.
+    - {store_id}.serving.npy: 모든 배열을 이어 붙인 float64 벡터 (np.load mmap 가능)
+    - {store_id}.serving.json: 스칼라, seasonality / holiday 설정, 배열별 (offset, 길이)
+    지원하지 않는 모델(extra regressor 등)이면 저장하지 않고 None 반환 (서빙은 pkl 사용)
+    """
+    json_path, npy_path = artifact_paths(model_dir, store_id)
+    try:
+        params = extract_prophet_params(model)
+    except ValueError as e:
+        print(f"[{store_id}] 서빙 artifact 생략: {e}")
+        # 이전 학습의 artifact가 새 pkl보다 우선 사용되지 않도록 삭제
+        for path in (json_path, npy_path):
+            if os.path.exists(path):
+                os.remove(path)
+        return None
+
+    chunks = []
+    offset = 0
+
+    def add(values) -> list:
+        nonlocal offset
+        values = np.asarray(values, dtype=np.float64).ravel()
+        chunks.append(values)
+        span = [offset, len(values)]
+        offset += len(values)
+        return span
+
+    meta = {
+        "version": ARTIFACT_VERSION,
+        **{key: params[key] for key in SCALAR_KEYS},
+        "delta": add(params["delta"]),
+        "gamma": add(params["gamma"]),
+        "changepoints_t": add(params["changepoints_t"]),
+        "seasonalities": [
+            {**{key: s[key] for key in ("name", "period", "fourier_order", "mode", "condition_name")}, "beta": add(s["beta"])}
+            for s in params["seasonalities"]
+        ],
+        # holiday 날짜(epoch 일수)는 float64로 정확히 표현되는 정수
+        "holidays": [
+            {"name": h["name"], "mode": h["mode"], "beta": h["beta"], "days": add(h["days"])}
+            for h in params["holidays"]
+        ],
+    }
+    meta["n_values"] = offset
+
+    # 배열 먼저 쓰고 json을 마지막에 교체 (json이 있으면 배열도 완성된 상태)
+    with atomic_open(npy_path, "wb") as f:
+        np.save(f, np.concatenate(chunks) if chunks else np.zeros(0))
+    with atomic_open(json_path) as f:
+        json.dump(meta, f)
+    return json_path
+
+
+def load_prophet_artifact(json_path: str, mmap: bool = False) -> dict:
+    """
+    서빙 artifact를 extract_prophet_params와 같은 구조의 dict로 load (pickle 사용 안 함).
+    기본은 배열을 메모리로 읽고 파일을 닫는다 (매장별 artifact는 수 KB라 mmap 이득이 없고,
+    cache된 memmap마다 fd가 열린 채로 남는다). mmap=True면 .npy 파일을 memory-map 한 view
+    """
+    with open(json_path) as f:
+        meta = json.load(f)
+    if meta.get("version") != ARTIFACT_VERSION:
+        raise ValueError(f"지원하지 않는 서빙 artifact 버전: {meta.get('version')}")
+
+    values = np.load(json_path[: -len(ARTIFACT_SUFFIX)] + ARRAYS_SUFFIX, mmap_mode="r" if mmap else None)
+    if len(values) != meta["n_values"]:
+        raise ValueError(f"서빙 artifact 배열 크기 불일치: {json_path}")
+
+    def view(span):
+        start, length = span
+        return values[start:start + length]
+
+    return {
+        **{key: meta[key] for key in SCALAR_KEYS},
+        "delta": view(meta["delta"]),
+        "gamma": view(meta["gamma"]),
+        "changepoints_t": view(meta["changepoints_t"]),
+        "seasonalities": [{**s, "beta": view(s["beta"])} for s in meta["seasonalities"]],
+        "holidays": [{**h, "days": view(h["days"]).astype(np.int64)} for h in meta["holidays"]],
+    }
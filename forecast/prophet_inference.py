@@ -0,0 +1,67 @@
+from statistics import NormalDist
+import numpy as np
+import pandas as pd
+from prophet import Prophet
+from settings import setting
+
+# 추론 모드
+# - "point": yhat만 계산 (불확실성 샘플링 생략)
+# - "intervals": yhat_lower / yhat_upper까지 계산
+INFERENCE_MODE = setting("PROPHET_INFERENCE_MODE", "point")
+
+# intervals 모드의 구간 계산 방식
+# - "sampling": Prophet 시뮬레이션 (INTERVAL_SAMPLES 회)
+# - "analytic": 관측 노이즈(sigma_obs) 기반 정규 근사, 샘플링 없음
+INTERVAL_METHOD = setting("PROPHET_INTERVAL_METHOD", "sampling")
+INTERVAL_SAMPLES = int(setting("PROPHET_INTERVAL_SAMPLES", 1000))
+
+
+def interval_uncertainty_samples(method: str = INTERVAL_METHOD, samples: int = INTERVAL_SAMPLES) -> int:
+    """
+    구간이 필요한 모델을 생성할 때 Prophet(uncertainty_samples=...)에 넘길 값
+    """
+    return samples if method == "sampling" else 0
+
+
+def predict_point(model: Prophet, future: pd.DataFrame) -> pd.DataFrame:
+    """
+    불확실성 시뮬레이션 없이 trend + seasonality만으로 yhat 계산.
+    model.predict(future)["yhat"]과 같은 값이며, 결과는 ds 기준으로 정렬된다.
+    """
+    df = model.setup_dataframe(future.copy())
+    trend = model.predict_trend(df)
+    seasonal_components = model.predict_seasonal_components(df)
+    yhat = trend * (1 + seasonal_components["multiplicative_terms"]) + seasonal_components["additive_terms"]
+    return pd.DataFrame({"ds": df["ds"], "trend": trend, "yhat": yhat})
+
+
+def predict_with_intervals(model: Prophet, future: pd.DataFrame, method: str = INTERVAL_METHOD) -> pd.DataFrame:
+    """
+    yhat, yhat_lower, yhat_upper 계산.
+    - sampling: model.uncertainty_samples 횟수만큼 Prophet 시뮬레이션
+    - analytic: yhat ± z * sigma_obs * y_scale (trend 불확실성은 1개월 이내 예측에서 무시 가능한 수준이라 제외)
+    """
+    if method == "sampling":
+        if not model.uncertainty_samples:
+            raise ValueError("sampling 방식은 uncertainty_samples > 0 인 모델이 필요합니다")
+        return model.predict(future)[["ds", "yhat", "yhat_lower", "yhat_upper"]]
+    if method != "analytic":
+        raise ValueError(f"지원하지 않는 interval method: {method}")
+
+    forecast = predict_point(model, future)
+    sigma = float(np.nanmean(model.params["sigma_obs"])) * model.y_scale
+    z = NormalDist().inv_cdf((1 + model.interval_width) / 2)
+    forecast["yhat_lower"] = forecast["yhat"] - z * sigma
+    forecast["yhat_upper"] = forecast["yhat"] + z * sigma
+    return forecast[["ds", "yhat", "yhat_lower", "yhat_upper"]]
+
+
+def predict_yhat(model: Prophet, future: pd.DataFrame, mode: str = INFERENCE_MODE) -> np.ndarray:
+    """
+    설정된 추론 모드로 yhat 배열 반환 (ds 오름차순)
+    """
+    if mode == "point":
+        return predict_point(model, future)["yhat"].to_numpy()
+    if mode == "intervals":
+        return predict_with_intervals(model, future)["yhat"].to_numpy()
+    raise ValueError(f"지원하지 않는 inference mode: {mode}")
@@ -0,0 +1,253 @@
+import numpy as np
+import pandas as pd
+from prophet import Prophet
+
+NANOSECONDS_PER_SECOND = 10 ** 9
+SECONDS_PER_DAY = 3600 * 24
+DEFAULT_CAP = 1_000_0000
+GROWTH_CODES = {"linear": 0, "logistic": 1, "flat": 2}
+
+
+def extract_prophet_params(model: Prophet) -> dict:
+    """
+    학습된 Prophet 모델에서 yhat 계산에 필요한 파라미터만 추출.
+    (trend changepoint/delta, cap, Fourier seasonality beta, 조건부 seasonality, holiday 효과)
+    """
+    if model.history is None:
+        raise ValueError("Model has not been fit.")
+    if model.extra_regressors:
+        raise ValueError("extra regressor가 있는 모델은 지원하지 않습니다")
+    if model.country_holidays is not None:
+        raise ValueError("country_holidays가 설정된 모델은 지원하지 않습니다")
+
+    k = float(np.nanmean(model.params["k"]))
+    m = float(np.nanmean(model.params["m"]))
+    delta = np.nanmean(model.params["delta"], axis=0).astype(float)
+    beta = np.nanmean(model.params["beta"], axis=0).astype(float)
+    changepoints_t = np.asarray(model.changepoints_t, dtype=float)
+
+    # beta 열 순서 = make_all_seasonality_features의 열 순서
+    seasonal_features, _, _, _ = model.make_all_seasonality_features(model.history)
+    columns = {name: i for i, name in enumerate(seasonal_features.columns)}
+
+    seasonalities = []
+    for name, props in model.seasonalities.items():
+        idx = [columns[f"{name}_delim_{i + 1}"] for i in range(2 * props["fourier_order"])]
+        seasonalities.append({
+            "name": name,
+            "period": float(props["period"]),
+            "fourier_order": int(props["fourier_order"]),
+            "mode": props["mode"],
+            "condition_name": props["condition_name"],
+            "beta": beta[idx],
+        })
+
+    # holiday feature별로 1이 되는 날짜 (epoch 기준 일수)
+    holiday_days = {}
+    holidays = model.construct_holiday_dataframe(model.history["ds"])
+    for row in holidays.itertuples():
+        if pd.isna(row.ds):
+            continue
+        lower = int(getattr(row, "lower_window", 0) or 0)
+        upper = int(getattr(row, "upper_window", 0) or 0)
+        day = (pd.Timestamp(row.ds).normalize() - pd.Timestamp("1970-01-01")).days
+        for offset in range(lower, upper + 1):
+            key = "{}_delim_{}{}".format(row.holiday, "+" if offset >= 0 else "-", abs(offset))
+            holiday_days.setdefault(key, set()).add(day + offset)
+
+    holiday_list = []
+    for name, days in sorted(holiday_days.items()):
+        if name not in columns:
+            continue
+        holiday_list.append({
+            "name": name,
+            "mode": model.holidays_mode,
+            "beta": float(beta[columns[name]]),
+            "days": np.array(sorted(days), dtype=np.int64),
+        })
+
+    if model.growth == "logistic":
+        k_cum = np.concatenate(([k], np.cumsum(delta) + k))
+        gamma = np.zeros(len(changepoints_t))
+        for i, t_s in enumerate(changepoints_t):
+            gamma[i] = (t_s - m - gamma.sum()) * (1 - k_cum[i] / k_cum[i + 1])
+    else:
+        gamma = -changepoints_t * delta
+
+    return {
+        "growth": model.growth,
+        "k": k,
+        "m": m,
+        "delta": delta,
+        "gamma": gamma,
+        "changepoints_t": changepoints_t,
+        "y_scale": float(model.y_scale),
+        "start": model.start.value / NANOSECONDS_PER_SECOND,
+        "t_scale": model.t_scale.value / NANOSECONDS_PER_SECOND,
+        "floor": float(model.y_min) if (not model.logistic_floor and model.scaling == "minmax") else 0.0,
+        "cap": float(model.history["cap"].max()) if "cap" in model.history else DEFAULT_CAP,
+        "seasonalities": seasonalities,
+        "holidays": holiday_list,
+    }
+
+
+def params_nbytes(params: dict) -> int:
+    """
+    추출된 파라미터의 대략적인 메모리 크기 (registry 용량 계산용)
+    """
+    size = 8 * 16
+    for key in ("delta", "gamma", "changepoints_t"):
+        size += params[key].nbytes
+    size += sum(s["beta"].nbytes + 64 for s in params["seasonalities"])
+    size += sum(h["days"].nbytes + 64 for h in params["holidays"])
+    return size
+
+
+def stack_prophet_params(params_list: list[dict]) -> dict:
+    """
+    여러 매장의 파라미터를 (매장 x ...) 배열로 쌓는다.
+    changepoint 수가 다르면 t=inf / delta=0 으로 padding, 없는 seasonality/holiday의 beta는 0.
+    """
+    n_stores = len(params_list)
+    n_changepoints = max((len(p["changepoints_t"]) for p in params_list), default=0)
+
+    changepoints_t = np.full((n_stores, n_changepoints), np.inf)
+    delta = np.zeros((n_stores, n_changepoints))
+    gamma = np.zeros((n_stores, n_changepoints))
+    for i, p in enumerate(params_list):
+        c = len(p["changepoints_t"])
+        changepoints_t[i, :c] = p["changepoints_t"]
+        delta[i, :c] = p["delta"]
+        gamma[i, :c] = p["gamma"]
+
+    seasonal_blocks = {}
+    for i, p in enumerate(params_list):
+        for s in p["seasonalities"]:
+            key = (s["name"], s["period"], s["fourier_order"], s["mode"], s["condition_name"])
+            block = seasonal_blocks.setdefault(key, np.zeros((n_stores, 2 * s["fourier_order"])))
+            block[i] = s["beta"]
+
+    holiday_blocks = {}
+    for i, p in enumerate(params_list):
+        for h in p["holidays"]:
+            block = holiday_blocks.setdefault((h["name"], h["mode"]), {"beta": np.zeros(n_stores), "keys": []})
+            block["beta"][i] = h["beta"]
+            block["keys"].append(_holiday_keys(np.full(len(h["days"]), i), h["days"]))
+    for block in holiday_blocks.values():
+        block["keys"] = np.sort(np.concatenate(block["keys"]))
+
+    return {
+        "growth": np.array([GROWTH_CODES[p["growth"]] for p in params_list]),
+        "k": np.array([p["k"] for p in params_list]),
+        "m": np.array([p["m"] for p in params_list]),
+        "y_scale": np.array([p["y_scale"] for p in params_list]),
+        "start": np.array([p["start"] for p in params_list]),
+        "t_scale": np.array([p["t_scale"] for p in params_list]),
+        "floor": np.array([p["floor"] for p in params_list]),
+        "cap": np.array([p["cap"] for p in params_list]),
+        "changepoints_t": changepoints_t,
+        "delta": delta,
+        "gamma": gamma,
+        "seasonal_blocks": seasonal_blocks,
+        "holiday_blocks": holiday_blocks,
+    }
+
+
+def _holiday_keys(store_index: np.ndarray, days: np.ndarray) -> np.ndarray:
+    # (매장, 날짜) 쌍을 하나의 int64 key로 encoding
+    return store_index.astype(np.int64) * (1 << 32) + (days.astype(np.int64) + (1 << 31))
+
+
+def predict_fleet(
+    fleet: dict,
+    dates,
+    store_index: np.ndarray = None,
+    cap=None,
+    floor=None,
+    conditions: dict = None,
+) -> np.ndarray:
+    """
+    여러 매장 x 여러 날짜의 yhat을 한 번에 계산 (Prophet.predict의 yhat과 동일한 식).
+
+    dates: (R, D) 또는 (D,) datetime64 배열
+    store_index: 각 행 R이 참조할 fleet 매장 index (기본값: 0..S-1)
+    cap / floor: 스칼라, (R,) 또는 (R, D). 기본값은 학습 시 cap 최대값 / 0
+    conditions: 조건부 seasonality 이름 -> (R, D) 또는 (D,) bool 배열
+    """
+    n_stores = len(fleet["k"])
+    if store_index is None:
+        store_index = np.arange(n_stores)
+    store_index = np.asarray(store_index)
+    n_rows = len(store_index)
+
+    dates = np.asarray(dates, dtype="datetime64[ns]")
+    if dates.ndim == 1:
+        dates = np.broadcast_to(dates, (n_rows, len(dates)))
+    ns = dates.astype(np.int64)
+
+    def per_row(values):
+        return np.asarray(values, dtype=float)[store_index][:, None]
+
+    def broadcast(value, default):
+        value = default if value is None else np.asarray(value, dtype=float)
+        if value.ndim == 1:
+            value = value[:, None]
+        return np.broadcast_to(value, ns.shape)
+
+    cap = broadcast(cap, per_row(fleet["cap"]))
+    floor = broadcast(floor, per_row(fleet["floor"]))
+
+    # trend
+    seconds = ns // NANOSECONDS_PER_SECOND
+    t = (seconds - per_row(fleet["start"])) / per_row(fleet["t_scale"])
+    after = (t[:, :, None] >= fleet["changepoints_t"][store_index][:, None, :]).astype(float)
+    k_t = per_row(fleet["k"]) + np.einsum("rdc,rc->rd", after, fleet["delta"][store_index])
+    m_t = per_row(fleet["m"]) + np.einsum("rdc,rc->rd", after, fleet["gamma"][store_index])
+
+    growth = fleet["growth"][store_index][:, None]
+    y_scale = per_row(fleet["y_scale"])
+    with np.errstate(over="ignore"):
+        logistic = ((cap - floor) / y_scale) / (1 + np.exp(-k_t * (t - m_t)))
+    trend = np.where(growth == GROWTH_CODES["logistic"], logistic, k_t * t + m_t)
+    trend = np.where(growth == GROWTH_CODES["flat"], per_row(fleet["m"]), trend)
+    trend = trend * y_scale + floor
+
+    # seasonality (Fourier)
+    additive = np.zeros(ns.shape)
+    multiplicative = np.zeros(ns.shape)
+    days = seconds / SECONDS_PER_DAY
+    for (name, period, order, mode, condition_name), beta in fleet["seasonal_blocks"].items():
+        x = 2 * np.pi * days / period
+        features = np.empty(ns.shape + (2 * order,))
+        for i in range(order):
+            features[:, :, 2 * i] = np.sin(x * (i + 1))
+            features[:, :, 2 * i + 1] = np.cos(x * (i + 1))
+        component = np.einsum("rdf,rf->rd", features, beta[store_index])
+        if condition_name is not None:
+            if conditions is None or condition_name not in conditions:
+                raise ValueError(f"Condition {condition_name!r} missing")
+            component = component * np.broadcast_to(np.asarray(conditions[condition_name], dtype=bool), ns.shape)
+        if mode == "additive":
+            additive += component
+        else:
+            multiplicative += component
+
+    # holidays
+    day_index = np.floor_divide(ns, NANOSECONDS_PER_SECOND * SECONDS_PER_DAY)
+    keys = _holiday_keys(np.broadcast_to(store_index[:, None], ns.shape), day_index)
+    for (name, mode), block in fleet["holiday_blocks"].items():
+        component = np.isin(keys, block["keys"]) * block["beta"][store_index][:, None]
+        if mode == "additive":
+            additive += component
+        else:
+            multiplicative += component
+
+    return trend * (1 + multiplicative) + additive * y_scale
+
+
+def predict_store(params: dict, dates, cap=None, floor=None, conditions: dict = None) -> np.ndarray:
+    """
+    매장 하나에 대한 yhat 계산 (dates: (D,))
+    """
+    fleet = stack_prophet_params([params])
+    return predict_fleet(fleet, dates, cap=cap, floor=floor, conditions=conditions)[0]
@@ -0,0 +1,80 @@
+import json
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from forecast.atomic_write import atomic_open, atomic_path
+
+# 학습 / 서빙 공통 weather 통합 규칙
+WEATHER_ALIASES = {"Haze": "Fog", "Mist": "Fog", "Smoke": "Fog"}
+
+
+# weather 결측(NaN)의 코드를 저장하는 key (JSON key로 NaN을 쓸 수 없어 예약어 사용)
+MISSING_WEATHER = "__missing__"
+
+
+def weather_classes(values) -> list:
+    """
+    LabelEncoder의 classes_와 같은 순서: 결측이 아닌 값을 정렬하고, 결측(NaN)이 있으면 마지막에 NaN 하나
+    """
+    labels = sorted({label for label in values if not pd.isna(label)})
+    if any(pd.isna(label) for label in values):
+        labels.append(np.nan)
+    return labels
+
+
+def encode_weather_labels(weather: pd.Series) -> tuple:
+    """
+    weather 문자열 Series -> (코드 Series, classes). LabelEncoder.fit_transform과 같은 코드를 만든다
+    """
+    classes = weather_classes(weather.unique())
+    labels = [label for label in classes if not pd.isna(label)]
+    codes = weather.map({label: code for code, label in enumerate(labels)}).fillna(len(labels)).astype(np.int64)
+    return codes, classes
+
+
+def weather_code_table(classes) -> dict:
+    """
+    weather 문자열 -> 코드 mapping (LabelEncoder와 같은 정렬 순서).
+    학습 데이터에 결측(NaN)이 있었으면 그 코드(마지막 코드)를 MISSING_WEATHER key로 함께 저장한다.
+    alias(Haze/Mist/Smoke)도 통합 대상의 코드로 함께 넣어 서빙에서는 dict 조회 1번으로 끝낸다.
+    """
+    classes = weather_classes(classes)
+    labels = [label for label in classes if not pd.isna(label)]
+    codes = {str(label): code for code, label in enumerate(labels)}
+    if len(labels) < len(classes):
+        codes[MISSING_WEATHER] = len(labels)
+    for alias, target in WEATHER_ALIASES.items():
+        if target in codes:
+            codes.setdefault(alias, codes[target])
+    return codes
+
+
+def save_xgb_artifact(booster: xgb.Booster, weather_classes, model_path: str, weather_codes_path: str):
+    """
+    XGBoost Booster를 native 형식(.ubj)으로, weather 인코딩을 JSON mapping table로 저장 (pickle 사용 안 함).
+    임시 파일에 쓴 뒤 교체하여 서빙 중인 프로세스가 반쯤 쓰인 파일을 읽지 않도록 한다.
+    """
+    with atomic_open(weather_codes_path) as f:
+        json.dump(weather_code_table(weather_classes), f, ensure_ascii=False, indent=2)
+
+    # save_model은 확장자로 형식을 정하므로 임시 파일도 .ubj로 끝나게 한다
+    with atomic_path(model_path, suffix=".ubj") as tmp_path:
+        booster.save_model(tmp_path)
+
+
+def load_booster(path: str) -> xgb.Booster:
+    booster = xgb.Booster()
+    booster.load_model(path)
+    return booster
+
+
+def load_weather_codes(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def predict_booster(booster: xgb.Booster, features: np.ndarray) -> np.ndarray:
+    """
+    DMatrix / DataFrame 변환 없이 연속된 float32 배열로 바로 예측 (inplace_predict)
+    """
+    return booster.inplace_predict(np.ascontiguousarray(features, dtype=np.float32))
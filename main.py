@@ -1,12 +1,24 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from routers.train import train_router
 from routers.forecast import forecast_router
+from routers.executors import shutdown_executors
+from routers.jobs import get_job_store
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 이전 프로세스에서 끝나지 못한 학습 job 정리
+    get_job_store().fail_interrupted()
+    yield
+    # 학습/예측 executor 정리
+    shutdown_executors()
 
 app = FastAPI(
     title="매출 예측 시스템",
     description="Prophet/XGBoost 학습 및 예측 API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.include_router(train_router)
-app.include_router(forecast_router)
\ No newline at end of file
+app.include_router(forecast_router)
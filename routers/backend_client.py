@@ -0,0 +1,147 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import config
+from settings import setting
+
+# 백엔드 동시 요청 수 (= connection pool 크기)
+BACKEND_CONCURRENCY = int(setting("BACKEND_CONCURRENCY", 16))
+# 요청 timeout (초)
+BACKEND_TIMEOUT = float(setting("BACKEND_TIMEOUT", 10))
+# 한 요청에 묶어 보낼 row 수 (1이면 row당 1건, 2 이상이면 JSON 배열로 전송)
+BACKEND_BATCH_SIZE = int(setting("BACKEND_BATCH_SIZE", 1))
+# patch_many 재시도 횟수 (연결 실패 / 429 / 5xx). PATCH는 같은 값을 다시 보내도 결과가 같으므로 재전송 허용
+BACKEND_PATCH_RETRIES = int(setting("BACKEND_PATCH_RETRIES", 2))
+# 재시도 간격 (초, 시도마다 2배)
+BACKEND_RETRY_BACKOFF = float(setting("BACKEND_RETRY_BACKOFF", 0.2))
+
+
+class BackendClient:
+    """
+    백엔드 API client.
+    connection pool을 유지하는 Session 하나를 공유하고, 여러 건은 thread pool로 동시에 보낸다.
+    token_manager가 있으면 Bearer 토큰을 붙이고, 401 응답이면 토큰을 갱신해 한 번 재시도한다.
+    """
+
+    def __init__(
+        self,
+        base_url: str = None,
+        concurrency: int = BACKEND_CONCURRENCY,
+        timeout: float = BACKEND_TIMEOUT,
+        token_manager=None,
+    ):
+        self.base_url = base_url or config.BACKEND_URL
+        self.token_manager = token_manager
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.session = requests.Session()
+        # 연결 실패만 재시도 (POST 본문이 전달된 뒤의 재전송은 하지 않음)
+        retry = Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.1, allowed_methods=None)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, method: str, path: str, headers: dict = None, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        url = f"{self.base_url}{path}"
+        if self.token_manager is None:
+            return self.session.request(method, url, headers=headers, **kwargs)
+
+        token = self.token_manager.get_token()
+        response = self.session.request(method, url, headers={**(headers or {}), "Authorization": f"Bearer {token}"}, **kwargs)
+        if response.status_code == 401:
+            token = self.token_manager.refresh(stale_token=token)
+            response = self.session.request(method, url, headers={**(headers or {}), "Authorization": f"Bearer {token}"}, **kwargs)
+        return response
+
+    def post(self, path: str, json=None, headers: dict = None) -> requests.Response:
+        return self.request("POST", path, json=json, headers=headers)
+
+    def patch(self, path: str, json=None, headers: dict = None) -> requests.Response:
+        return self.request("PATCH", path, json=json, headers=headers)
+
+    def post_many(
+        self,
+        path: str,
+        payloads: list,
+        headers: dict = None,
+        expected_status: int = 204,
+        batch_size: int = BACKEND_BATCH_SIZE,
+    ) -> dict:
+        """
+        payloads를 동시에 전송하고, 첫 실패에서 중단하지 않고 건별 결과를 모아 반환.
+        반환: {"total", "succeeded", "failed": [{"index", "store_id", "status", "error"}, ...]}
+        """
+        batch_size = max(batch_size, 1)
+        batches = [list(range(j, min(j + batch_size, len(payloads)))) for j in range(0, len(payloads), batch_size)]
+
+        def send(indices):
+            body = payloads[indices[0]] if batch_size == 1 else [payloads[i] for i in indices]
+            try:
+                response = self.post(path, json=body, headers=headers)
+            except requests.RequestException as e:
+                return indices, None, str(e)
+            if response.status_code != expected_status:
+                return indices, response.status_code, response.text
+            return indices, response.status_code, None
+
+        failed = []
+        if batches:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(batches))) as executor:
+                for indices, status, error in executor.map(send, batches):
+                    if error is None:
+                        continue
+                    for i in indices:
+                        failed.append({
+                            "index": i,
+                            "store_id": payloads[i].get("store_id"),
+                            "status": status,
+                            "error": error,
+                        })
+
+        return {"total": len(payloads), "succeeded": len(payloads) - len(failed), "failed": failed}
+
+    def patch_many(
+        self,
+        items: list,
+        headers: dict = None,
+        retries: int = BACKEND_PATCH_RETRIES,
+        progress_callback=None,
+    ) -> dict:
+        """
+        items [(path, payload), ...]를 동시에 PATCH (2xx면 성공).
+        연결 실패 / 429 / 5xx는 backoff 후 retries번까지 다시 보내고, 그래도 실패한 건은 모아서 반환.
+        progress_callback(done, total)은 한 건이 끝날 때마다 호출된다.
+        반환: {"total", "succeeded", "failed": [{"index", "path", "status", "error"}, ...]}
+        """
+        def send(index):
+            path, body = items[index]
+            status, error = None, None
+            for attempt in range(retries + 1):
+                if attempt:
+                    time.sleep(BACKEND_RETRY_BACKOFF * 2 ** (attempt - 1))
+                try:
+                    response = self.patch(path, json=body, headers=headers)
+                except requests.RequestException as e:
+                    status, error = None, str(e)
+                    continue
+                status = response.status_code
+                if response.ok:
+                    return index, status, None
+                error = response.text
+                if status != 429 and status < 500:
+                    break
+            return index, status, error
+
+        failed = []
+        if items:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(items))) as executor:
+                for done, (index, status, error) in enumerate(executor.map(send, range(len(items))), start=1):
+                    if error is not None:
+                        failed.append({"index": index, "path": items[index][0], "status": status, "error": error})
+                    if progress_callback:
+                        progress_callback(done, len(items))
+
+        return {"total": len(items), "succeeded": len(items) - len(failed), "failed": failed}
@@ -0,0 +1,36 @@
+import os
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from train.process_pool import training_process_pool
+from settings import setting
+
+# 동시에 실행할 학습 job 수 (job 하나가 프로세스 하나, 그 안에서 다시 프로세스 풀로 매장별 병렬 처리)
+TRAIN_EXECUTOR_WORKERS = int(setting("TRAIN_EXECUTOR_WORKERS", 1))
+# 동시에 실행할 예측 작업 수
+FORECAST_EXECUTOR_WORKERS = int(setting("FORECAST_EXECUTOR_WORKERS", min(4, os.cpu_count() or 1)))
+
+# 학습 job은 별도 프로세스(forkserver, 낮은 우선순위)에서 실행되어, 업로드 가공 / XGBoost 튜닝 / KMeans 등
+# job 본문의 pandas 작업이 서버 프로세스의 GIL을 잡지 않는다. 예측은 서버 프로세스의 thread pool에서 실행
+train_executor = training_process_pool(TRAIN_EXECUTOR_WORKERS)
+forecast_executor = ThreadPoolExecutor(max_workers=FORECAST_EXECUTOR_WORKERS, thread_name_prefix="forecast")
+
+
+async def run_in_executor(executor, func, *args, **kwargs):
+    """
+    blocking 함수(func)를 executor에서 실행하고 결과를 await (event loop는 다른 요청을 계속 처리)
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+
+async def run_forecast(func, *args, **kwargs):
+    return await run_in_executor(forecast_executor, func, *args, **kwargs)
+
+
+def shutdown_executors(wait: bool = True):
+    """
+    앱 종료 시 실행 중인 작업을 마무리하고 풀 정리 (대기 중인 작업은 취소)
+    """
+    for executor in (train_executor, forecast_executor):
+        executor.shutdown(wait=wait, cancel_futures=True)
@@ -1,101 +1,90 @@
-from fastapi import APIRouter, Request
 from fastapi import APIRouter, UploadFile, File
-from fastapi.responses import JSONResponse
-from .utils import parse_forecast_request, read_csv_upload_file, get_jwt
-from forecast.predict_daily import predict_daily
-from forecast.predict_period import predict_period
-from forecast.check_if_holiday import check_if_holiday
-import requests
-from config import config
-from datetime import datetime
-import pandas as pd
+from fastapi.responses import JSONResponse, ORJSONResponse
+from .utils import read_upload_file, get_backend_client
+from .executors import run_forecast
+from .ingest import FORECAST_SCHEMA
+from .schemas import ForecastRequest, ForecastResponse, StoreForecastInput
+from fastapi.concurrency import run_in_threadpool
+from forecast.batch_forecast import forecast_batch, forecast_arrays
+from datetime import datetime, timedelta
+from typing import List
+import numpy as np
 forecast_router = APIRouter(prefix="/forecast", tags=["Forecast"])
 
-@forecast_router.post("/")
-async def forecast_daily(forecast_file: UploadFile = File(...)):
-    try:
-        df = read_csv_upload_file(forecast_file)
+# 백엔드로 보내는 / JSON으로 반환하는 XGBoost 예측값 배율
+XGB_FORECAST_SCALE = 0.1
 
-        forecast_result = [] # 세부 예측 로직 추가
+def forecast_stores(stores: List[StoreForecastInput], periods: int) -> list:
+    """
+    JSON 입력을 배열로 바꿔 바로 예측 (DataFrame / CSV 파싱 없음)
+    """
+    prophet_yhat, xgb_yhat, holiday_masks = forecast_arrays(
+        np.array([s.store_id for s in stores]),
+        np.array([s.cluster_id for s in stores]),
+        np.array([s.date for s in stores], dtype="datetime64[D]").astype("datetime64[ns]"),
+        np.array([s.temp for s in stores], dtype=float),
+        np.array([s.rain for s in stores], dtype=float),
+        [s.weather for s in stores],
+        np.array([s.lags() for s in stores], dtype=float),
+        periods,
+    )
 
-        for _, row in df.iterrows():
-            input_dict = {
-                "store_id": int(row["store_id"]),
-                "date": row["date"],
-                "temp": float(row["temp"]),
-                "rain": float(row["rain"]),
-                "weather": row["weather"],
-                "cluster_id": int(row["cluster_id"]),
-                "rev_t-1": float(row["rev_t-1"]),
-                "rev_t-2": float(row["rev_t-2"]),
-                "rev_t-3": float(row["rev_t-3"]),
-                "rev_t-4": float(row["rev_t-4"]),
-                "rev_t-5": float(row["rev_t-5"]),
-                "rev_t-6": float(row["rev_t-6"]),
-                "rev_t-7": float(row["rev_t-7"]),
-                "rev_t-8": float(row["rev_t-8"]),
-                "rev_t-9": float(row["rev_t-9"]),
-                "rev_t-10": float(row["rev_t-10"]),
-                "rev_t-11": float(row["rev_t-11"]),
-                "rev_t-12": float(row["rev_t-12"]),
-                "rev_t-13": float(row["rev_t-13"]),
-                "rev_t-14": float(row["rev_t-14"]),
-            }
-
-            # 1일차 예측 (Prophet + XGBoost)
-            result_day1 = predict_daily(input_dict)
-            y_prophet, y_xgboost, date = result_day1[input_dict["store_id"]]
-            forecast_result.append({
-                "store_id": input_dict["store_id"],
-                "date": date,
-                "prophet_forecast": float(y_prophet),
-                "xgboost_forecast": float(y_xgboost)
+    results = []
+    for i, store in enumerate(stores):
+        mask = int(holiday_masks[i])
+        yhat = prophet_yhat[i].tolist()
+        forecasts = []
+        for day in range(periods + 1):
+            target = store.date + timedelta(days=day)
+            forecasts.append({
+                "date": target,
+                "prophet_forecast": 0.0 if mask >> target.weekday() & 1 else yhat[day],
+                "xgboost_forecast": float(xgb_yhat[i]) * XGB_FORECAST_SCALE if day == 0 else None,
             })
-            """
-            # 2~62일차 예측 (Prophet only), 다음 달 예측 수행을 위한 로직
-            period_result = predict_period(input_dict, periods=62)
-            """
-            # 2~ 14일차 예측 (Prophet only)
-            period_result = predict_period(input_dict, periods=14)
-            future_start_date = pd.to_datetime(input_dict["date"]) + pd.Timedelta(days=1)
-            
-            for i, yhat in enumerate(period_result[input_dict["store_id"]]):
-                forecast_result.append({
-                    "store_id": input_dict["store_id"],
-                    "date": (future_start_date + pd.Timedelta(days=i)).strftime("%Y-%m-%d %H:%M:%S"),
-                    "prophet_forecast": float(yhat),
-                    "xgboost_forecast": None
-                })
-            # 예측 후 휴일 요일 판단
-            holiday_weekdays = check_if_holiday(input_dict)
+        results.append({"store_id": store.store_id, "forecasts": forecasts})
+    return results
+
+@forecast_router.post("/")
+async def forecast_daily(forecast_file: UploadFile = File(...)):
+    try:
+        df = await run_in_threadpool(read_upload_file, forecast_file, FORECAST_SCHEMA)
 
-            # forecast_result에서 해당 요일 prophet 예측값 0으로 수정
-            for row in forecast_result:
-                if row["store_id"] != input_dict["store_id"]:
-                    continue
-                forecast_dt = pd.to_datetime(row["date"])
-                if forecast_dt.weekday() in holiday_weekdays:
-                    row["prophet_forecast"] = 0.0
+        # 매장별 Prophet 1회 + 전체 XGBoost 1회로 일괄 예측 (1일차 Prophet + XGBoost, 2~14일차 Prophet only)
+        # 예측 전용 풀에서 실행하여 event loop와 학습 작업에 막히지 않도록 함
+        forecast_result = await run_forecast(forecast_batch, df, periods=14)
 
-        
-        # JWT 인증
-        headers = {
-            "Authorization": f"Bearer {get_jwt()}"
-        } 
-        
-        for row in forecast_result:
-            data = {
+        payloads = [
+            {
                 "store_id": row["store_id"],
                 "prophet_forecast": row["prophet_forecast"],
-                "xgboost_forecast": row["xgboost_forecast"] * 0.1 if row["xgboost_forecast"] is not None else None,
+                "xgboost_forecast": row["xgboost_forecast"] * XGB_FORECAST_SCALE if row["xgboost_forecast"] is not None else None,
                 "date_time": datetime.strptime(str(row["date"]), "%Y-%m-%d %H:%M:%S").strftime("%Y-%m-%dT%H:%M:%S")
             }
-            
-            response = requests.post(f"{config.BACKEND_URL}/forecast", json=data, headers=headers)
-            if response.status_code != 204:
-                raise ValueError(f"{row['store_id']} 저장 실패: {response.status_code} - {response.text}")
-            
-        return JSONResponse(content={"message": "예측 데이터 수신 완료"}, status_code=200)
+            for row in forecast_result
+        ]
+
+        # pool을 유지하는 client로 동시 전송 (JWT는 cache된 토큰 사용, event loop를 막지 않도록 thread에서 실행)
+        summary = await run_in_threadpool(get_backend_client().post_many, "/forecast", payloads)
+        if summary["failed"]:
+            return JSONResponse(
+                content={"error": f"{len(summary['failed'])}/{summary['total']}건 저장 실패", "failed": summary["failed"]},
+                status_code=400,
+            )
+
+        return JSONResponse(content={"message": "예측 데이터 수신 완료", "sent": summary["succeeded"]}, status_code=200)
     
     except ValueError as ve:
-        return JSONResponse(content={"error": str(ve)}, status_code=400)
\ No newline at end of file
+        return JSONResponse(content={"error": str(ve)}, status_code=400)
+
+@forecast_router.post("/json", response_model=ForecastResponse)
+async def forecast_json(request: ForecastRequest):
+    """
+    1개 ~ 소수 매장의 즉시 예측 (결과를 백엔드로 보내지 않고 바로 반환)
+    """
+    try:
+        results = await run_forecast(forecast_stores, request.stores, request.periods)
+        return ORJSONResponse(content={"results": results})
+    except FileNotFoundError as e:
+        return ORJSONResponse(content={"error": str(e)}, status_code=404)
+    except ValueError as ve:
+        return ORJSONResponse(content={"error": str(ve)}, status_code=400)
@@ -0,0 +1,180 @@
+import pandas as pd
+from pandas.api.types import union_categoricals
+from settings import setting
+
+# "c" (pandas 기본 parser, chunk 단위 읽기) | "pyarrow" (멀티스레드 parser, record batch 단위 읽기)
+CSV_ENGINE = setting("CSV_ENGINE", "c")
+# 한 번에 읽을 행 수. 최대 메모리는 파일 크기가 아니라 chunk 크기 + 압축된 결과에 비례
+CSV_CHUNK_ROWS = int(setting("CSV_CHUNK_ROWS", 200_000))
+
+DATETIME = "datetime64[ns]"
+
+# 업로드 종류별 컬럼 dtype (스키마에 없는 컬럼은 pandas 추론을 따름)
+SALES_SCHEMA = {
+    "store_id": "category",
+    "date": DATETIME,
+    "revenue": "float32",
+    "cluster_id": "int8",
+}
+WEATHER_SCHEMA = {
+    "store_id": "category",
+    "date": DATETIME,
+    "temp": "float32",
+    "rain": "float32",
+}
+FORECAST_SCHEMA = {
+    "store_id": "category",
+    "date": DATETIME,
+    "temp": "float32",
+    "rain": "float32",
+    "cluster_id": "int8",
+    **{f"rev_t-{k}": "float32" for k in range(1, 15)},
+}
+
+# 파일 형식 -> (확장자, content type)
+UPLOAD_FORMATS = {
+    "csv": ((".csv",), ("text/csv",)),
+    "csv.gz": ((".csv.gz", ".csv.gzip"), ("application/gzip", "application/x-gzip")),
+    "csv.zst": ((".csv.zst", ".csv.zstd"), ("application/zstd",)),
+    "parquet": ((".parquet", ".pq"), ("application/vnd.apache.parquet", "application/x-parquet")),
+    "arrow": ((".arrow", ".feather", ".ipc"), ("application/vnd.apache.arrow.file", "application/vnd.apache.arrow.stream")),
+}
+COMPRESSION_CODECS = {"csv.gz": "gzip", "csv.zst": "zstd"}
+
+
+def detect_format(filename: str, content_type: str) -> str:
+    """
+    확장자 우선, 없으면 content type으로 업로드 형식 판단 (지원하지 않으면 ValueError)
+    """
+    name = (filename or "").lower()
+    for fmt, (extensions, _) in UPLOAD_FORMATS.items():
+        if name.endswith(extensions):
+            return fmt
+    for fmt, (_, content_types) in UPLOAD_FORMATS.items():
+        if content_type in content_types:
+            return fmt
+    raise ValueError("CSV(gzip/zstd 압축 포함), Parquet, Arrow IPC 파일만 업로드할 수 있습니다.")
+
+
+def apply_schema(chunk: pd.DataFrame, schema: dict) -> pd.DataFrame:
+    for col, t in schema.items():
+        if col not in chunk.columns or chunk[col].dtype == t:
+            continue
+        if t == DATETIME:
+            if pd.api.types.is_datetime64_any_dtype(chunk[col]):
+                chunk[col] = chunk[col].astype(DATETIME)
+            else:
+                chunk[col] = pd.to_datetime(chunk[col])
+        else:
+            # category는 파싱된 값(int 등)으로 만듦 (read_csv의 dtype="category"는 category가 문자열이 됨)
+            chunk[col] = chunk[col].astype(t)
+    return chunk
+
+
+def _c_chunks(file, schema: dict, chunk_rows: int):
+    # 스키마에 있지만 파일에 없는 컬럼은 read_csv가 무시
+    dtype = {col: t for col, t in schema.items() if t not in (DATETIME, "category")}
+    for chunk in pd.read_csv(file, dtype=dtype, chunksize=chunk_rows):
+        yield apply_schema(chunk, schema)
+
+
+def _arrow_csv_chunks(file, schema: dict, chunk_rows: int):
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    column_types = {}
+    for col, t in schema.items():
+        if t == DATETIME:
+            column_types[col] = pa.timestamp("ns")
+        elif t != "category":
+            column_types[col] = pa.from_numpy_dtype(t)
+
+    # block_size는 byte 단위이므로 행당 대략 64 byte로 환산
+    reader = pacsv.open_csv(
+        file,
+        read_options=pacsv.ReadOptions(block_size=max(chunk_rows * 64, 1 << 20)),
+        convert_options=pacsv.ConvertOptions(column_types=column_types),
+    )
+    for batch in reader:
+        yield apply_schema(batch.to_pandas(), schema)
+
+
+def _parquet_chunks(file, schema: dict, chunk_rows: int):
+    import pyarrow.parquet as pq
+
+    for batch in pq.ParquetFile(file).iter_batches(batch_size=chunk_rows):
+        yield apply_schema(batch.to_pandas(), schema)
+
+
+def _arrow_ipc_chunks(file, schema: dict, chunk_rows: int):
+    import pyarrow as pa
+
+    # random access(file) 형식이 아니면 stream 형식으로 읽음
+    try:
+        reader = pa.ipc.open_file(file)
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    except pa.ArrowInvalid:
+        file.seek(0)
+        batches = pa.ipc.open_stream(file)
+    for batch in batches:
+        for offset in range(0, batch.num_rows, chunk_rows):
+            yield apply_schema(batch.slice(offset, chunk_rows).to_pandas(), schema)
+
+
+def concat_chunks(chunks: list) -> pd.DataFrame:
+    """
+    chunk들을 이어 붙이되, categorical 컬럼은 전체 category를 합쳐 categorical로 유지
+    (그냥 concat하면 chunk마다 category가 달라 object로 바뀜)
+    """
+    if not chunks:
+        return pd.DataFrame()
+    if len(chunks) == 1:
+        return chunks[0]
+    columns = chunks[0].columns
+    categorical = [col for col in columns if isinstance(chunks[0][col].dtype, pd.CategoricalDtype)]
+    df = pd.concat([chunk.drop(columns=categorical) for chunk in chunks], ignore_index=True)
+    for col in categorical:
+        df[col] = pd.Categorical(union_categoricals([chunk[col] for chunk in chunks], sort_categories=True))
+    return df[columns]
+
+
+def read_csv_with_schema(file, schema: dict, engine: str = CSV_ENGINE, chunk_rows: int = CSV_CHUNK_ROWS) -> pd.DataFrame:
+    """
+    스키마의 dtype으로 CSV를 chunk 단위로 읽음 (date는 이 단계에서 한 번만 datetime으로 변환)
+    """
+    reader = _arrow_csv_chunks if engine == "pyarrow" else _c_chunks
+    return concat_chunks(list(reader(file, schema, chunk_rows)))
+
+
+def read_table(
+    file,
+    fmt: str,
+    schema: dict,
+    engine: str = CSV_ENGINE,
+    chunk_rows: int = CSV_CHUNK_ROWS,
+) -> pd.DataFrame:
+    """
+    업로드 형식(fmt)에 맞게 chunk 단위로 읽어 스키마 dtype의 DataFrame으로 반환.
+    압축 CSV는 압축을 풀면서 바로 파싱한다 (압축 해제된 전체 파일을 메모리에 두지 않음).
+    """
+    if fmt == "parquet":
+        return concat_chunks(list(_parquet_chunks(file, schema, chunk_rows)))
+    if fmt == "arrow":
+        return concat_chunks(list(_arrow_ipc_chunks(file, schema, chunk_rows)))
+    if fmt in COMPRESSION_CODECS:
+        import pyarrow as pa
+
+        file = pa.CompressedInputStream(pa.PythonFile(file, mode="r"), COMPRESSION_CODECS[fmt])
+    return read_csv_with_schema(file, schema, engine, chunk_rows)
+
+
+def align_categories(left: pd.DataFrame, right: pd.DataFrame, column: str = "store_id"):
+    """
+    merge 전에 두 DataFrame의 column을 같은 category 집합으로 맞춤
+    (category가 다르거나 한쪽만 categorical이면 merge key가 object로 바뀜)
+    """
+    categories = set(left[column].dropna().unique().tolist()) | set(right[column].dropna().unique().tolist())
+    dtype = pd.CategoricalDtype(sorted(categories))
+    left[column] = left[column].astype(dtype)
+    right[column] = right[column].astype(dtype)
+    return left, right
@@ -0,0 +1,230 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from .executors import train_executor
+from settings import setting
+
+# 학습 job 상태 저장 위치
+JOB_DB_PATH = setting("JOB_DB_PATH", "./models/jobs.sqlite3")
+# 대기 + 실행 중인 job 최대 수 (초과하면 접수 거절). 동시 실행 수는 TRAIN_EXECUTOR_WORKERS
+JOB_QUEUE_LIMIT = int(setting("JOB_QUEUE_LIMIT", 4))
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+class JobStore:
+    """
+    SQLite에 저장되는 학습 job 상태 (서버 재시작 후에도 결과 조회 가능)
+    """
+
+    def __init__(self, path: str = JOB_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    stage TEXT,
+                    done INTEGER DEFAULT 0,
+                    total INTEGER DEFAULT 0,
+                    stage_started_at REAL,
+                    progress TEXT DEFAULT '{}',
+                    result TEXT,
+                    error TEXT,
+                    cancel_requested INTEGER DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL
+                )
+            """)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _update(self, job_id: str, **fields):
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+
+    def create(self, kind: str, limit: int = JOB_QUEUE_LIMIT) -> str:
+        job_id = uuid.uuid4().hex
+        with self._lock, self._connect() as conn:
+            active = conn.execute(
+                f"SELECT COUNT(*) FROM jobs WHERE status IN ({','.join('?' * len(ACTIVE_STATUSES))})", ACTIVE_STATUSES,
+            ).fetchone()[0]
+            if active >= limit:
+                raise JobQueueFull(f"대기 중인 학습 작업이 너무 많습니다 ({active}/{limit})")
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, created_at) VALUES (?, ?, 'queued', ?)", (job_id, kind, time.time()),
+            )
+        return job_id
+
+    def get(self, job_id: str):
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return job_view(row) if row else None
+
+    def list(self, limit: int = 20) -> list:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+        return [job_view(row) for row in rows]
+
+    def start(self, job_id: str):
+        self._update(job_id, status="running", started_at=time.time())
+
+    def set_stage(self, job_id: str, stage: str, total: int = 0):
+        self._update(job_id, stage=stage, done=0, total=total, stage_started_at=time.time())
+
+    def set_progress(self, job_id: str, done: int, total: int, progress: dict = None):
+        fields = {"done": done, "total": total}
+        if progress is not None:
+            fields["progress"] = json.dumps(progress)
+        self._update(job_id, **fields)
+
+    def finish(self, job_id: str, status: str, result=None, error: str = None):
+        self._update(
+            job_id, status=status, finished_at=time.time(),
+            result=json.dumps(result, default=str) if result is not None else None, error=error,
+        )
+
+    def request_cancel(self, job_id: str) -> bool:
+        """
+        대기 중인 job은 바로 취소, 실행 중인 job은 다음 확인 시점에 중단 (이미 끝난 job이면 False)
+        """
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None or row["status"] not in ACTIVE_STATUSES:
+                return False
+            if row["status"] == "queued":
+                conn.execute(
+                    "UPDATE jobs SET status = 'cancelled', cancel_requested = 1, finished_at = ? WHERE id = ?",
+                    (time.time(), job_id),
+                )
+            else:
+                conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ?", (job_id,))
+        return True
+
+    def cancel_requested(self, job_id: str) -> bool:
+        with self._connect() as conn:
+            row = conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row["cancel_requested"])
+
+    def fail_interrupted(self):
+        """
+        서버 재시작 전에 끝나지 못한 job은 실패로 기록
+        """
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                f"UPDATE jobs SET status = 'failed', error = '서버 재시작으로 중단됨', finished_at = ? "
+                f"WHERE status IN ({','.join('?' * len(ACTIVE_STATUSES))})",
+                (time.time(), *ACTIVE_STATUSES),
+            )
+
+
+def job_view(row) -> dict:
+    """
+    상태 조회 응답 (현재 단계의 진행률로 남은 시간 추정)
+    """
+    job = {
+        "job_id": row["id"],
+        "kind": row["kind"],
+        "status": row["status"],
+        "stage": row["stage"],
+        "done": row["done"],
+        "total": row["total"],
+        "progress": json.loads(row["progress"] or "{}"),
+        "cancel_requested": bool(row["cancel_requested"]),
+        "created_at": row["created_at"],
+        "started_at": row["started_at"],
+        "finished_at": row["finished_at"],
+        "eta_seconds": None,
+        "result": json.loads(row["result"]) if row["result"] else None,
+        "error": row["error"],
+    }
+    if row["status"] == "running" and row["stage_started_at"] and 0 < row["done"] < row["total"]:
+        elapsed = time.time() - row["stage_started_at"]
+        job["eta_seconds"] = round(elapsed / row["done"] * (row["total"] - row["done"]), 1)
+    return job
+
+
+class JobContext:
+    """
+    job 함수에 전달되는 진행 상황 기록 / 취소 확인 handle
+    """
+
+    def __init__(self, store: JobStore, job_id: str):
+        self.store = store
+        self.job_id = job_id
+        self.progress = {}
+
+    def stage(self, name: str, total: int = 0):
+        self.check_cancelled()
+        self.store.set_stage(self.job_id, name, total)
+
+    def update(self, done: int, total: int, **progress):
+        self.progress.update(progress)
+        self.store.set_progress(self.job_id, done, total, self.progress if progress else None)
+
+    def should_stop(self) -> bool:
+        return self.store.cancel_requested(self.job_id)
+
+    def check_cancelled(self):
+        if self.should_stop():
+            raise JobCancelled()
+
+
+_job_store = None
+_job_store_lock = threading.Lock()
+
+
+def get_job_store() -> JobStore:
+    global _job_store
+    with _job_store_lock:
+        if _job_store is None:
+            _job_store = JobStore()
+    return _job_store
+
+
+def _run_job(job_id: str, func, args, kwargs):
+    """
+    학습 executor의 worker 프로세스에서 실행 (job 상태는 SQLite로 서버 프로세스와 공유)
+    """
+    store = get_job_store()
+    ctx = JobContext(store, job_id)
+    if store.get(job_id)["status"] != "queued":  # 대기 중 취소됨
+        return
+    store.start(job_id)
+    try:
+        result = func(ctx, *args, **kwargs)
+        ctx.check_cancelled()
+        store.finish(job_id, "succeeded", result=result)
+    except JobCancelled:
+        store.finish(job_id, "cancelled")
+    except Exception as e:
+        store.finish(job_id, "failed", error=f"{type(e).__name__}: {e}")
+
+
+def submit_job(kind: str, func, *args, **kwargs) -> str:
+    """
+    func(ctx, *args, **kwargs)를 학습 executor에 등록하고 job_id를 바로 반환.
+    worker 프로세스로 전달되므로 func는 module 수준 함수, 인자는 pickle 가능해야 한다.
+    """
+    job_id = get_job_store().create(kind)
+    train_executor.submit(_run_job, job_id, func, args, kwargs)
+    return job_id
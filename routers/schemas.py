@@ -0,0 +1,57 @@
+from datetime import date
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class StoreForecastInput(BaseModel):
+    """
+    매장 하나의 예측 입력 (CSV 업로드 한 행과 같은 컬럼)
+    """
+    model_config = ConfigDict(populate_by_name=True)
+
+    store_id: int
+    date: date
+    cluster_id: int = Field(ge=0, le=4)
+    temp: float
+    rain: float
+    weather: Optional[str] = None  # 결측이면 학습 때의 결측 코드로 인코딩
+    rev_t_1: float = Field(alias="rev_t-1")
+    rev_t_2: float = Field(alias="rev_t-2")
+    rev_t_3: float = Field(alias="rev_t-3")
+    rev_t_4: float = Field(alias="rev_t-4")
+    rev_t_5: float = Field(alias="rev_t-5")
+    rev_t_6: float = Field(alias="rev_t-6")
+    rev_t_7: float = Field(alias="rev_t-7")
+    rev_t_8: float = Field(alias="rev_t-8")
+    rev_t_9: float = Field(alias="rev_t-9")
+    rev_t_10: float = Field(alias="rev_t-10")
+    rev_t_11: float = Field(alias="rev_t-11")
+    rev_t_12: float = Field(alias="rev_t-12")
+    rev_t_13: float = Field(alias="rev_t-13")
+    rev_t_14: float = Field(alias="rev_t-14")
+
+    def lags(self) -> list:
+        return [
+            self.rev_t_1, self.rev_t_2, self.rev_t_3, self.rev_t_4, self.rev_t_5, self.rev_t_6, self.rev_t_7,
+            self.rev_t_8, self.rev_t_9, self.rev_t_10, self.rev_t_11, self.rev_t_12, self.rev_t_13, self.rev_t_14,
+        ]
+
+
+class ForecastRequest(BaseModel):
+    stores: List[StoreForecastInput] = Field(min_length=1, max_length=1000)
+    periods: int = Field(default=14, ge=0, le=60)
+
+
+class ForecastPoint(BaseModel):
+    date: date
+    prophet_forecast: float
+    xgboost_forecast: Optional[float] = None
+
+
+class StoreForecast(BaseModel):
+    store_id: int
+    forecasts: List[ForecastPoint]
+
+
+class ForecastResponse(BaseModel):
+    results: List[StoreForecast]
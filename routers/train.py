@@ -1,45 +1,160 @@
 from fastapi import APIRouter, UploadFile, File
 from fastapi.responses import JSONResponse
 import pandas as pd
-from .utils import read_csv_upload_file, get_prophet_function
+from .utils import read_upload_file, get_backend_client
+from .ingest import SALES_SCHEMA, WEATHER_SCHEMA, align_categories
+from .jobs import JobContext, JobQueueFull, submit_job, get_job_store
+from fastapi.concurrency import run_in_threadpool
+from train.prophet_utils.train_executor import train_prophet_stores
 from train.xgb_utils.compute_yhat_and_target import compute_yhat_and_target
-from train.xgb_utils.generate_features import generate_features
+from forecast.features import generate_features
 from train.xgb_utils.train_xgboost import train_xgboost
-from train.run_kmeans_clustering import run_kmeans_clustering
-import requests
-from config import config
+from train.run_kmeans_clustering import run_kmeans_clustering, assign_clusters
+from train.cluster_model import CLUSTER_MODEL_PATH, CLUSTER_ASSIGNMENTS_PATH, load_cluster_assignments, save_cluster_assignments
+import os
 from typing import List
 from datetime import timedelta
 
 train_router = APIRouter(prefix="/train", tags=["Training"])
 
+def update_store_clusters(cluster_result, ctx: JobContext = None, full_sync: bool = False, backend=None,
+                          assignments_path: str = CLUSTER_ASSIGNMENTS_PATH) -> dict:
+    """
+    마지막으로 반영된 배정표(cluster_assignments.json)와 비교해 cluster가 바뀐 매장만 백엔드에 PATCH.
+    성공한 매장만 배정표에 기록하므로 실패한 매장은 다음 동기화에서 다시 전송된다.
+    full_sync면 변경 여부와 관계없이 모든 매장을 전송.
+    """
+    previous = load_cluster_assignments(assignments_path)
+    current = {str(store_id): int(cluster_id) for store_id, cluster_id in cluster_result.items()}
+    changed = [store_id for store_id, cluster_id in current.items() if full_sync or previous.get(store_id) != cluster_id]
+
+    if ctx:
+        ctx.stage("store_sync", total=len(changed))
+    backend = backend or get_backend_client()
+    response = backend.patch_many(
+        [(f"/store/{store_id}", {"cluster": current[store_id]}) for store_id in changed],
+        progress_callback=ctx.update if ctx else None,
+    )
+
+    failed = {changed[item["index"]]: item for item in response["failed"]}
+    synced = {store_id: current[store_id] for store_id in changed if store_id not in failed}
+    save_cluster_assignments({**previous, **synced}, assignments_path)
+
+    return {
+        "stores": len(current),
+        "changed": len(changed),
+        "unchanged": len(current) - len(changed),
+        "synced": len(synced),
+        "failed": [
+            {"store_id": store_id, "status": item["status"], "error": item["error"]} for store_id, item in failed.items()
+        ],
+    }
+
+CLUSTER_MODES = ("refit", "assign", "drift")
+
+def run_cluster_training(ctx: JobContext, df: pd.DataFrame, mode: str = "refit", full_sync: bool = False) -> dict:
+    """
+    refit: 전체 매장 재학습 (scaler / centroid 저장, 백그라운드 job)
+    assign: 저장된 centroid로 업로드된 매장(신규 매장)만 배정, 기존 매장 cluster는 유지
+    drift: 배정 / 동기화 없이 업로드된 매장으로 drift 통계와 재학습 권장 여부만 계산
+    assign / drift는 요청 안에서 바로 실행되므로 ctx 없이(None) 호출된다.
+    """
+    if ctx:
+        ctx.stage("clustering")
+    if mode == "refit":
+        cluster_result, drift = run_kmeans_clustering(df), None
+    else:
+        cluster_result, drift = assign_clusters(df)
+    print(f"[cluster] {mode}: 매장 {len(cluster_result)}개")
+    if drift is not None:
+        print(f"[cluster] drift: {drift}")
+    assignments = {str(store_id): int(cluster_id) for store_id, cluster_id in cluster_result.items()}
+    if mode == "drift":
+        return {"stores": len(cluster_result), "assignments": assignments, "drift": drift}
+
+    summary = update_store_clusters(cluster_result, ctx, full_sync=full_sync)
+    print(f"[cluster] 동기화: 변경 {summary['changed']}, 유지 {summary['unchanged']}, 실패 {len(summary['failed'])}")
+    if drift is not None:
+        summary["assignments"] = assignments
+        summary["drift"] = drift
+    return summary
+
+def run_prophet_training(ctx: JobContext, df: pd.DataFrame) -> dict:
+    tuning = {"trials": 0, "pruned": 0, "failed_stores": 0}
+
+    def on_store_done(result, done, total):
+        tuning["trials"] += result.get("tuning", {}).get("trials", 0)
+        tuning["pruned"] += result.get("tuning", {}).get("pruned", 0)
+        tuning["failed_stores"] += result["status"] == "failed"
+        ctx.update(done, total, **tuning)
+
+    ctx.stage("prophet", total=df["store_id"].nunique())
+    # 매장별 학습을 프로세스 풀로 병렬 실행 (실패한 매장은 summary에 기록)
+    return train_prophet_stores(df, progress_callback=on_store_done, should_stop=ctx.should_stop)
+
+def run_xgboost_training(ctx: JobContext, sales_df: pd.DataFrame, weather_df: pd.DataFrame) -> dict:
+    """
+    sales_df: 2년 치 판매 데이터, weather_df: 1년 치 날씨 데이터 (date는 업로드 시 datetime으로 읽음)
+    """
+    # 매출 데이터가 적은 Store drop
+    store_lengths = sales_df.groupby("store_id", observed=True)["date"].agg(["min", "max"])
+    store_lengths["delta"] = store_lengths["max"] - store_lengths["min"]
+    store_lengths["delta_days"] = store_lengths["delta"].dt.days
+    insufficient_ids = store_lengths[store_lengths["delta_days"] < 700].index.tolist()
+    sales_df = sales_df[~sales_df["store_id"].isin(insufficient_ids)]
+    weather_df = weather_df[~weather_df["store_id"].isin(insufficient_ids)]
+
+    # yhat, y, 신뢰구간 생성 
+    ctx.stage("backtest")
+    df_yhat = compute_yhat_and_target(sales_df, progress_callback=ctx.update, should_stop=ctx.should_stop)
+    ctx.check_cancelled()
+
+    # 이를 날씨 정보와 병합 (store_id category를 맞춰 merge key가 object로 바뀌지 않도록)
+    df_yhat, weather_df = align_categories(df_yhat, weather_df.copy())
+    df_merged = pd.merge(df_yhat, weather_df, on=["store_id", "date"], how="left")
+    # 최종 xgboost Input 생성
+    ctx.stage("features")
+    df_xgboost = generate_features(df_merged)
+
+    # XGBoost 학습
+    ctx.stage("xgboost")
+    train_xgboost(df_xgboost)
+    return {"rows": len(df_xgboost)}
+
+def job_accepted(job_id: str, message: str):
+    return JSONResponse(
+        content={"message": message, "job_id": job_id, "status_url": f"/train/jobs/{job_id}"},
+        status_code=202,
+    )
+
 @train_router.post("/cluster")
-async def train_clustering(train_file: List[UploadFile] = File(...)):
+async def train_clustering(train_file: List[UploadFile] = File(...), mode: str = "refit", full_sync: bool = False):
     try:
-        df = read_csv_upload_file(train_file[0])
-        cluster_result = run_kmeans_clustering(df)
-        print(cluster_result)
-        for store_id in cluster_result:
-            url = f"{config.BACKEND_URL}/store/{store_id}"
-            data = {
-                "cluster": int(cluster_result[store_id])  # 예시 클러스터 값
-            }
-            response = requests.patch(url, json=data)
-
-        return JSONResponse(content={"message": "학습 데이터 수신 완료"}, status_code=200)
+        if mode not in CLUSTER_MODES:
+            return JSONResponse(content={"error": f"mode는 {', '.join(CLUSTER_MODES)} 중 하나여야 합니다: {mode}"}, status_code=400)
+        if mode != "refit" and not os.path.exists(CLUSTER_MODEL_PATH):
+            return JSONResponse(content={"error": "저장된 클러스터링 모델이 없습니다. mode=refit으로 먼저 학습하세요"}, status_code=409)
+        # 업로드 파일은 요청이 끝나면 닫히므로 접수 전에 읽어 둠
+        df = await run_in_threadpool(read_upload_file, train_file[0], SALES_SCHEMA)
+        if mode != "refit":
+            # 배정 / drift는 매장 수에 비례하는 짧은 작업이라 학습 job 대기열을 거치지 않고 바로 응답
+            result = await run_in_threadpool(run_cluster_training, None, df, mode, full_sync)
+            return JSONResponse(content=result, status_code=200)
+        job_id = submit_job("cluster", run_cluster_training, df, mode, full_sync)
+        return job_accepted(job_id, "클러스터링 작업 접수")
+    except JobQueueFull as e:
+        return JSONResponse(content={"error": str(e)}, status_code=429)
     except ValueError as ve:
         return JSONResponse(content={"error": str(ve)}, status_code=400)
 
 @train_router.post("/prophet")
 async def train_prophet(train_file: List[UploadFile] = File(...)):
     try:
-        df = read_csv_upload_file(train_file[0])
-        for store_id, store_df in df.groupby("store_id"):
-            cluster_id = store_df["cluster_id"].iloc[0]
-            prophet_func = get_prophet_function(cluster_id)
-            if prophet_func:
-                prophet_func(store_df[["date", "revenue"]], store_id)
-        return JSONResponse(content={"message": "Prophet 학습 완료"}, status_code=200)
+        df = await run_in_threadpool(read_upload_file, train_file[0], SALES_SCHEMA)
+        job_id = submit_job("prophet", run_prophet_training, df)
+        return job_accepted(job_id, "Prophet 학습 작업 접수")
+    except JobQueueFull as e:
+        return JSONResponse(content={"error": str(e)}, status_code=429)
     except Exception as e:
         return JSONResponse(content={"error": str(e)}, status_code=500)
 
@@ -49,33 +164,29 @@ async def train_xgboost_endpoint(train_file: List[UploadFile] = File(...)):
         if len(train_file) != 2:
             return JSONResponse(content={"error": f"2개의 파일이 필요합니다. 현재 {len(train_file)}개 수신됨"}, status_code=400)
         
-        # 2년 치 판매 데이터
-        sales_df = read_csv_upload_file(train_file[0])
-        sales_df["date"] = pd.to_datetime(sales_df["date"])
-
-        # 1년 치 날씨 데이터
-        weather_df = read_csv_upload_file(train_file[1])
-        weather_df["date"] = pd.to_datetime(weather_df["date"])
-
-        # 매출 데이터가 적은 Store drop
-        sales_df["date"] = pd.to_datetime(sales_df["date"])
-        store_lengths = sales_df.groupby("store_id")["date"].agg(["min", "max"])
-        store_lengths["delta"] = store_lengths["max"] - store_lengths["min"]
-        store_lengths["delta_days"] = store_lengths["delta"].dt.days
-        insufficient_ids = store_lengths[store_lengths["delta_days"] < 700].index.tolist()
-        sales_df = sales_df[~sales_df["store_id"].isin(insufficient_ids)]
-        weather_df = weather_df[~weather_df["store_id"].isin(insufficient_ids)]
-
-        # yhat, y, 신뢰구간 생성 
-        df_yhat = compute_yhat_and_target(sales_df)
-
-        # 이를 날씨 정보와 병합 
-        df_merged = pd.merge(df_yhat, weather_df, on=["store_id", "date"], how="left")
-        # 최종 xgboost Input 생성
-        df_xgboost = generate_features(df_merged)
-
-        # XGBoost 학습
-        train_xgboost(df_xgboost)  
-        return JSONResponse(content={"message": "XGBoost 학습 및 저장 완료"}, status_code=200)
+        sales_df = await run_in_threadpool(read_upload_file, train_file[0], SALES_SCHEMA)
+        weather_df = await run_in_threadpool(read_upload_file, train_file[1], WEATHER_SCHEMA)
+        job_id = submit_job("xgboost", run_xgboost_training, sales_df, weather_df)
+        return job_accepted(job_id, "XGBoost 학습 작업 접수")
+    except JobQueueFull as e:
+        return JSONResponse(content={"error": str(e)}, status_code=429)
     except Exception as e:
-        return JSONResponse(content={"error": str(e)}, status_code=500)
\ No newline at end of file
+        return JSONResponse(content={"error": str(e)}, status_code=500)
+
+@train_router.get("/jobs")
+async def list_jobs(limit: int = 20):
+    jobs = await run_in_threadpool(get_job_store().list, limit)
+    return JSONResponse(content={"jobs": jobs}, status_code=200)
+
+@train_router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = await run_in_threadpool(get_job_store().get, job_id)
+    if job is None:
+        return JSONResponse(content={"error": f"job을 찾을 수 없음: {job_id}"}, status_code=404)
+    return JSONResponse(content=job, status_code=200)
+
+@train_router.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    if not await run_in_threadpool(get_job_store().request_cancel, job_id):
+        return JSONResponse(content={"error": f"취소할 수 없는 job: {job_id}"}, status_code=409)
+    return JSONResponse(content={"message": "취소 요청 완료", "job_id": job_id}, status_code=202)
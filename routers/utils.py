@@ -1,46 +1,108 @@
-import pandas as pd
-from fastapi import UploadFile, Request
+import time
+import json
+import base64
+import threading
+from fastapi import UploadFile
 import requests
 from config import config
+from train.prophet_utils.train_executor import get_prophet_function
+from .backend_client import BACKEND_TIMEOUT, BackendClient
+from .ingest import detect_format, read_table
+from settings import setting
 
-def read_csv_upload_file(upload_file: UploadFile):
-    if upload_file.content_type != "text/csv":
-        raise ValueError("Only CSV files are allowed")
-    return pd.read_csv(upload_file.file)
-
-def get_prophet_function(cluster_id: int):
-    from train.prophet_utils.run_prophet_downtown import run_prophet_downtown
-    from train.prophet_utils.run_prophet_house import run_prophet_house
-    from train.prophet_utils.run_prophet_office import run_prophet_office
-    from train.prophet_utils.run_prophet_station import run_prophet_station
-    from train.prophet_utils.run_prophet_univ import run_prophet_univ
-
-    return {
-        0: run_prophet_office,
-        1: run_prophet_house,
-        2: run_prophet_univ,
-        3: run_prophet_downtown,
-        4: run_prophet_station
-    }.get(cluster_id)
-
-async def parse_forecast_request(request: Request):
-    data = await request.json()
-    return {
-        "store_id": data.get("store_id"),
-        "date": data.get("date"),
-        "weather": data.get("weather", {})
-    }
+# 토큰에 exp가 없을 때 사용할 유효 시간 (초)
+JWT_TTL_SECONDS = float(setting("JWT_TTL_SECONDS", 1800))
+# 만료 이 시간(초) 전부터는 새로 로그인
+JWT_REFRESH_MARGIN = float(setting("JWT_REFRESH_MARGIN", 60))
+
+def read_upload_file(upload_file: UploadFile, schema: dict = None):
+    """
+    CSV(gzip/zstd 압축 포함), Parquet, Arrow IPC 업로드를 스키마 dtype으로 chunk 단위 읽기 (routers/ingest.py)
+    """
+    fmt = detect_format(upload_file.filename, upload_file.content_type)
+    return read_table(upload_file.file, fmt, schema or {})
+
+def jwt_expiry(token: str):
+    """
+    JWT payload의 exp (epoch 초). 서명 검증 없이 읽기만 하며, 없으면 None
+    """
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except Exception:
+        return None
+
+class TokenManager:
+    """
+    관리자 JWT cache.
+    만료(exp 또는 JWT_TTL_SECONDS) 직전까지 같은 토큰을 재사용하고,
+    동시에 들어온 요청들은 lock으로 한 번의 로그인 결과를 공유한다.
+    로그인은 lock을 잡은 채로 하므로 timeout을 두어, 응답이 없으면 예외로 끝내고 lock을 놓는다.
+    """
+
+    def __init__(self, ttl: float = JWT_TTL_SECONDS, margin: float = JWT_REFRESH_MARGIN, timeout: float = BACKEND_TIMEOUT):
+        self.ttl = ttl
+        self.margin = margin
+        self.timeout = timeout
+        self._token = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def _valid(self) -> bool:
+        return self._token is not None and time.time() < self._expires_at - self.margin
+
+    def _login(self) -> str:
+        login_url = f"{config.BACKEND_URL}/admin/login"
+        login_data = {
+            "mb_id": config.ADMIN_ID,
+            "password": config.ADMIN_PASSWORD
+        }
+
+        login_response = requests.post(login_url, json=login_data, timeout=self.timeout)
+
+        if login_response.status_code == 200:
+            return login_response.json()["token"] # jwt 반환
+        else:
+            raise Exception("로그인 실패: 관리자 인증 실패")
+
+    def get_token(self) -> str:
+        if self._valid():
+            return self._token
+        with self._lock:
+            if not self._valid():
+                self._store(self._login())
+            return self._token
+
+    def refresh(self, stale_token: str = None) -> str:
+        """
+        401을 받은 토큰(stale_token)을 새 토큰으로 교체.
+        다른 요청이 이미 교체했다면 다시 로그인하지 않고 그 토큰을 반환한다.
+        """
+        with self._lock:
+            if self._token is None or self._token == stale_token or not self._valid():
+                self._store(self._login())
+            return self._token
+
+    def _store(self, token: str):
+        expiry = jwt_expiry(token)
+        self._token = token
+        self._expires_at = expiry if expiry is not None else time.time() + self.ttl
+
+token_manager = TokenManager()
 
 def get_jwt():
-    login_url = f"{config.BACKEND_URL}/admin/login"
-    login_data = {
-        "mb_id": config.ADMIN_ID,
-        "password": config.ADMIN_PASSWORD
-    }
-
-    login_response = requests.post(login_url, json=login_data)
-
-    if login_response.status_code == 200:
-        return login_response.json()["token"] # jwt 반환
-    else:
-        raise Exception("로그인 실패: 관리자 인증 실패")
\ No newline at end of file
+    return token_manager.get_token()
+
+_backend_client = None
+_backend_client_lock = threading.Lock()
+
+def get_backend_client() -> BackendClient:
+    """
+    프로세스 전체에서 공유하는 BackendClient (token_manager로 인증, 401이면 토큰 갱신 후 1회 재시도)
+    """
+    global _backend_client
+    with _backend_client_lock:
+        if _backend_client is None:
+            _backend_client = BackendClient(token_manager=token_manager)
+    return _backend_client
@@ -0,0 +1,32 @@
+import os
+
+
+def _load_config():
+    try:
+        from config import config
+    except ImportError:
+        return None
+    return config
+
+
+_config = _load_config()
+
+
+def setting(name: str, default=None):
+    """
+    튜닝 값 조회: config.{name}이 있으면 그 값, 없으면 환경 변수 {name} (문자열), 둘 다 없으면 default.
+    (config.SEMESTER_RANGES / BACKEND_URL과 같이 config 모듈에서 관리하고, 배포 환경에서는 환경 변수로 덮어쓸 수 있음)
+    """
+    if _config is not None and hasattr(_config, name):
+        return getattr(_config, name)
+    return os.environ.get(name, default)
+
+
+def flag(name: str, default: bool = False) -> bool:
+    """
+    on/off 설정 (config의 bool, 또는 환경 변수 "1" / "true")
+    """
+    value = setting(name, default)
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return bool(value)
@@ -0,0 +1,146 @@
+import os
+import json
+import time
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+from forecast.atomic_write import atomic_open
+from settings import setting
+
+CLUSTER_MODEL_PATH = "./models/cluster/cluster_model.json"
+# 백엔드에 마지막으로 반영된 store_id -> cluster_id (delta 동기화 기준)
+CLUSTER_ASSIGNMENTS_PATH = "./models/cluster/cluster_assignments.json"
+
+# drift 판정 기준 (하나라도 넘으면 전체 재학습 권장)
+# - 중심까지 평균 제곱 거리가 학습 시점의 몇 배 이상인지
+CLUSTER_DRIFT_INERTIA_RATIO = float(setting("CLUSTER_DRIFT_INERTIA_RATIO", 1.5))
+# - yearly_seasonality_strength 평균이 학습 시점 표준편차 기준으로 얼마나 이동했는지
+CLUSTER_DRIFT_FEATURE_SHIFT = float(setting("CLUSTER_DRIFT_FEATURE_SHIFT", 0.5))
+# - 클러스터별 매장 비율의 total variation distance
+CLUSTER_DRIFT_SHARE_SHIFT = float(setting("CLUSTER_DRIFT_SHARE_SHIFT", 0.2))
+# 매장 수가 이보다 적으면 (신규 매장 몇 개만 배정할 때) 통계만 보고하고 재학습 권장 판정은 하지 않음
+CLUSTER_DRIFT_MIN_STORES = int(setting("CLUSTER_DRIFT_MIN_STORES", 100))
+
+
+class ClusterModel:
+    """
+    학습된 클러스터링 모델 (yearly_seasonality_strength scaler + centroid + 학습 시점 통계).
+    pickle 없이 JSON 하나로 저장하며, 새 매장은 centroid와의 거리만 계산해 배정한다.
+    """
+
+    def __init__(self, centroids, scaler_mean: float, scaler_scale: float, mean_sq_distance: float,
+                 cluster_shares, n_stores: int, algorithm: str, trained_at: float = None):
+        self.centroids = np.asarray(centroids, dtype=np.float64)
+        self.scaler_mean = float(scaler_mean)
+        self.scaler_scale = float(scaler_scale)
+        self.mean_sq_distance = float(mean_sq_distance)
+        self.cluster_shares = np.asarray(cluster_shares, dtype=np.float64)
+        self.n_stores = int(n_stores)
+        self.algorithm = algorithm
+        self.trained_at = trained_at if trained_at is not None else time.time()
+
+    @classmethod
+    def from_fit(cls, model, scaler: StandardScaler, scaled_df: pd.DataFrame, labels: np.ndarray, algorithm: str):
+        labels = np.asarray(labels)
+        centroids = model.cluster_centers_
+        sq_distance = ((scaled_df.to_numpy() - centroids[labels]) ** 2).sum(axis=1)
+        return cls(
+            centroids=centroids,
+            scaler_mean=scaler.mean_[0],
+            scaler_scale=scaler.scale_[0],
+            mean_sq_distance=sq_distance.mean(),
+            cluster_shares=np.bincount(labels, minlength=len(centroids)) / len(labels),
+            n_stores=len(labels),
+            algorithm=algorithm,
+        )
+
+    @property
+    def scaler(self) -> StandardScaler:
+        """
+        scale_features(scaler=)에 넘길 수 있는 fit된 StandardScaler
+        """
+        scaler = StandardScaler()
+        scaler.mean_ = np.array([self.scaler_mean])
+        scaler.scale_ = np.array([self.scaler_scale])
+        scaler.var_ = scaler.scale_ ** 2
+        scaler.n_features_in_ = 1
+        scaler.feature_names_in_ = np.array(["yearly_seasonality_strength"], dtype=object)
+        scaler.n_samples_seen_ = self.n_stores
+        return scaler
+
+    def nearest(self, scaled_df: pd.DataFrame) -> tuple:
+        """
+        scale된 지표의 가장 가까운 centroid. 반환: (cluster label 배열, 제곱 거리 배열)
+        """
+        diff = scaled_df.to_numpy()[:, None, :] - self.centroids[None, :, :]
+        sq_distance = (diff ** 2).sum(axis=2)
+        labels = sq_distance.argmin(axis=1)
+        return labels, sq_distance[np.arange(len(labels)), labels]
+
+    def to_dict(self) -> dict:
+        return {
+            "centroids": self.centroids.tolist(),
+            "scaler_mean": self.scaler_mean,
+            "scaler_scale": self.scaler_scale,
+            "mean_sq_distance": self.mean_sq_distance,
+            "cluster_shares": self.cluster_shares.tolist(),
+            "n_stores": self.n_stores,
+            "algorithm": self.algorithm,
+            "trained_at": self.trained_at,
+        }
+
+
+def save_cluster_model(cluster_model: ClusterModel, path: str = CLUSTER_MODEL_PATH):
+    """
+    임시 파일에 쓴 뒤 교체 (assign 작업이 반쯤 쓰인 파일을 읽지 않도록)
+    """
+    with atomic_open(path) as f:
+        json.dump(cluster_model.to_dict(), f, indent=2)
+
+
+def load_cluster_model(path: str = CLUSTER_MODEL_PATH) -> ClusterModel:
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Cluster model not found at {path} (/train/cluster 전체 학습을 먼저 실행하세요)")
+    with open(path) as f:
+        return ClusterModel(**json.load(f))
+
+
+def cluster_drift(cluster_model: ClusterModel, feature_df: pd.DataFrame, scaled_df: pd.DataFrame, labels: np.ndarray,
+                  sq_distance: np.ndarray) -> dict:
+    """
+    현재 매장 지표가 학습 시점 분포에서 얼마나 벗어났는지와 전체 재학습 권장 여부
+    """
+    if len(scaled_df) == 0:
+        return {"stores": 0, "refit_recommended": False}
+
+    inertia_ratio = float(sq_distance.mean() / cluster_model.mean_sq_distance) if cluster_model.mean_sq_distance > 0 else 0.0
+    feature_shift = float(abs(feature_df["yearly_seasonality_strength"].mean() - cluster_model.scaler_mean) / cluster_model.scaler_scale)
+    shares = np.bincount(labels, minlength=len(cluster_model.centroids)) / len(labels)
+    share_shift = float(np.abs(shares - cluster_model.cluster_shares).sum() / 2)
+
+    return {
+        "stores": len(scaled_df),
+        "inertia_ratio": round(inertia_ratio, 4),
+        "feature_shift": round(feature_shift, 4),
+        "share_shift": round(share_shift, 4),
+        "refit_recommended": bool(len(scaled_df) >= CLUSTER_DRIFT_MIN_STORES and (
+            inertia_ratio > CLUSTER_DRIFT_INERTIA_RATIO
+            or feature_shift > CLUSTER_DRIFT_FEATURE_SHIFT
+            or share_shift > CLUSTER_DRIFT_SHARE_SHIFT
+        )),
+    }
+
+
+def load_cluster_assignments(path: str = CLUSTER_ASSIGNMENTS_PATH) -> dict:
+    """
+    마지막으로 백엔드에 반영된 store_id(str) -> cluster_id (없으면 빈 dict: 전체 동기화)
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_cluster_assignments(assignments: dict, path: str = CLUSTER_ASSIGNMENTS_PATH):
+    with atomic_open(path) as f:
+        json.dump(assignments, f, indent=2, sort_keys=True)
@@ -0,0 +1,92 @@
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from prophet.make_holidays import make_holidays_df
+from forecast.academic_calendar import semester_mask
+
+HOLIDAY_COUNTRY = "KR"
+
+# 클러스터 유형별 Prophet holiday 설정: (포함할 공휴일, holiday 이름)
+# - all: 모든 공휴일 (주거지)
+# - weekday: 평일인 공휴일만 (오피스 / 번화가 / 역세권)
+# - semester_weekday: 학기 중 평일인 공휴일만 (대학가)
+HOLIDAY_VARIANTS = {
+    "all": "all_holidays",
+    "weekday": "weekday_only_holiday",
+    "semester_weekday": "semester_holiday",
+}
+
+
+def holiday_years(dates) -> tuple:
+    """
+    날짜들이 걸친 연도 (정렬된 tuple, holiday cache key)
+    """
+    return tuple(sorted(pd.DatetimeIndex(dates).year.unique().tolist()))
+
+
+def _read_only(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    컬럼 배열을 쓰기 금지로 만든 DataFrame (공유 cache를 호출자가 제자리 수정하지 못하도록)
+    """
+    columns = {}
+    for column in df.columns:
+        values = df[column].to_numpy(copy=True)
+        values.flags.writeable = False
+        columns[column] = values
+    return pd.DataFrame(columns, copy=False)
+
+
+@lru_cache(maxsize=None)
+def _kr_holidays(years: tuple) -> pd.DataFrame:
+    return _read_only(make_holidays_df(year_list=list(years), country=HOLIDAY_COUNTRY))
+
+
+def kr_holidays(years) -> pd.DataFrame:
+    """
+    연도 집합의 전체 공휴일 (ds, holiday). 프로세스 내에서 연도 집합별로 한 번만 생성하며, 읽기 전용
+    """
+    return _kr_holidays(tuple(sorted(set(years))))
+
+
+@lru_cache(maxsize=None)
+def _holiday_dates(years: tuple) -> frozenset:
+    return frozenset(_kr_holidays(years)["ds"].dt.date)
+
+
+def kr_holiday_dates(years) -> frozenset:
+    """
+    공휴일 날짜(datetime.date) 집합
+    """
+    return _holiday_dates(tuple(sorted(set(years))))
+
+
+@lru_cache(maxsize=None)
+def _cluster_holidays(variant: str, years: tuple) -> pd.DataFrame:
+    holidays = _kr_holidays(years)
+    keep = np.ones(len(holidays), dtype=bool)
+    if variant in ("weekday", "semester_weekday"):
+        keep &= holidays["ds"].dt.weekday.to_numpy() < 5
+    if variant == "semester_weekday":
+        keep &= semester_mask(holidays["ds"])
+
+    selected = holidays.loc[keep, ["ds"]].reset_index(drop=True)
+    selected["holiday"] = HOLIDAY_VARIANTS[variant]
+    return _read_only(selected)
+
+
+def cluster_holidays(variant: str, years) -> pd.DataFrame:
+    """
+    클러스터 유형별 Prophet holidays 입력 (HOLIDAY_VARIANTS). 연도 집합별로 한 번만 만들어 공유하는 읽기 전용 frame
+    """
+    if variant not in HOLIDAY_VARIANTS:
+        raise ValueError(f"지원하지 않는 holiday 유형: {variant}")
+    return _cluster_holidays(variant, tuple(sorted(set(years))))
+
+
+def warm_holiday_cache(years):
+    """
+    학습 worker 시작 시 모든 유형의 holiday table을 미리 생성
+    """
+    for variant in HOLIDAY_VARIANTS:
+        cluster_holidays(variant, years)
+    kr_holiday_dates(years)
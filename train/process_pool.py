@@ -0,0 +1,39 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from settings import setting, flag
+
+# 학습 worker 프로세스 시작 방식.
+# 학습 job은 멀티스레드 서버(예측 thread pool) 프로세스에서 시작되기 때문에, fork로 만들면 다른 thread가
+# 잡고 있던 lock(model registry, stdout, sqlite 등)이 잠긴 채로 복사되어 worker가 멈출 수 있다.
+# forkserver(또는 spawn)는 깨끗한 프로세스에서 worker를 만든다.
+TRAIN_START_METHOD = setting("TRAIN_START_METHOD", "forkserver")
+# 학습 worker의 nice 값 (0이면 변경 안 함). 같은 서버의 예측 요청이 CPU를 먼저 쓰도록 우선순위를 낮춘다.
+# 증가량이 아닌 목표 값이라, 학습 job 프로세스 안에서 다시 만든 풀도 같은 값으로 실행된다
+TRAIN_WORKER_NICE = int(setting("TRAIN_WORKER_NICE", 10))
+# Linux에서는 학습 worker를 SCHED_IDLE로 실행 (다른 프로세스가 쓰지 않는 CPU만 사용).
+# nice 10만으로는 코어가 적은 서버에서 학습이 여전히 CPU 시간의 일부를 가져가 예측 p99가 늘어난다
+TRAIN_WORKER_SCHED_IDLE = flag("TRAIN_WORKER_SCHED_IDLE", True)
+
+
+def _init_worker(nice: int, sched_idle: bool, initializer, initargs):
+    if nice and hasattr(os, "nice"):
+        current = os.nice(0)
+        if nice > current:
+            os.nice(nice - current)
+    if sched_idle and hasattr(os, "SCHED_IDLE"):
+        os.sched_setscheduler(0, os.SCHED_IDLE, os.sched_param(0))
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def training_process_pool(max_workers: int, initializer=None, initargs=()) -> ProcessPoolExecutor:
+    """
+    학습 job / 매장별 학습 / backtest용 프로세스 풀 (TRAIN_START_METHOD로 시작, TRAIN_WORKER_NICE / TRAIN_WORKER_SCHED_IDLE로 우선순위를 낮춤)
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context(TRAIN_START_METHOD),
+        initializer=_init_worker,
+        initargs=(TRAIN_WORKER_NICE, TRAIN_WORKER_SCHED_IDLE, initializer, initargs),
+    )
@@ -1,12 +1,10 @@
 import os
 import pickle
-import optuna
 from prophet import Prophet
-from prophet.make_holidays import make_holidays_df
-from sklearn.metrics import mean_absolute_error
-from datetime import timedelta
+from train.holiday_service import cluster_holidays, holiday_years
+from train.prophet_utils.tuning import tune_prophet
+from forecast.prophet_artifact import save_prophet_artifact
 import pandas as pd 
-import numpy as np
 
 def run_prophet_house(store_df: pd.DataFrame, store_id: int, save_dir: str = "./models/prophet/"):
 
@@ -22,76 +20,40 @@ def run_prophet_house(store_df: pd.DataFrame, store_id: int, save_dir: str = "./
 
 
     # holiday 설정: 모든 공휴일 포함
-    years = df["ds"].dt.year.unique().tolist()
-    house_holidays = make_holidays_df(year_list=years, country='KR')
-    house_holidays["holiday"] = "all_holidays"
+    house_holidays = cluster_holidays("all", holiday_years(df["ds"]))
+
+    def build_model(params):
+        return Prophet(
+            growth='logistic',
+            yearly_seasonality=True,
+            weekly_seasonality=True,
+            daily_seasonality=False,
+            seasonality_mode='additive',
+            changepoint_prior_scale=params["changepoint_prior_scale"],
+            seasonality_prior_scale=params["seasonality_prior_scale"],
+            holidays_prior_scale=params["holidays_prior_scale"],
+            holidays=house_holidays
+        )
+
+    def make_future(valid, train):
+        future = valid[["ds"]].copy()
+        future["cap"] = train["cap"].iloc[0]
+        future["floor"] = 0
+        return future
 
     # hyper-parameter tuning (최근 5개월에 대한 K-Fold 평가 기반)
-    def objective(trial):
-        changepoint_prior_scale = trial.suggest_categorical('changepoint_prior_scale', [0.01, 0.05, 0.1, 0.5])
-        seasonality_prior_scale = trial.suggest_categorical('seasonality_prior_scale', [0.1, 1.0, 5.0, 10.0])
-        holidays_prior_scale = trial.suggest_categorical('holidays_prior_scale', [0.1, 1.0, 5.0, 10.0])
-
-        mae_scores = []
-        end_date = df["ds"].max().replace(day=1)
-        fold_months = [end_date - pd.DateOffset(months=i) for i in range(5, 0, -1)]
-
-        for test_start in fold_months:
-            test_end = test_start + pd.DateOffset(months=1) - timedelta(days=1)
-            train = df[df["ds"] < test_start]
-            valid = df[(df["ds"] >= test_start) & (df["ds"] <= test_end)]
-
-            if len(valid) == 0:
-                continue
-
-            model = Prophet(
-                growth='logistic',
-                yearly_seasonality=True,
-                weekly_seasonality=True,
-                daily_seasonality=False,
-                seasonality_mode='additive',
-                changepoint_prior_scale=changepoint_prior_scale,
-                seasonality_prior_scale=seasonality_prior_scale,
-                holidays_prior_scale=holidays_prior_scale,
-                holidays=house_holidays
-            )
-
-            try:
-                model.fit(train)
-
-                future = valid[["ds"]].copy()
-                future["cap"] = train["cap"].iloc[0]
-                future["floor"] = 0
-
-                forecast = model.predict(future)
-                mae = mean_absolute_error(valid["y"].values, forecast["yhat"].values)
-                mae_scores.append(mae)
-
-            except Exception as e:
-                print(f"[{store_id_str}] 오류 발생: {e}")
-                return np.inf
-
-        return np.mean(mae_scores) if mae_scores else np.inf
-
-    study = optuna.create_study(direction="minimize")
-    study.optimize(objective, n_trials= 20)
-    best_params = study.best_params
+    best_params, tuning_stats = tune_prophet(df, build_model, make_future, store_id_str, config_key="house")
 
     # model train
-    final_model = Prophet(
-        growth='logistic',
-        yearly_seasonality=True,
-        weekly_seasonality=True,
-        daily_seasonality=False,
-        seasonality_mode='additive',
-        changepoint_prior_scale=best_params["changepoint_prior_scale"],
-        seasonality_prior_scale=best_params["seasonality_prior_scale"],
-        holidays_prior_scale=best_params["holidays_prior_scale"],
-        holidays=house_holidays
-    )
+    final_model = build_model(best_params)
     final_model.fit(df)
 
     # save model
     os.makedirs(save_dir, exist_ok=True)
     with open(os.path.join(save_dir, f"{store_id_str}.pkl"), "wb") as f:
         pickle.dump(final_model, f)
+
+    # 서빙용 경량 artifact (forecast 경로에서 pkl보다 우선 사용)
+    save_prophet_artifact(final_model, store_id_str, save_dir)
+
+    return tuning_stats
@@ -0,0 +1,118 @@
+import os
+import time
+from concurrent.futures import as_completed
+import pandas as pd
+from train.holiday_service import holiday_years, warm_holiday_cache
+from train.process_pool import training_process_pool
+from settings import setting
+
+# 동시에 학습할 매장 수 (기본값: CPU 코어 수)
+PROPHET_TRAIN_WORKERS = int(setting("PROPHET_TRAIN_WORKERS", os.cpu_count() or 1))
+
+
+def get_prophet_function(cluster_id: int):
+    from train.prophet_utils.run_prophet_downtown import run_prophet_downtown
+    from train.prophet_utils.run_prophet_house import run_prophet_house
+    from train.prophet_utils.run_prophet_office import run_prophet_office
+    from train.prophet_utils.run_prophet_station import run_prophet_station
+    from train.prophet_utils.run_prophet_univ import run_prophet_univ
+
+    return {
+        0: run_prophet_office,
+        1: run_prophet_house,
+        2: run_prophet_univ,
+        3: run_prophet_downtown,
+        4: run_prophet_station
+    }.get(cluster_id)
+
+
+def train_store(store_id: int, cluster_id: int, store_df: pd.DataFrame) -> dict:
+    """
+    매장 하나를 학습하고 결과를 반환 (예외는 결과로 기록하고 밖으로 던지지 않음)
+    """
+    start = time.time()
+    result = {"store_id": store_id, "cluster_id": cluster_id}
+
+    prophet_func = get_prophet_function(cluster_id)
+    if prophet_func is None:
+        result.update(status="skipped", seconds=0.0, error=f"지원하지 않는 cluster_id: {cluster_id}")
+        return result
+
+    try:
+        result["tuning"] = prophet_func(store_df, store_id)
+        result["status"] = "succeeded"
+    except Exception as e:
+        result.update(status="failed", error=f"{type(e).__name__}: {e}")
+    result["seconds"] = round(time.time() - start, 3)
+    return result
+
+
+def train_prophet_stores(df: pd.DataFrame, n_workers: int = None, progress_callback=None, should_stop=None) -> dict:
+    """
+    매장별 Prophet 학습을 프로세스 풀로 병렬 실행.
+    한 매장이 실패해도 나머지 매장은 계속 학습하고, 매장별 성공/실패/소요 시간을 요약해서 반환한다.
+    progress_callback(result, done, total)은 매장 하나가 끝날 때마다 호출된다.
+    should_stop()이 True가 되면 아직 시작하지 않은 매장은 건너뛰고 중단한다 (summary["stopped"]).
+    """
+    n_workers = n_workers or PROPHET_TRAIN_WORKERS
+    start = time.time()
+
+    tasks = []
+    for store_id, store_df in df.groupby("store_id", observed=True):
+        cluster_id = int(store_df["cluster_id"].iloc[0])
+        tasks.append((int(store_id), cluster_id, store_df[["date", "revenue"]]))
+
+    results = []
+    stopped = False
+
+    def record(result):
+        results.append(result)
+        print(f"[{result['store_id']}] Prophet 학습 {result['status']} ({result['seconds']}s)"
+              + (f": {result['error']}" if "error" in result else ""))
+        if progress_callback:
+            progress_callback(result, len(results), len(tasks))
+
+    if n_workers <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            if should_stop and should_stop():
+                stopped = True
+                break
+            record(train_store(*task))
+    else:
+        # worker마다 holiday table을 시작 시 한 번 만들어 두고 매장 간 공유
+        with training_process_pool(
+            min(n_workers, len(tasks)),
+            initializer=warm_holiday_cache,
+            initargs=(holiday_years(df["date"]),),
+        ) as executor:
+            futures = {executor.submit(train_store, *task): task for task in tasks}
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                store_id, cluster_id, _ = futures[future]
+                if not stopped and should_stop and should_stop():
+                    # 실행 중인 매장은 마무리하고, 대기 중인 매장은 취소
+                    stopped = True
+                    for pending in futures:
+                        pending.cancel()
+                try:
+                    record(future.result())
+                except Exception as e:
+                    # worker 프로세스 비정상 종료 등
+                    record({
+                        "store_id": store_id,
+                        "cluster_id": cluster_id,
+                        "status": "failed",
+                        "seconds": 0.0,
+                        "error": f"{type(e).__name__}: {e}",
+                    })
+
+    results.sort(key=lambda r: r["store_id"])
+    return {
+        "total": len(tasks),
+        "succeeded": [r for r in results if r["status"] == "succeeded"],
+        "failed": [r for r in results if r["status"] == "failed"],
+        "skipped": [r for r in results if r["status"] == "skipped"],
+        "stopped": stopped,
+        "seconds": round(time.time() - start, 3),
+    }
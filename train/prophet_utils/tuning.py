@@ -0,0 +1,143 @@
+import hashlib
+from collections import OrderedDict
+from datetime import timedelta
+import numpy as np
+import pandas as pd
+import optuna
+from sklearn.metrics import mean_absolute_error
+from forecast.prophet_inference import predict_point
+from train.prophet_utils.warm_start import WARM_START, fit_prophet, stan_init
+from train.pruning import make_pruner
+from settings import setting
+
+# 탐색 공간 (4 x 4 x 4 = 64개 조합)
+PARAM_GRID = {
+    "changepoint_prior_scale": [0.01, 0.05, 0.1, 0.5],
+    "seasonality_prior_scale": [0.1, 1.0, 5.0, 10.0],
+    "holidays_prior_scale": [0.1, 1.0, 5.0, 10.0],
+}
+
+N_TRIALS = int(setting("PROPHET_TUNING_TRIALS", 20))
+N_FOLDS = 5
+# train.pruning.PRUNERS 중 하나 (step = fold)
+PRUNER = setting("PROPHET_TUNING_PRUNER", "median")
+FOLD_CACHE_SIZE = int(setting("PROPHET_FOLD_CACHE_SIZE", 100_000))
+
+# (데이터 fingerprint, fold 시작일, 파라미터 조합) -> (fold MAE, 다음 fold의 warm-start 초기값)
+_fold_cache = OrderedDict()
+
+
+def data_fingerprint(df: pd.DataFrame, *extra) -> str:
+    """
+    학습 데이터 + 모델 설정(extra)의 hash. 같은 데이터/설정이면 fold 결과를 재사용한다.
+    """
+    h = hashlib.sha1(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    for value in extra:
+        if isinstance(value, pd.DataFrame):
+            h.update(pd.util.hash_pandas_object(value, index=False).values.tobytes())
+        else:
+            h.update(repr(value).encode())
+    return h.hexdigest()
+
+
+def monthly_folds(df: pd.DataFrame, n_folds: int = N_FOLDS) -> list:
+    """
+    최근 n_folds개월을 한 달씩 validation으로 쓰는 expanding window fold
+    """
+    end_date = df["ds"].max().replace(day=1)
+    fold_months = [end_date - pd.DateOffset(months=i) for i in range(n_folds, 0, -1)]
+    return [(test_start, test_start + pd.DateOffset(months=1) - timedelta(days=1)) for test_start in fold_months]
+
+
+def _cache_get(key):
+    entry = _fold_cache.get(key)
+    if entry is not None:
+        _fold_cache.move_to_end(key)
+    return entry
+
+
+def _cache_put(key, mae, init=None):
+    _fold_cache[key] = (mae, init)
+    while len(_fold_cache) > FOLD_CACHE_SIZE:
+        _fold_cache.popitem(last=False)
+
+
+def tune_prophet(
+    df: pd.DataFrame,
+    build_model,
+    make_future,
+    store_id: str,
+    config_key=None,
+    n_trials: int = N_TRIALS,
+    warm_start: bool = WARM_START,
+):
+    """
+    Prophet 하이퍼파라미터 튜닝 (최근 5개월 K-Fold MAE 기준).
+
+    - build_model(params): 파라미터로 학습 전 Prophet 객체 생성
+    - make_future(valid, train): validation 구간 예측 입력 생성
+    - 같은 (데이터, fold, 파라미터) 조합의 fold MAE는 cache에서 재사용 (중복 샘플링 시 Prophet 재학습 없음)
+    - fold마다 누적 평균 MAE를 report 하여 pruner가 가망 없는 trial을 조기 중단
+    - warm_start: 같은 trial의 직전 fold 모델 파라미터로 다음 fold fit을 초기화.
+      fold 결과와 함께 그 fit의 초기값도 cache 하므로, cache hit 뒤의 fold도 항상 직전 fold에서 이어서 fit 한다
+      (cache 이력과 관계없이 같은 (데이터, fold, 파라미터)는 같은 MAE)
+
+    반환: (best_params, stats) - stats는 trial / pruned / fit / cache hit 수
+    """
+    fingerprint = data_fingerprint(df, config_key, warm_start)
+    folds = monthly_folds(df)
+    stats = {"trials": 0, "pruned": 0, "fits": 0, "cache_hits": 0}
+
+    def objective(trial):
+        params = {name: trial.suggest_categorical(name, values) for name, values in PARAM_GRID.items()}
+        param_key = tuple(params[name] for name in PARAM_GRID)
+        stats["trials"] += 1
+
+        mae_scores = []
+        prev_init = None
+        for step, (test_start, test_end) in enumerate(folds):
+            train = df[df["ds"] < test_start]
+            valid = df[(df["ds"] >= test_start) & (df["ds"] <= test_end)]
+
+            if len(valid) == 0:
+                continue
+
+            cache_key = (fingerprint, test_start, param_key)
+            cached = _cache_get(cache_key)
+            if cached is not None:
+                stats["cache_hits"] += 1
+                mae, init = cached
+                if init is not None:
+                    prev_init = init
+            else:
+                model = build_model(params)
+                init = None
+                try:
+                    stats["fits"] += 1
+                    fit_prophet(model, train, init=prev_init if warm_start else None)
+                    if warm_start:
+                        init = prev_init = stan_init(model)
+                    forecast = predict_point(model, make_future(valid, train))
+                    mae = mean_absolute_error(valid["y"].values, forecast["yhat"].values)
+                except Exception as e:
+                    print(f"[{store_id}] 오류 발생: {e}")
+                    mae = np.inf
+                _cache_put(cache_key, mae, init)
+
+            if not np.isfinite(mae):
+                return np.inf
+            mae_scores.append(mae)
+
+            trial.report(float(np.mean(mae_scores)), step)
+            if trial.should_prune():
+                stats["pruned"] += 1
+                raise optuna.TrialPruned()
+
+        return np.mean(mae_scores) if mae_scores else np.inf
+
+    study = optuna.create_study(direction="minimize", pruner=make_pruner(PRUNER, min_steps=1))
+    study.optimize(objective, n_trials=n_trials)
+
+    print(f"[{store_id}] Optuna 튜닝: trials={stats['trials']}, pruned={stats['pruned']}, "
+          f"fits={stats['fits']}, cache_hits={stats['cache_hits']}, best={study.best_value:.4f}")
+    return study.best_params, stats
@@ -0,0 +1,52 @@
+import re
+import numpy as np
+import pandas as pd
+from prophet import Prophet
+from settings import flag
+
+# 직전 fold의 학습 결과로 다음 fold의 Stan 최적화를 초기화할지 여부 (opt-in: 적합 결과가 cold fit과 조금 달라질 수 있음)
+WARM_START = flag("PROPHET_WARM_START", False)
+
+
+def stan_init(model: Prophet) -> dict:
+    """
+    학습된 모델의 파라미터를 다음 fit의 초기값으로 변환 (Prophet 문서의 warm-start 패턴).
+    changepoint / feature 수가 달라 shape이 맞지 않는 항목은 Prophet이 기본 초기값으로 대체한다.
+    """
+    res = {}
+    for pname in ["k", "m", "sigma_obs"]:
+        res[pname] = float(model.params[pname][0][0])
+    for pname in ["delta", "beta"]:
+        res[pname] = np.asarray(model.params[pname][0])
+    return res
+
+
+def fit_prophet(model: Prophet, df: pd.DataFrame, init_model: Prophet = None, init: dict = None) -> Prophet:
+    """
+    init_model이 있으면 그 파라미터로 warm-start, 없으면 일반 fit.
+    init: 이미 stan_init으로 변환해 둔 초기값 (모델 객체 없이 이어서 fit 할 때)
+    """
+    if init is None and init_model is not None and init_model.params:
+        init = stan_init(init_model)
+    if init is not None:
+        return model.fit(df, init=init)
+    return model.fit(df)
+
+
+def optimizer_iterations(model: Prophet):
+    """
+    마지막 fit의 L-BFGS 반복 횟수 (cmdstan stdout 기준, 확인할 수 없으면 None)
+    """
+    try:
+        stdout_files = model.stan_backend.stan_fit.runset.stdout_files
+        with open(stdout_files[0]) as f:
+            lines = f.read().splitlines()
+    except Exception:
+        return None
+
+    iterations = None
+    for line in lines:
+        match = re.match(r"^\s+(\d+)\s+-?[\d.]", line)
+        if match:
+            iterations = int(match.group(1))
+    return iterations
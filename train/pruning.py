@@ -0,0 +1,19 @@
+import optuna
+
+PRUNERS = ("hyperband", "median", "halving", "none")
+
+
+def make_pruner(name: str, min_steps: int = 1):
+    """
+    Optuna pruner ("hyperband" | "median" | "halving" | "none").
+    min_steps: 이 step 수 전에는 pruning 하지 않음 (Prophet은 fold 수, XGBoost는 boosting round 수 기준)
+    """
+    if name == "hyperband":
+        return optuna.pruners.HyperbandPruner(min_resource=min_steps)
+    if name == "median":
+        return optuna.pruners.MedianPruner(n_startup_trials=5, n_warmup_steps=min_steps)
+    if name == "halving":
+        return optuna.pruners.SuccessiveHalvingPruner(min_resource=min_steps)
+    if name == "none":
+        return optuna.pruners.NopPruner()
+    raise ValueError(f"지원하지 않는 pruner: {name} ({', '.join(PRUNERS)} 중 하나)")
@@ -1,92 +1,150 @@
 import pandas as pd
 import numpy as np
 from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import KMeans
-import holidays
-
-def run_kmeans_clustering(df_long: pd.DataFrame, k: int = 5) -> dict:
-    df_long['date'] = pd.to_datetime(df_long['date'])
-
-    # drop day-off
-    df_long = df_long[df_long['revenue'] > 0]
-
-    # holiday extraction
-    years = df_long['date'].dt.year.unique()
-    holiday = holidays.KR(years=years)
-    holiday_dates = set(holiday.keys())
-
-    # store_id를 기준으로 pivot
-    df_wide = df_long.pivot(index="date", columns="store_id", values="revenue")
-
-    features = {}
-    fallback_ids = []  # 계산이 불가능한 매장
-
-    for store in df_wide.columns:
-        s = df_wide[store].dropna()
-
-        # 지표 추출 
-        date_series = s.index.to_series()
-        weekday = date_series.dt.weekday
-        is_weekend = weekday >= 5
-        month = date_series.dt.month
-        is_holiday = date_series.isin(holiday_dates) & (weekday < 5)
-
-        holiday_sales = s[is_holiday]
-        week_sales = s[~is_weekend]
-        weekend_sales = s[is_weekend]
-        semester_sales = s[month.isin([3, 4, 5, 6, 9, 10, 11, 12])]
-        vacation_sales = s[month.isin([1, 2, 7, 8])]
-
-        # 구간 중 하나라도 데이터가 없으면 계산 제외
-        if (
-            holiday_sales.empty or
-            week_sales.empty or
-            weekend_sales.empty or
-            semester_sales.empty or
-            vacation_sales.empty or
-            s.groupby(month).mean().std() == 0
-        ):
-            fallback_ids.append(store)
-            continue
-
-        holiday_mean = holiday_sales.mean()
-        week_diff = week_sales.mean() - weekend_sales.mean()
-        semester_diff = semester_sales.mean() - vacation_sales.mean()
-        yearly_seasonality_strength = s.groupby(month).mean().std()
-
-        features[store] = {
-            "holiday_mean": holiday_mean,
-            "week_diff": week_diff,
-            "semester_diff": semester_diff,
-            "yearly_seasonality_strength": yearly_seasonality_strength
-        }
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from train.holiday_service import kr_holiday_dates, holiday_years
+from train.cluster_model import CLUSTER_MODEL_PATH, ClusterModel, save_cluster_model, load_cluster_model, cluster_drift
+from settings import setting
+
+# "auto" | "kmeans" | "minibatch" (auto: 매장 수가 CLUSTER_MINIBATCH_THRESHOLD 이상이면 minibatch)
+CLUSTER_ALGORITHM = setting("CLUSTER_ALGORITHM", "auto")
+CLUSTER_MINIBATCH_THRESHOLD = int(setting("CLUSTER_MINIBATCH_THRESHOLD", 50_000))
+CLUSTER_BATCH_SIZE = int(setting("CLUSTER_BATCH_SIZE", 4096))
+# 지표 계산 시 한 번에 처리하는 행 수
+CLUSTER_CHUNK_ROWS = int(setting("CLUSTER_CHUNK_ROWS", 1_000_000))
+
+ROW_FEATURES = ["holiday_mean", "week_diff", "semester_diff"]
+SEMESTER_MONTHS = [3, 4, 5, 6, 9, 10, 11, 12]
+VACATION_MONTHS = [1, 2, 7, 8]
+
+
+def _accumulate(sums: np.ndarray, counts: np.ndarray, codes: np.ndarray, values: np.ndarray):
+    sums += np.bincount(codes, weights=values, minlength=len(sums))
+    counts += np.bincount(codes, minlength=len(counts))
+
+
+def _mean(sums: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return sums / counts
+
+
+def store_cluster_features(df_long: pd.DataFrame, chunk_rows: int = CLUSTER_CHUNK_ROWS) -> tuple:
+    """
+    매출 > 0인 날만으로 매장별 클러스터링 지표 4개를 매장 loop 없이 계산.
+    chunk_rows 행씩 매장별 (월 / 주말 / 평일 공휴일) 매출 합계와 건수만 누적하므로
+    추가 메모리는 매장 수와 chunk 크기에만 비례한다.
+    반환: (feature_df (index: store_id 오름차순), 지표를 계산할 수 없는 store_id 목록)
+    - holiday_mean: 평일 공휴일 평균 매출
+    - week_diff: 평일 평균 - 주말 평균
+    - semester_diff: 학기 월 평균 - 방학 월 평균
+    - yearly_seasonality_strength: 월별 평균 매출의 표준편차
+    """
+    positive = df_long["revenue"].to_numpy() > 0
+    store_ids, store_codes = np.unique(df_long["store_id"].to_numpy()[positive], return_inverse=True)
+    n_stores = len(store_ids)
+    row_index = np.flatnonzero(positive)
+
+    dates = df_long["date"]
+    holiday_days = np.array(sorted(kr_holiday_dates(holiday_years(dates.iloc[row_index]))), dtype="datetime64[D]")
+
+    monthly_sums, monthly_counts = np.zeros(n_stores * 12), np.zeros(n_stores * 12, dtype=np.int64)
+    weekend_sums, weekend_counts = np.zeros(n_stores), np.zeros(n_stores, dtype=np.int64)
+    holiday_sums, holiday_counts = np.zeros(n_stores), np.zeros(n_stores, dtype=np.int64)
+
+    for start in range(0, len(row_index), chunk_rows):
+        rows = row_index[start:start + chunk_rows]
+        codes = store_codes[start:start + chunk_rows]
+        chunk_dates = pd.DatetimeIndex(dates.iloc[rows])
+        revenue = df_long["revenue"].iloc[rows].to_numpy(dtype=np.float64)
+        month = chunk_dates.month.to_numpy()
+        is_weekend = chunk_dates.weekday.to_numpy() >= 5
+        is_holiday = np.isin(chunk_dates.to_numpy().astype("datetime64[D]"), holiday_days) & ~is_weekend
+
+        _accumulate(monthly_sums, monthly_counts, codes * 12 + (month - 1), revenue)
+        _accumulate(weekend_sums, weekend_counts, codes[is_weekend], revenue[is_weekend])
+        _accumulate(holiday_sums, holiday_counts, codes[is_holiday], revenue[is_holiday])
+
+    monthly_sums = monthly_sums.reshape(n_stores, 12)
+    monthly_counts = monthly_counts.reshape(n_stores, 12)
+    semester = np.isin(np.arange(1, 13), SEMESTER_MONTHS)
+    vacation = np.isin(np.arange(1, 13), VACATION_MONTHS)
+
+    holiday_mean = _mean(holiday_sums, holiday_counts)
+    weekend_mean = _mean(weekend_sums, weekend_counts)
+    week_mean = _mean(monthly_sums.sum(axis=1) - weekend_sums, monthly_counts.sum(axis=1) - weekend_counts)
+    semester_mean = _mean(monthly_sums[:, semester].sum(axis=1), monthly_counts[:, semester].sum(axis=1))
+    vacation_mean = _mean(monthly_sums[:, vacation].sum(axis=1), monthly_counts[:, vacation].sum(axis=1))
+    # 데이터가 있는 월의 평균 매출끼리 표준편차 (ddof=1)
+    yearly_strength = pd.DataFrame(_mean(monthly_sums, monthly_counts)).std(axis=1).to_numpy()
+
+    feature_df = pd.DataFrame({
+        "holiday_mean": holiday_mean,
+        "week_diff": week_mean - weekend_mean,
+        "semester_diff": semester_mean - vacation_mean,
+        "yearly_seasonality_strength": yearly_strength,
+    }, index=store_ids)
+
+    # 구간 중 하나라도 데이터가 없거나 월별 변화가 없으면 계산 제외
+    fallback = (
+        np.isnan(holiday_mean) | np.isnan(week_mean) | np.isnan(weekend_mean)
+        | np.isnan(semester_mean) | np.isnan(vacation_mean) | (yearly_strength == 0)
+    )
+    return feature_df[~fallback], store_ids[fallback].tolist()
+
+
+def scale_features(feature_df: pd.DataFrame, scaler: StandardScaler = None) -> tuple:
+    """
+    row-wise (holiday_mean / week_diff / semester_diff) + column-wise (yearly_seasonality_strength) scaling.
+    scaler를 넘기면 fit 없이 그 scaler로 transform만 한다. 반환: (scaled_df, scaler)
+    """
+    row_scaled = feature_df[ROW_FEATURES].sub(
+        feature_df[ROW_FEATURES].mean(axis=1), axis=0
+    ).div(
+        feature_df[ROW_FEATURES].std(axis=1).replace(0, 1), axis=0
+    )
+
+    if scaler is None:
+        scaler = StandardScaler().fit(feature_df[["yearly_seasonality_strength"]])
+    col_scaled = pd.DataFrame(
+        scaler.transform(feature_df[["yearly_seasonality_strength"]]),
+        columns=["yearly_seasonality_strength"],
+        index=feature_df.index
+    )
+    return pd.concat([row_scaled, col_scaled], axis=1), scaler
+
+
+def make_kmeans(k: int, n_samples: int, algorithm: str = CLUSTER_ALGORITHM):
+    """
+    kmeans: 기존과 같은 KMeans, minibatch: batch 단위로 centroid를 갱신하는 MiniBatchKMeans (매장 수가 매우 많을 때)
+    """
+    if algorithm == "auto":
+        algorithm = "minibatch" if n_samples >= CLUSTER_MINIBATCH_THRESHOLD else "kmeans"
+    if algorithm == "minibatch":
+        return MiniBatchKMeans(n_clusters=k, random_state=42, batch_size=CLUSTER_BATCH_SIZE, n_init="auto")
+    if algorithm != "kmeans":
+        raise ValueError(f"지원하지 않는 클러스터링 알고리즘: {algorithm}")
+    return KMeans(n_clusters=k, random_state=42)
+
+
+def run_kmeans_clustering(df_long: pd.DataFrame, k: int = 5, algorithm: str = CLUSTER_ALGORITHM,
+                          model_path: str = CLUSTER_MODEL_PATH) -> dict:
+    """
+    전체 매장 재학습. model_path가 있으면 scaler / centroid를 저장해 assign_clusters에서 재사용한다.
+    """
+    df_long = df_long.assign(date=pd.to_datetime(df_long["date"]))
+
+    # 매장별 지표 추출 (휴무일 제외)
+    feature_df, fallback_ids = store_cluster_features(df_long)
 
     # 클러스터링
-    feature_df = pd.DataFrame.from_dict(features, orient="index")
-
     if not feature_df.empty:
-        # Row-wise scaling
-        row_features = ["holiday_mean", "week_diff", "semester_diff"]
-        row_scaled = feature_df[row_features].sub(
-            feature_df[row_features].mean(axis=1), axis=0
-        ).div(
-            feature_df[row_features].std(axis=1).replace(0, 1), axis=0
-        )
-
-        # Column-wise scaling
-        scaler = StandardScaler()
-        col_scaled = pd.DataFrame(
-            scaler.fit_transform(feature_df[["yearly_seasonality_strength"]]),
-            columns=["yearly_seasonality_strength"],
-            index=feature_df.index
-        )
-
-        final_scaled_df = pd.concat([row_scaled, col_scaled], axis=1)
-
-        model = KMeans(n_clusters=k, random_state=42)
+        final_scaled_df, scaler = scale_features(feature_df)
+        model = make_kmeans(k, len(final_scaled_df), algorithm)
         cluster_ids = model.fit_predict(final_scaled_df)
 
         result = dict(zip(final_scaled_df.index, cluster_ids))
+        if model_path:
+            save_cluster_model(ClusterModel.from_fit(model, scaler, final_scaled_df, cluster_ids, type(model).__name__), model_path)
     else:
         result = {}
 
@@ -95,3 +153,28 @@ def run_kmeans_clustering(df_long: pd.DataFrame, k: int = 5) -> dict:
         result[store] = 0
 
     return result
+
+
+def assign_clusters(df_long: pd.DataFrame, cluster_model: ClusterModel = None) -> tuple:
+    """
+    재학습 없이 저장된 scaler / centroid로 df_long의 매장을 가장 가까운 클러스터에 배정 (신규 매장 onboarding).
+    매장 수에 비례하는 비용만 들며, 기존 매장의 cluster는 바뀌지 않는다.
+    반환: (store_id -> cluster_id, drift 통계 (cluster_drift))
+    """
+    if cluster_model is None:
+        cluster_model = load_cluster_model()
+    df_long = df_long.assign(date=pd.to_datetime(df_long["date"]))
+
+    feature_df, fallback_ids = store_cluster_features(df_long)
+    if not feature_df.empty:
+        scaled_df, _ = scale_features(feature_df, scaler=cluster_model.scaler)
+        cluster_ids, sq_distance = cluster_model.nearest(scaled_df)
+        result = dict(zip(scaled_df.index, cluster_ids))
+        drift = cluster_drift(cluster_model, feature_df, scaled_df, cluster_ids, sq_distance)
+    else:
+        result = {}
+        drift = {"stores": 0, "refit_recommended": False}
+
+    for store in fallback_ids:
+        result[store] = 0
+    return result, drift
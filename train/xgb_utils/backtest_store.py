@@ -0,0 +1,63 @@
+import os
+import glob
+import hashlib
+import pandas as pd
+from forecast.atomic_write import atomic_path
+from settings import setting
+
+# (store, test month)별 backtest 결과 저장 위치
+BACKTEST_STORE_DIR = setting("BACKTEST_STORE_DIR", "./models/backtest")
+
+# 저장 포맷 / 계산 방식이 바뀌면 올려서 기존 결과를 무효화
+SCHEMA_VERSION = 2
+
+
+def cell_key(train_df: pd.DataFrame, test_df: pd.DataFrame, base_params: dict, *extra) -> str:
+    """
+    학습 구간(date, revenue) / 테스트 구간(전체 컬럼) 데이터와 기준 모델 하이퍼파라미터로 만든 셀 key.
+    데이터나 하이퍼파라미터가 하나라도 바뀌면 key가 달라져 다시 계산된다.
+    """
+    h = hashlib.sha1(str(SCHEMA_VERSION).encode())
+    h.update(pd.util.hash_pandas_object(train_df[["date", "revenue"]], index=False).values.tobytes())
+    h.update(repr(list(test_df.columns)).encode())
+    h.update(pd.util.hash_pandas_object(test_df, index=False).values.tobytes())
+    for name, value in sorted(base_params.items()):
+        h.update(name.encode())
+        if isinstance(value, pd.DataFrame):
+            h.update(pd.util.hash_pandas_object(value, index=False).values.tobytes())
+        else:
+            h.update(repr(value).encode())
+    for value in extra:
+        h.update(repr(value).encode())
+    return h.hexdigest()
+
+
+def cell_path(store_id, test_month, key: str, store_dir: str = BACKTEST_STORE_DIR) -> str:
+    return os.path.join(store_dir, str(store_id), f"{test_month}-{key[:16]}.parquet")
+
+
+def load_cell(store_id, test_month, key: str, store_dir: str = BACKTEST_STORE_DIR):
+    """
+    저장된 셀 결과 (없거나 key가 다르면 None)
+    """
+    path = cell_path(store_id, test_month, key, store_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_parquet(path)
+    except Exception as e:
+        print(f"[{store_id}] backtest 결과 읽기 실패 ({path}): {e}")
+        return None
+
+
+def save_cell(store_id, test_month, key: str, result: pd.DataFrame, store_dir: str = BACKTEST_STORE_DIR):
+    """
+    셀 결과를 Parquet으로 저장하고, 같은 (store, month)의 이전 key 결과는 삭제
+    """
+    path = cell_path(store_id, test_month, key, store_dir)
+    with atomic_path(path) as tmp_path:
+        result.to_parquet(tmp_path, index=False)
+
+    for old_path in glob.glob(os.path.join(store_dir, str(store_id), f"{test_month}-*.parquet")):
+        if old_path != path:
+            os.remove(old_path)
@@ -3,29 +3,173 @@ import numpy as np
 import os
 import pickle
 from prophet import Prophet
+from concurrent.futures import as_completed
 from pandas.tseries.offsets import MonthEnd
-# 학기 기간 정의
-semester_ranges = [
-    ("2023-03-01", "2023-06-23"), ("2023-09-01", "2023-12-22"),
-    ("2024-03-04", "2024-06-20"), ("2024-09-02", "2024-12-20"),
-    ("2025-03-04", "2025-06-20"), ("2025-09-01", "2025-12-20")
-]
-
-def is_in_semester(date):
-    for start, end in semester_ranges:
-        if pd.to_datetime(start) <= date <= pd.to_datetime(end):
-            return True
-    return False
-
-def compute_yhat_and_target(df: pd.DataFrame) -> pd.DataFrame:
+from forecast.prophet_inference import INTERVAL_METHOD, interval_uncertainty_samples, predict_with_intervals
+from train.prophet_utils.warm_start import WARM_START, fit_prophet
+from train.xgb_utils.backtest_store import BACKTEST_STORE_DIR, cell_key, load_cell, save_cell
+from forecast.academic_calendar import add_semester_flags, calendar
+from train.process_pool import training_process_pool
+from settings import setting
+
+# backtest 병렬 worker 수 (기본값: CPU 코어 수)
+BACKTEST_WORKERS = int(setting("BACKTEST_WORKERS", os.cpu_count() or 1))
+
+def base_model_params(base_model: Prophet) -> dict:
+    """
+    backtest 모델 생성에 필요한 기준 모델의 하이퍼파라미터 (worker 프로세스로 전달)
+    """
+    return {
+        "growth": base_model.growth,
+        "yearly_seasonality": base_model.yearly_seasonality,
+        "weekly_seasonality": base_model.weekly_seasonality,
+        "daily_seasonality": base_model.daily_seasonality,
+        "seasonality_mode": base_model.seasonality_mode,
+        "changepoint_prior_scale": base_model.changepoint_prior_scale,
+        "seasonality_prior_scale": base_model.seasonality_prior_scale,
+        "holidays_prior_scale": base_model.holidays_prior_scale,
+        "holidays": base_model.holidays,
+    }
+
+def month_slices(store_df: pd.DataFrame, months: list, i: int):
+    """
+    i번째 셀의 (테스트 월, 학습 구간 1년, 테스트 구간 1개월)
+    """
+    train_end = months[i + 11].to_timestamp(how="end")
+    test_month = months[i + 12]
+    test_start = test_month.to_timestamp()
+    test_end = test_month.to_timestamp() + MonthEnd(1)
+
+    train_df = store_df[store_df["ds"] <= train_end].copy()
+    test_df = store_df[(store_df["ds"] >= test_start) & (store_df["ds"] <= test_end)].copy()
+    return test_month, train_df, test_df
+
+def backtest_months(store_id, store_cluster_id, store_df: pd.DataFrame, base_params: dict, month_indices: list, warm_start: bool) -> list:
+    """
+    한 매장의 (학습 1년, 테스트 1개월) rolling backtest 중 month_indices에 해당하는 셀들을 계산.
+    반환: [(month index, 예측 결과 DataFrame), ...]
+    """
+    results = []
+    prev_model = None
+    months = sorted(store_df["ds"].dt.to_period("M").unique())
+    for i in month_indices:
+        _, train_df, test_df = month_slices(store_df, months, i)
+        if len(test_df) == 0:
+            continue
+
+        # cap/floor
+        y_max = train_df["revenue"].max()
+        y_min = train_df["revenue"].min()
+        train_df["y"] = train_df["revenue"]
+        train_df["cap"] = y_max * 1.1
+        train_df["floor"] = y_min * 0.9 if y_min > 0 else 0
+
+        test_df["cap"] = train_df["cap"].iloc[0]
+        test_df["floor"] = train_df["floor"].iloc[0]
+
+        train_df["ds"] = train_df["date"]
+        test_df["ds"] = test_df["date"]
+
+        # 조건부 seasonality
+        if store_cluster_id == 2:
+            for d in [train_df, test_df]:
+                add_semester_flags(d)
+
+        # 모델 생성 및 학습
+        model = Prophet(**base_params, uncertainty_samples=interval_uncertainty_samples())
+        if store_cluster_id == 2:
+            model.add_seasonality("semester_weekly", period=7, fourier_order=3, condition_name="is_semester")
+            model.add_seasonality("vacation_weekly", period=7, fourier_order=3, condition_name="is_vacation")
+
+        try:
+            fit_prophet(model, train_df, init_model=prev_model if warm_start else None)
+            prev_model = model
+            input_cols = ["ds", "cap", "floor"]
+            if "is_semester" in test_df.columns:
+                input_cols += ["is_semester", "is_vacation"]
+
+            # XGBoost 이상치 필터에 필요한 신뢰구간은 이 단계에서만 계산
+            forecast = predict_with_intervals(model, test_df[input_cols], method=INTERVAL_METHOD)
+            forecast = forecast.rename(columns={"ds": "date"})
+            merged = pd.merge(test_df, forecast, on="date", how="left")
+            merged["y"] = (merged["revenue"] - merged["yhat"]) / merged["yhat"]
+            merged["store_id"] = store_id
+            results.append((i, merged))
+        except Exception as e:
+            print(f"[{store_id}] 예측 실패: {e}")
+            continue
+
+    return results
+
+def lookup_cells(store_order, store_id, store_cluster_id, store_df, months, base_params, chunk: list, warm_start: bool,
+                 cache_dir: str, cell_results: dict, pending: dict) -> list:
+    """
+    chunk(한 작업으로 계산할 월 index들)의 저장된 셀을 cell_results에 채우고, 계산할 월 index 목록을 반환.
+    warm start면 각 셀은 chunk 안의 직전 셀 모델에서 이어서 fit 하므로 key에 직전 셀 key를 포함하고,
+    하나라도 없으면 chunk 전체를 처음부터 다시 계산한다 (중간부터 계산하면 직전 모델이 없어 저장 이력에 따라 결과가 달라짐).
+    """
+    cells = []
+    prev_key = None
+    for i in chunk:
+        test_month, train_df, test_df = month_slices(store_df, months, i)
+        if len(test_df) == 0:
+            continue
+        key = cell_key(
+            train_df, test_df, base_params, store_cluster_id,
+            INTERVAL_METHOD, interval_uncertainty_samples(), warm_start,
+            # 대학가는 학기 기간이 바뀌면 다시 계산
+            (calendar.starts.tolist(), calendar.ends.tolist()) if store_cluster_id == 2 else None,
+            prev_key if warm_start else None,
+        )
+        prev_key = key
+        cells.append((i, test_month, key, load_cell(store_id, test_month, key, cache_dir)))
+
+    if warm_start and any(cached is None for *_, cached in cells):
+        cells = [(i, test_month, key, None) for i, test_month, key, _ in cells]
+
+    missing = []
+    for i, test_month, key, cached in cells:
+        if cached is not None:
+            cell_results[(store_order, i)] = cached
+        else:
+            pending[(store_order, i)] = (store_id, test_month, key)
+            missing.append(i)
+    return missing
+
+def compute_yhat_and_target(
+    df: pd.DataFrame,
+    warm_start: bool = WARM_START,
+    n_workers: int = None,
+    chunk_months: int = None,
+    cache_dir: str = BACKTEST_STORE_DIR,
+    progress_callback=None,
+    should_stop=None,
+) -> pd.DataFrame:
     """
     각 store_id에 대해 Prophet 모델을 불러와 yhat 예측을 수행하고,
     revenue와 yhat을 이용하여 오차율 y = (revenue - yhat) / yhat 계산
+    (warm_start: 직전 월 모델의 파라미터로 다음 월 fit을 초기화)
+
+    (매장, 테스트 월) 셀은 서로 독립이므로 프로세스 풀로 나누어 계산한다.
+    chunk_months: 한 작업에 묶을 연속 월 수 (기본값: warm_start면 매장 전체 12개월, 아니면 1개월)
+    cache_dir: 셀 결과 저장소 (None이면 사용 안 함). 학습/테스트 구간과 하이퍼파라미터가 같은 셀은
+    저장된 결과를 읽고, 없거나 바뀐 셀만 다시 계산한다.
+    결과 순서와 컬럼은 매장 -> 월 순서로 직렬 실행과 동일하다.
+    progress_callback(done, total)은 작업 하나가 끝날 때마다 호출되고,
+    should_stop()이 True가 되면 남은 작업을 취소한다 (그때까지 계산된 셀은 저장소에 남음).
     """
-    df["date"] = pd.to_datetime(df["date"])  # datetime 변환
-    store_dfs = []
-
-    for store_id, store_df in df.groupby("store_id"):
+    n_workers = n_workers or BACKTEST_WORKERS
+    chunk_months = chunk_months or (12 if warm_start else 1)
+    if not pd.api.types.is_datetime64_any_dtype(df["date"]):
+        df["date"] = pd.to_datetime(df["date"])  # datetime 변환
+
+    # (매장 순서, 월 index) -> 결과
+    cell_results = {}
+    # (매장 순서, 월 index) -> (store_id, 테스트 월, key) : 계산 후 저장할 셀
+    pending = {}
+
+    tasks = []
+    for store_order, (store_id, store_df) in enumerate(df.groupby("store_id", observed=True)):
         store_df = store_df.sort_values("date").copy()
         store_cluster_id = store_df["cluster_id"].iloc[0]
 
@@ -38,6 +182,7 @@ def compute_yhat_and_target(df: pd.DataFrame) -> pd.DataFrame:
         # Prophet 모델 로딩
         with open(model_path, "rb") as f:
             base_model: Prophet = pickle.load(f)
+        base_params = base_model_params(base_model)
 
         # 최근 1년 예측 대상 범위
         latest_date = store_df["date"].max()
@@ -46,75 +191,57 @@ def compute_yhat_and_target(df: pd.DataFrame) -> pd.DataFrame:
         store_df = store_df[store_df["date"] >= cutoff_date - pd.DateOffset(months=12)]  # 2년치 확보
         store_df["ds"] = store_df["date"]
 
-        results = []
         months = sorted(store_df["ds"].dt.to_period("M").unique())
-        for i in range(12):
-            if i + 12 >= len(months):
+        month_indices = [i for i in range(12) if i + 12 < len(months)]
+
+        # 한 작업(chunk) 안에서는 warm start로 직전 월 모델에서 이어서 fit 한다
+        for chunk in (month_indices[j:j + chunk_months] for j in range(0, len(month_indices), chunk_months)):
+            # 저장된 셀은 읽고, 없거나 무효화된 셀만 계산 대상으로
+            if cache_dir is not None:
+                chunk = lookup_cells(
+                    store_order, store_id, store_cluster_id, store_df, months, base_params, chunk, warm_start,
+                    cache_dir, cell_results, pending,
+                )
+            if chunk:
+                tasks.append((store_order, (store_id, store_cluster_id, store_df, base_params, chunk, warm_start)))
+
+    if cache_dir is not None:
+        print(f"backtest 셀: 저장소 {len(cell_results)}개 재사용, {len(pending)}개 계산")
+
+    done = 0
+
+    def collect(store_order, results):
+        nonlocal done
+        for i, merged in results:
+            cell_results[(store_order, i)] = merged
+            if (store_order, i) in pending:
+                save_cell(*pending[(store_order, i)], merged, cache_dir)
+        done += 1
+        if progress_callback:
+            progress_callback(done, len(tasks))
+
+    if n_workers <= 1 or len(tasks) <= 1:
+        for store_order, args in tasks:
+            if should_stop and should_stop():
                 break
-            train_end = months[i + 11].to_timestamp(how="end")
-            test_month = months[i + 12]
-            test_start = test_month.to_timestamp()
-            test_end = test_month.to_timestamp() + MonthEnd(1)
-
-            train_df = store_df[store_df["ds"] <= train_end].copy()
-            test_df = store_df[(store_df["ds"] >= test_start) & (store_df["ds"] <= test_end)].copy()
-            if len(test_df) == 0:
-                continue
-
-            # cap/floor
-            y_max = train_df["revenue"].max()
-            y_min = train_df["revenue"].min()
-            train_df["y"] = train_df["revenue"]
-            train_df["cap"] = y_max * 1.1
-            train_df["floor"] = y_min * 0.9 if y_min > 0 else 0
-
-            test_df["cap"] = train_df["cap"].iloc[0]
-            test_df["floor"] = train_df["floor"].iloc[0]
-
-            train_df["ds"] = train_df["date"]
-            test_df["ds"] = test_df["date"]
-
-            # 조건부 seasonality
-            if store_cluster_id == 2:
-                for d in [train_df, test_df]:
-                    d["is_semester"] = d["ds"].apply(lambda d: 1 if is_in_semester(d) else 0)
-                    d["is_vacation"] = 1 - d["is_semester"]
-
-            # 모델 생성 및 학습
-            model = Prophet(
-                growth=base_model.growth,
-                yearly_seasonality=base_model.yearly_seasonality,
-                weekly_seasonality=base_model.weekly_seasonality,
-                daily_seasonality=base_model.daily_seasonality,
-                seasonality_mode=base_model.seasonality_mode,
-                changepoint_prior_scale=base_model.changepoint_prior_scale,
-                seasonality_prior_scale=base_model.seasonality_prior_scale,
-                holidays_prior_scale=base_model.holidays_prior_scale,
-                holidays=base_model.holidays
-            )
-            if store_cluster_id == 2:
-                model.add_seasonality("semester_weekly", period=7, fourier_order=3, condition_name="is_semester")
-                model.add_seasonality("vacation_weekly", period=7, fourier_order=3, condition_name="is_vacation")
-
-            try:
-                model.fit(train_df)
-                input_cols = ["ds", "cap", "floor"]
-                if "is_semester" in test_df.columns:
-                    input_cols += ["is_semester", "is_vacation"]
-
-                forecast = model.predict(test_df[input_cols])
-                forecast = forecast[["ds", "yhat", "yhat_lower", "yhat_upper"]].rename(columns={"ds": "date"})
-                merged = pd.merge(test_df, forecast, on="date", how="left")
-                merged["y"] = (merged["revenue"] - merged["yhat"]) / merged["yhat"]
-                merged["store_id"] = store_id
-                results.append(merged)
-            except Exception as e:
-                print(f"[{store_id}] 예측 실패: {e}")
-                continue
-
-        if results:
-            store_dfs.append(pd.concat(results, ignore_index=True))
-
-    final_df = pd.concat(store_dfs, ignore_index=True)
+            collect(store_order, backtest_months(*args))
+    else:
+        with training_process_pool(min(n_workers, len(tasks))) as executor:
+            futures = {executor.submit(backtest_months, *args): (store_order, args[0]) for store_order, args in tasks}
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                if should_stop and should_stop():
+                    for f in futures:
+                        f.cancel()
+                store_order, store_id = futures[future]
+                try:
+                    collect(store_order, future.result())
+                except Exception as e:
+                    print(f"[{store_id}] 예측 실패: {e}")
+
+    if not cell_results:
+        raise ValueError("backtest 결과가 없습니다.")
+    final_df = pd.concat([cell_results[key] for key in sorted(cell_results)], ignore_index=True)
     final_df = final_df.dropna(subset=["yhat", "y"]).reset_index(drop=True)
-    return final_df
\ No newline at end of file
+    return final_df
@@ -2,15 +2,69 @@ import os
 import numpy as np
 import pandas as pd
 import optuna
-import pickle
-from xgboost import XGBRegressor
+import xgboost as xgb
 from sklearn.metrics import mean_absolute_error
-from sklearn.preprocessing import LabelEncoder
+from forecast.xgb_artifact import WEATHER_ALIASES, encode_weather_labels, save_xgb_artifact
+from train.pruning import make_pruner
 import sys
+from settings import setting
+
+# 튜닝 설정 (config 또는 환경 변수로 조정 가능)
+N_TRIALS = int(setting("XGB_TUNING_TRIALS", 80))
+MAX_ROUNDS = int(setting("XGB_MAX_ROUNDS", 600))
+EARLY_STOPPING_ROUNDS = int(setting("XGB_EARLY_STOPPING_ROUNDS", 50))
+MAX_BIN = int(setting("XGB_MAX_BIN", 256))
+# early stopping / pruning에 쓰는 학습 구간 끝부분 비율 (test fold는 early stopping에 쓰지 않음)
+EARLY_STOPPING_FRACTION = float(setting("XGB_EARLY_STOPPING_FRACTION", 0.2))
+# train.pruning.PRUNERS 중 하나 (step = boosting round)
+PRUNER = setting("XGB_TUNING_PRUNER", "hyperband")
+# 이 round 수 전에는 pruning 하지 않음
+PRUNING_MIN_ROUNDS = 30
+
+
+def booster_params(params: dict) -> dict:
+    """
+    튜닝 파라미터 (XGBRegressor 이름) -> xgb.train 파라미터
+    """
+    return {
+        "objective": "reg:squarederror",
+        "eval_metric": "mae",
+        "tree_method": "hist",
+        "max_bin": MAX_BIN,
+        "eta": params["learning_rate"],
+        "max_depth": params["max_depth"],
+        "subsample": params["subsample"],
+        "colsample_bytree": params["colsample_bytree"],
+        "alpha": params["reg_alpha"],
+        "lambda": params["reg_lambda"],
+        "seed": 42,
+    }
+
+
+class PruningCallback(xgb.callback.TrainingCallback):
+    """
+    boosting round마다 early stopping 구간 MAE를 Optuna에 report 하고, pruner가 중단을 결정하면 TrialPruned.
+    fold가 바뀌어도 step이 겹치지 않도록 fold 시작 step(step_offset)을 더해 report 한다.
+    """
+
+    def __init__(self, trial: optuna.Trial, step_offset: int = 0):
+        self.trial = trial
+        self.step_offset = step_offset
 
-def train_xgboost(df: pd.DataFrame, save_path: str = "./models/xgb/xgb_model.pkl"):
+    def after_iteration(self, model, epoch: int, evals_log) -> bool:
+        self.trial.report(evals_log["stop"]["mae"][-1], self.step_offset + epoch)
+        if self.trial.should_prune():
+            raise optuna.TrialPruned()
+        return False
+
+
+def train_xgboost(
+    df: pd.DataFrame,
+    save_path: str = "./models/xgb/xgb_model.ubj",
+    weather_codes_path: str = "./models/xgb/weather_codes.json",
+):
     """
-    XGBoost 모델을 학습하고, ./models/xgb/ 경로에 저장한다.
+    XGBoost 모델을 학습하고, ./models/xgb/ 경로에 native 형식(.ubj)과 weather mapping table(json)로 저장한다.
     """
 
     # 날짜 정렬
@@ -31,20 +85,14 @@ def train_xgboost(df: pd.DataFrame, save_path: str = "./models/xgb/xgb_model.pkl
     print("n_before_outlier_removal: ", n_before_outlier_removal, "n_after_outlier_removal: ", n_after_outlier_removal)
     sys.stdout.flush()
     # weather category 통합
-    df["weather"] = df["weather"].replace({
-        "Haze": "Fog",
-        "Mist": "Fog",
-        "Smoke": "Fog"
-    })
+    df["weather"] = df["weather"].replace(WEATHER_ALIASES)
 
-    # weather Label Encoding
-    le = LabelEncoder()
-    df["weather_encoded"] = le.fit_transform(df["weather"])
-
-    # Label Encoder 저장
-    os.makedirs("./models/xgb", exist_ok=True)
-    with open("./models/xgb/label_encoder.pkl", "wb") as f:
-        pickle.dump(le, f)
+    # weather Label Encoding (정렬 순서 코드, LabelEncoder와 동일: 날씨 데이터가 없는 날(NaN)은 마지막 코드)
+    n_missing_weather = int(df["weather"].isna().sum())
+    if n_missing_weather:
+        print("n_missing_weather: ", n_missing_weather)
+        sys.stdout.flush()
+    df["weather_encoded"], weather_classes = encode_weather_labels(df["weather"])
 
     # feature 및 target 설정
     feature_cols = [
@@ -52,85 +100,105 @@ def train_xgboost(df: pd.DataFrame, save_path: str = "./models/xgb/xgb_model.pkl
         "lag", "weekly_lag", "dayofweek",
         "cluster_id", "is_weekend"
     ]
-    X = df[feature_cols]
-    y = df["y"]
+    X = df[feature_cols].to_numpy(dtype=np.float32)
+    y = df["y"].to_numpy(dtype=np.float32)
 
     # Expanding window folds 정의 (최근 4개월을 대상으로 Test 진행)
+    # fold 행렬은 한 번만 만들어 모든 trial에서 재사용.
+    # early stopping은 학습 구간의 끝부분(EARLY_STOPPING_FRACTION, 날짜순)으로 하고, test 월은 MAE 계산에만 쓴다
+    # (test 월로 early stopping 하면 보고되는 MAE와 best iteration이 낙관적으로 치우침)
     recent_months = sorted(df["month"].unique())[-4:]
     folds = []
     for i in range(0,len(recent_months)):
         test_month = recent_months[i]
         train_months = recent_months[:i]  # test 월 이전까지
-        train_idx = df.index[df["month"].isin(train_months)]
-        test_idx = df.index[df["month"] == test_month]
-        folds.append((train_idx, test_idx))
+        train_idx = np.flatnonzero(df["month"].isin(train_months).to_numpy())
+        test_idx = np.flatnonzero((df["month"] == test_month).to_numpy())
+
+        n_stop = int(len(train_idx) * EARLY_STOPPING_FRACTION)
+        if len(test_idx) == 0 or n_stop == 0 or n_stop == len(train_idx):
+            continue
+        fit_idx, stop_idx = train_idx[:-n_stop], train_idx[-n_stop:]  # df는 날짜순 정렬
+
+        dfit = xgb.QuantileDMatrix(X[fit_idx], y[fit_idx], feature_names=feature_cols, max_bin=MAX_BIN)
+        dstop = xgb.QuantileDMatrix(X[stop_idx], y[stop_idx], feature_names=feature_cols, ref=dfit)
+        dtrain = xgb.QuantileDMatrix(X[train_idx], y[train_idx], feature_names=feature_cols, max_bin=MAX_BIN)
+        folds.append((dfit, dstop, dtrain, X[test_idx], y[test_idx]))
     df.drop(columns=["month"], inplace=True)
 
-    # Optuna 튜닝
+    if not folds:
+        raise ValueError("XGBoost 학습/검증 fold를 만들 수 있는 데이터가 없습니다.")
+
+    def fit_fold(params, dtrain, num_boost_round, dstop=None, early_stopping_rounds=None, callbacks=None):
+        return xgb.train(
+            booster_params(params), dtrain,
+            num_boost_round=num_boost_round,
+            evals=[(dstop, "stop")] if dstop is not None else [],
+            early_stopping_rounds=early_stopping_rounds,
+            callbacks=callbacks,
+            verbose_eval=False,
+        )
+
+    # Optuna 튜닝 (trial마다 validation MAE 기준 early stopping, 가망 없는 trial은 pruning)
     def objective(trial):
         params = {
-            "n_estimators": trial.suggest_int("n_estimators", 100, 600),
             "learning_rate": trial.suggest_float("learning_rate", 0.005, 0.1, log=True),
             "max_depth": trial.suggest_int("max_depth", 3, 10),
             "subsample": trial.suggest_float("subsample", 0.5, 1.0),
             "colsample_bytree": trial.suggest_float("colsample_bytree", 0.5, 1.0),
             "reg_alpha": trial.suggest_float("reg_alpha", 0, 2),
             "reg_lambda": trial.suggest_float("reg_lambda", 1, 5),
-            "random_state": 42,
-            "n_jobs": -1
         }
 
         fold_maes = []
-        for train_idx, test_idx in folds:
-            X_train, X_test = X.iloc[train_idx], X.iloc[test_idx]
-            y_train, y_test = y.iloc[train_idx], y.iloc[test_idx]
-
-            if len(y_test) == 0 or len(y_train) == 0:
-                continue
-
-            model = XGBRegressor(**params)
-            model.fit(X_train, y_train)
-            y_pred = model.predict(X_test)
+        best_rounds = []
+        for fold_no, (dfit, dstop, _, X_test, y_test) in enumerate(folds):
+            model = fit_fold(
+                params, dfit, MAX_ROUNDS, dstop, EARLY_STOPPING_ROUNDS,
+                callbacks=[PruningCallback(trial, fold_no * MAX_ROUNDS)],
+            )
+            n_rounds = model.best_iteration + 1
+            y_pred = model.inplace_predict(X_test, iteration_range=(0, n_rounds))
             fold_maes.append(mean_absolute_error(y_test, y_pred))
+            best_rounds.append(n_rounds)
 
-        return np.mean(fold_maes) if fold_maes else float("inf")
+        # fold별 best iteration을 최종 모델 학습에 그대로 사용
+        trial.set_user_attr("best_rounds", best_rounds)
+        return np.mean(fold_maes)
 
-    study = optuna.create_study(direction="minimize")
-    study.optimize(objective, n_trials= 80)
+    study = optuna.create_study(direction="minimize", pruner=make_pruner(PRUNER, min_steps=PRUNING_MIN_ROUNDS))
+    study.optimize(objective, n_trials=N_TRIALS)
     best_params = study.best_params
+    best_rounds = study.best_trial.user_attrs["best_rounds"]
+    n_pruned = sum(t.state == optuna.trial.TrialState.PRUNED for t in study.trials)
 
-    # 최적 파라미터로 Fold별 성능 측정 및 모델 학습
+    # 최적 파라미터 + fold별 best iteration으로 학습 구간 전체를 다시 학습해 Fold별 성능 측정 (마지막 fold 모델을 저장)
     mae_list = []
-    for i, (train_idx, test_idx) in enumerate(folds):
-        X_train, X_test = X.iloc[train_idx], X.iloc[test_idx]
-        y_train, y_test = y.iloc[train_idx], y.iloc[test_idx]
-
-        if len(y_test) == 0 or len(y_train) == 0:
-            continue
-
-        model = XGBRegressor(**best_params, random_state=42, n_jobs=-1)
-        model.fit(X_train, y_train)
-        y_pred = model.predict(X_test)
+    for (_, _, dtrain, X_test, y_test), n_rounds in zip(folds, best_rounds):
+        model = fit_fold(best_params, dtrain, n_rounds)
+        y_pred = model.inplace_predict(X_test)
         mae = mean_absolute_error(y_test, y_pred)
         mae_list.append(mae)
     
     # 로그 저장 (이상치 정보 + MAE + 하이퍼파라미터)
+    os.makedirs("./models/xgb", exist_ok=True)
     log_path = "./models/xgb/xgb_log.txt"
     with open(log_path, "w") as f:
         f.write("=== XGBoost 학습 로그 ===\n")
         f.write(f"이상치 제거 전 샘플 수: {n_before_outlier_removal}\n")
-        f.write(f"이상치 제거 후 샘플 수: {n_after_outlier_removal}\n\n")
+        f.write(f"이상치 제거 후 샘플 수: {n_after_outlier_removal}\n")
+        f.write(f"weather 결측 샘플 수: {n_missing_weather}\n\n")
 
         for i, mae in enumerate(mae_list):
             f.write(f"Fold {i + 1}: MAE = {mae:.4f}\n")
         f.write(f"\nAverage MAE: {np.mean(mae_list):.4f}\n")
         f.write(f"\nMedian MAE: {np.median(mae_list):.4f}\n")
 
+        f.write(f"\nTrials: {len(study.trials)} (pruned {n_pruned})\n")
         f.write("\nBest Hyperparameters:\n")
         for k, v in best_params.items():
             f.write(f"{k}: {v}\n")
+        f.write(f"n_estimators (fold별 best iteration): {best_rounds}\n")
 
-    # 모델 저장
-    os.makedirs(os.path.dirname(save_path), exist_ok=True)
-    with open(save_path, "wb") as f:
-        pickle.dump(model, f)
+    # 모델 + weather mapping table 저장 (native 형식, pickle 사용 안 함)
+    save_xgb_artifact(model, weather_classes, save_path, weather_codes_path)